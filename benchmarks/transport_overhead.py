@@ -0,0 +1,91 @@
+"""Compare the client CPU time per request of the Requestor's transports.
+
+A local HTTP server runs in a separate process, so the CPU time measured in this
+process is the cost of issuing requests and parsing responses.
+
+Usage::
+
+    python benchmarks/transport_overhead.py --requests 5000
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests  # noqa: E402
+
+from pawl.core.requestor import Requestor  # noqa: E402
+from pawl.core.transport import Urllib3Transport  # noqa: E402
+
+BODY = json.dumps({"id": "abc123", "localizedFirstName": "Ada"}).encode()
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(BODY)))
+        self._headers_buffer.append(b"\r\n" + BODY)  # One write per response.
+        self.flush_headers()
+
+    def log_message(self, *_args):
+        pass
+
+
+def serve(port, ready):
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    ready.set()
+    server.serve_forever()
+
+
+def measure(transport, url, count):
+    requestor = Requestor(session=transport)
+    headers = {"Authorization": "Bearer token", "X-Restli-Protocol-Version": "2.0.0"}
+    for _ in range(min(count // 10, 200)):  # Warm up connections and caches.
+        requestor.request("GET", url, allow_redirects=False, headers=headers).json()
+    cpu = time.process_time()
+    wall = time.perf_counter()
+    for _ in range(count):
+        requestor.request(
+            "GET", url, allow_redirects=False, headers=headers, params={"a": 1}
+        ).json()
+    cpu = time.process_time() - cpu
+    wall = time.perf_counter() - wall
+    requestor.close()
+    return cpu / count * 1e6, wall / count * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--requests", type=int, default=2000)
+    arguments = parser.parse_args()
+
+    ready = multiprocessing.Event()
+    server = multiprocessing.Process(
+        target=serve, args=(arguments.port, ready), daemon=True
+    )
+    server.start()
+    ready.wait()
+    url = f"http://127.0.0.1:{arguments.port}/v2/me"
+    try:
+        print(f"{'transport':<20}{'CPU us/request':>16}{'wall us/request':>18}")
+        for name, transport in (
+            ("requests.Session", requests.Session()),
+            ("Urllib3Transport", Urllib3Transport()),
+        ):
+            cpu, wall = measure(transport, url, arguments.requests)
+            print(f"{name:<20}{cpu:>16.1f}{wall:>18.1f}")
+    finally:
+        server.terminate()
+
+
+if __name__ == "__main__":
+    main()
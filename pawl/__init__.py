@@ -1,7 +1,13 @@
 """Python API Wrapper for Linkedin.
 
 More information about PAWL can be found at https://github.com/kylejb/PAWL.
-"""
 
+Attributes other than ``__version__`` are imported on first access (PEP 562), so
+``import pawl`` does not load ``requests`` until a client is needed.
+"""
+from ._lazy import lazy_module
 from .constants import __version__  # NOQA
-from .linkedin import Linkedin  # NOQA
+
+_LAZY_ATTRIBUTES = {"Linkedin": ".linkedin"}
+
+lazy_module(globals(), _LAZY_ATTRIBUTES)
@@ -0,0 +1,26 @@
+"""Provide lazy (PEP 562) package attributes."""
+import importlib
+from typing import Any, Dict
+
+
+def lazy_module(namespace: Dict[str, Any], attributes: Dict[str, str]):
+    """Install ``__getattr__`` and ``__dir__`` that import ``attributes`` on access.
+
+    :param namespace: The ``globals()`` of the package.
+    :param attributes: A map of attribute names to the relative names of the modules
+        defining them, e.g. ``{"Linkedin": ".linkedin"}``.
+    """
+    package = namespace["__name__"]
+
+    def __getattr__(name):
+        if name in attributes:
+            module = importlib.import_module(attributes[name], package)
+            value = namespace[name] = getattr(module, name)
+            return value
+        raise AttributeError(f"module {package!r} has no attribute {name!r}")
+
+    def __dir__():
+        return sorted({*namespace, *attributes})
+
+    namespace["__getattr__"] = __getattr__
+    namespace["__dir__"] = __dir__
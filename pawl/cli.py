@@ -0,0 +1,261 @@
+"""Provide the ``pawl`` command line interface.
+
+``pawl run`` executes the operations of an NDJSON job file across a pool of worker
+processes. Each line is one operation:
+
+.. code-block:: text
+
+    {"op": "get", "path": "v2/me", "fields": ["id"]}
+    {"op": "post", "path": "v2/ugcPosts", "json": {...}}
+    {"op": "like", "post": "urn:li:share:123", "id": "row-7"}
+
+An optional ``id`` is copied to the result. ``get`` items also accept ``params``,
+``post`` items accept ``data`` and ``params``, and ``like`` items accept
+``person_id``. Results and errors are appended to NDJSON files as they complete, each
+with the ``line`` number of its operation. When a checkpoint file is given, the run
+records the last line up to which every operation has completed and a later run with
+the same checkpoint resumes after it. Operations completed after that line may run
+again when a run is resumed.
+
+The access token is read from the ``pawl_access_token`` environment variable.
+"""
+import argparse
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import IO, Any, Dict, List, Optional, Tuple
+
+log = logging.getLogger(__package__)
+
+_budget = None
+_linkedin = None
+_rate = None
+
+
+def _initialize_worker(linkedin_kwargs: Dict[str, Any], budget, rate: Optional[float]):
+    """Create the Linkedin client that the worker process reuses for every item."""
+    global _budget, _linkedin, _rate
+    from .linkedin import Linkedin
+
+    _budget = budget
+    _linkedin = Linkedin(**linkedin_kwargs)
+    _rate = rate
+
+
+def _wait_for_budget():
+    """Sleep until this process may send a request under the shared rate."""
+    if _rate is None:
+        return
+    with _budget.get_lock():
+        now = time.time()
+        start = max(now, _budget.value)
+        _budget.value = start + 1 / _rate
+    if start > now:
+        time.sleep(start - now)
+
+
+def _execute(item: Dict[str, Any]) -> Any:
+    operation = item.get("op")
+    _wait_for_budget()
+    if operation == "get":
+        return _linkedin.get(
+            item["path"], params=item.get("params"), fields=item.get("fields")
+        )
+    if operation == "post":
+        return _linkedin.post(
+            item["path"],
+            data=item.get("data"),
+            fields=item.get("fields"),
+            json=item.get("json"),
+            params=item.get("params"),
+        )
+    if operation == "like":
+        return _linkedin.reactions.like_post(
+            item["post"], person_id=item.get("person_id"), fields=item.get("fields")
+        )
+    raise ValueError(f"Unknown op: {operation!r}")
+
+
+def _run_line(line_number: int, line: str) -> Tuple[bool, Dict[str, Any]]:
+    """Run the operation on one line and return ``(succeeded, record)``.
+
+    Exceptions are returned as records rather than raised, since not every exception
+    can be sent back to the parent process.
+    """
+    record = {"line": line_number}
+    try:
+        item = json.loads(line)
+        if "id" in item:
+            record["id"] = item["id"]
+        record["result"] = _execute(item)
+    except Exception as exception:
+        record["error"] = type(exception).__name__
+        record["message"] = str(exception)
+        snapshot = getattr(exception, "snapshot", None)
+        if snapshot is not None:
+            record["status"] = snapshot.status_code
+            record["serviceErrorCode"] = snapshot.service_error_code
+            record["serviceErrorMessage"] = snapshot.message
+        return False, record
+    return True, record
+
+
+class _Checkpoint:
+    """Track the last line up to which every operation has completed."""
+
+    def __init__(self, path: Optional[str]):
+        self._done = set()
+        self.path = path
+        self.line = 0
+        if path is not None and os.path.exists(path):
+            with open(path) as checkpoint_file:
+                self.line = json.load(checkpoint_file)["line"]
+
+    def complete(self, line_number: int):
+        self._done.add(line_number)
+        while self.line + 1 in self._done:
+            self.line += 1
+            self._done.remove(self.line)
+
+    def save(self):
+        if self.path is None:
+            return
+        temporary_path = f"{self.path}.tmp"
+        with open(temporary_path, "w") as checkpoint_file:
+            json.dump({"line": self.line}, checkpoint_file)
+        os.replace(temporary_path, self.path)
+
+
+def run(
+    jobs: IO[str],
+    results: IO[str],
+    errors: IO[str],
+    checkpoint: Optional[str] = None,
+    linkedin_kwargs: Optional[Dict[str, Any]] = None,
+    processes: Optional[int] = None,
+    rate: Optional[float] = None,
+    window: Optional[int] = None,
+    checkpoint_interval: float = 1.0,
+) -> Tuple[int, int]:
+    """Run the operations in ``jobs`` and return the numbers of results and errors.
+
+    At most ``window`` operations are read ahead of the oldest unfinished one, so
+    memory use does not grow with the size of ``jobs``.
+
+    :param jobs: A text stream of NDJSON operations.
+    :param results: A text stream that results are written to.
+    :param errors: A text stream that errors are written to.
+    :param checkpoint: (Optional) The path of the checkpoint file.
+    :param linkedin_kwargs: (Optional) Keyword arguments used to create the
+        :class:`.Linkedin` client in each worker process.
+    :param processes: The number of worker processes (default: the number of CPUs).
+    :param rate: (Optional) The largest number of requests per second shared by all
+        worker processes.
+    :param window: The largest number of operations in flight (default: four per
+        worker process).
+    :param checkpoint_interval: The number of seconds between checkpoint writes
+        (default: 1).
+    """
+    processes = processes or os.cpu_count() or 1
+    window = window or processes * 4
+    progress = _Checkpoint(checkpoint)
+    budget = multiprocessing.Value("d", 0.0)
+    counts = [0, 0]
+    last_save = time.monotonic()
+
+    def collect(futures) -> None:
+        for future in futures:
+            succeeded, record = future.result()
+            stream = results if succeeded else errors
+            stream.write(json.dumps(record, separators=(",", ":")) + "\n")
+            counts[not succeeded] += 1
+            progress.complete(record["line"])
+
+    with ProcessPoolExecutor(
+        max_workers=processes,
+        initializer=_initialize_worker,
+        initargs=(linkedin_kwargs or {}, budget, rate),
+    ) as executor:
+        pending = set()
+        for line_number, line in enumerate(jobs, start=1):
+            if line_number <= progress.line:
+                continue
+            if not line.strip():
+                progress.complete(line_number)
+                continue
+            while len(pending) >= window:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            pending.add(executor.submit(_run_line, line_number, line))
+            if time.monotonic() - last_save >= checkpoint_interval:
+                results.flush()
+                errors.flush()
+                progress.save()
+                last_save = time.monotonic()
+        collect(wait(pending).done)
+    results.flush()
+    errors.flush()
+    progress.save()
+    return counts[0], counts[1]
+
+
+def _open(path: str, mode: str, standard_stream: IO[str]) -> IO[str]:
+    if path == "-":
+        return standard_stream
+    return open(path, mode)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the ``pawl`` command and return its exit status."""
+    parser = argparse.ArgumentParser(prog="pawl")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    run_parser = subparsers.add_parser(
+        "run", help="run the operations of an NDJSON job file"
+    )
+    run_parser.add_argument("jobs", help="the NDJSON job file, or - for stdin")
+    run_parser.add_argument(
+        "-o", "--output", default="-", help="the results file (default: stdout)"
+    )
+    run_parser.add_argument(
+        "-e", "--errors", default="-", help="the errors file (default: stderr)"
+    )
+    run_parser.add_argument("-c", "--checkpoint", help="the checkpoint file")
+    run_parser.add_argument("-p", "--processes", type=int, help="worker processes")
+    run_parser.add_argument(
+        "-r", "--rate", type=float, help="requests per second across all workers"
+    )
+    run_parser.add_argument("-w", "--window", type=int, help="operations in flight")
+    arguments = parser.parse_args(argv)
+
+    access_token = os.environ.get("pawl_access_token")
+    if not access_token:
+        parser.error("the pawl_access_token environment variable is not set")
+
+    jobs = _open(arguments.jobs, "r", sys.stdin)
+    results = _open(arguments.output, "a", sys.stdout)
+    errors = _open(arguments.errors, "a", sys.stderr)
+    try:
+        result_count, error_count = run(
+            jobs,
+            results,
+            errors,
+            checkpoint=arguments.checkpoint,
+            linkedin_kwargs={"access_token": access_token},
+            processes=arguments.processes,
+            rate=arguments.rate,
+            window=arguments.window,
+        )
+    finally:
+        for stream in (jobs, results, errors):
+            if stream not in (sys.stdin, sys.stdout, sys.stderr):
+                stream.close()
+    log.info(f"Completed {result_count} operations with {error_count} errors")
+    return 1 if error_count else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
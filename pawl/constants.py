@@ -1,6 +1,9 @@
 """Linkedin constants."""
+from .core.restli import Route
 from .endpoints import API_PATH  # noqa
 
 __version__ = "0.1.1"
 
 USER_AGENT_FORMAT = f"PAWL/{__version__}"
+
+ROUTES = {name: Route(template) for name, template in API_PATH.items()}
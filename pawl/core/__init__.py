@@ -1,3 +1,20 @@
-"""pawl/core: Shared low-level interfaces."""
+"""pawl/core: Shared low-level interfaces.
 
-from .auth import Authenticator, Authorizer  # NOQA
+Attributes are imported on first access (PEP 562) so that importing a single core
+module does not load the rest of the package.
+"""
+from .._lazy import lazy_module
+
+_LAZY_ATTRIBUTES = {
+    "AIMDLimit": ".concurrency",
+    "Authenticator": ".auth",
+    "Authorizer": ".auth",
+    "HedgePolicy": ".hedge",
+    "Priority": ".scheduler",
+    "Profiler": ".profiling",
+    "QuotaLedger": ".quota",
+    "TokenIntrospector": ".introspection",
+    "Urllib3Transport": ".transport",
+}
+
+lazy_module(globals(), _LAZY_ATTRIBUTES)
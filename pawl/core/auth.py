@@ -1,7 +1,5 @@
 """Provides Authentication and Authorization classes."""
 from enum import Enum
-from requests import Request
-from requests.status_codes import codes
 import time
 from urllib.parse import quote
 
@@ -27,15 +25,12 @@ class BaseAuthenticator:
         self.client_id = client_id
         self.redirect_uri = redirect_uri
 
-    def _post(self, url, success_status=codes["ok"], **data):
+    def _post(self, url, success_status=200, **data):
         response = self._requestor.request(
             "POST",
             url,
             data=data,
-            headers={
-                "Connection": "close",
-                "Content-Type": "application/x-www-form-urlencoded",
-            },
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
         )
         if response.status_code != success_status:
             raise ResponseException(response)
@@ -61,6 +56,8 @@ class BaseAuthenticator:
                 "state": state,
             }
         )
+        from requests import Request  # deferred so that importing auth stays cheap
+
         url = self._requestor.oauth_url + constants.AUTHORIZATION_PATH
         request = Request("GET", f"{url}?{params}")
         return request.prepare().url
@@ -88,8 +85,9 @@ class Authenticator(BaseAuthenticator):
 class BaseAuthorizer:
     """Superclass for OAuth2 authorization tokens and scopes."""
 
-    def __init__(self, authenticator: Authenticator):
+    def __init__(self, authenticator: Authenticator, introspector=None):
         self._authenticator = authenticator
+        self._introspector = introspector
         self._clear_access_token()
         self._validate_authenticator()
 
@@ -104,12 +102,30 @@ class BaseAuthorizer:
                 f" {self.AUTHENTICATOR_CLASS.__name__}."
             )
 
+    def is_inactive(self):
+        """Return whether token introspection has found the access token inactive.
+
+        Only cached results of the ``introspector`` are consulted, so this never
+        makes a request.
+        """
+        if self._introspector is None or self.access_token is None:
+            return False
+        return self._introspector.is_active(self.access_token) is False
+
     def is_valid(self):
         """Return whether or not the Authorizer is ready to authorize requests.
 
         A ``True`` return value does not guarantee that the access_token is actually
         valid on the server side.
         """
+        if (
+            self.access_token
+            and self._expiration_timestamp is None
+            and self._introspector is not None
+        ):
+            payload = self._introspector.cached(self.access_token)
+            if payload and payload.get("expires_at"):
+                self._expiration_timestamp = payload["expires_at"]
         if self.access_token and self._expiration_timestamp is not None:
             return (
                 self.access_token is not None
@@ -141,9 +157,15 @@ class Authorizer(BaseAuthorizer):
         post_access_callback=None,
         pre_access_callback=None,
         access_token=None,
+        introspector=None,
     ):
-        """Authorize access to Linkedin's API."""
-        super(Authorizer, self).__init__(authenticator)
+        """Authorize access to Linkedin's API.
+
+        :param introspector: (Optional) A :class:`.TokenIntrospector` whose cached
+            results are used to learn the token's expiry and to reject inactive
+            tokens before a request is made.
+        """
+        super(Authorizer, self).__init__(authenticator, introspector)
         self._post_access_callback = post_access_callback
         self._pre_access_callback = pre_access_callback
         self.access_token = access_token
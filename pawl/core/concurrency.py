@@ -0,0 +1,96 @@
+"""Provide concurrency limits for the Scheduler."""
+import logging
+import threading
+
+from . import fork
+
+log = logging.getLogger(__package__)
+
+
+class FixedLimit:
+    """A concurrency limit that never changes."""
+
+    def __init__(self, limit: int):
+        """Create an instance of the FixedLimit class.
+
+        :param limit: The number of requests that may be in flight at once.
+        """
+        self.limit = limit
+
+    def on_sample(self, latency: float, in_flight: int, dropped: bool):
+        """Ignore the sample."""
+
+
+class AIMDLimit:
+    """A concurrency limit that adapts to latency and overload signals.
+
+    The limit grows by one (additive increase) when a request completes while at least
+    half of the window is in use and latency is stable. It shrinks by
+    ``backoff_ratio`` (multiplicative decrease) when a request is dropped, i.e. it
+    received a 429 or 5xx response or a connection error, or when the smoothed latency
+    exceeds ``latency_tolerance`` times the lowest latency seen recently.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 10,
+        min_limit: int = 1,
+        max_limit: int = 200,
+        backoff_ratio: float = 0.9,
+        latency_tolerance: float = 2.0,
+        smoothing: float = 0.2,
+    ):
+        """Create an instance of the AIMDLimit class.
+
+        :param initial_limit: The starting limit (default: 10).
+        :param min_limit: The lowest the limit may go (default: 1).
+        :param max_limit: The highest the limit may go (default: 200).
+        :param backoff_ratio: The factor applied to the limit on overload
+            (default: 0.9).
+        :param latency_tolerance: How many times the baseline latency the smoothed
+            latency may reach before it is treated as overload (default: 2).
+        :param smoothing: The weight of each new sample in the smoothed latency
+            (default: 0.2).
+        """
+        self._baseline = None
+        self._limit = float(initial_limit)
+        self._lock = threading.Lock()
+        self._smoothed = None
+        self.backoff_ratio = backoff_ratio
+        self.latency_tolerance = latency_tolerance
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.smoothing = smoothing
+        fork.register(self)
+
+    def _after_fork(self):
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self) -> int:
+        """Return the current number of requests that may be in flight at once."""
+        return int(self._limit)
+
+    def on_sample(self, latency: float, in_flight: int, dropped: bool):
+        """Update the limit from a completed request.
+
+        :param latency: The number of seconds the request took.
+        :param in_flight: The number of requests in flight when it completed.
+        :param dropped: Whether the request was rejected or failed due to overload.
+        """
+        with self._lock:
+            if self._smoothed is None:
+                self._smoothed = self._baseline = latency
+            else:
+                self._smoothed += self.smoothing * (latency - self._smoothed)
+                # Let the baseline drift upwards slowly so that a lasting change in
+                # network conditions is not treated as overload forever.
+                self._baseline = min(latency, self._baseline * 1.01)
+
+            previous = self.limit
+            if dropped or self._smoothed > self.latency_tolerance * self._baseline:
+                self._limit = max(self.min_limit, self._limit * self.backoff_ratio)
+            elif in_flight * 2 >= self._limit:
+                self._limit = min(self.max_limit, self._limit + 1)
+            if self.limit != previous:
+                log.debug(f"Concurrency limit changed from {previous} to {self.limit}")
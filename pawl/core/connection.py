@@ -0,0 +1,220 @@
+"""Provide connection reuse for the Requestor: DNS caching and TLS session reuse."""
+import logging
+import socket
+import ssl
+import threading
+import time
+import weakref
+from typing import Dict, List, Optional, Tuple
+
+from requests.adapters import HTTPAdapter
+from requests.certs import where
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from . import fork
+
+log = logging.getLogger(__package__)
+
+
+class DNSCache:
+    """Cache host name resolution results for ``ttl`` seconds."""
+
+    def __init__(self, ttl: float = 300):
+        """Create an instance of the DNSCache class.
+
+        :param ttl: The number of seconds a resolution is reused (default: 300).
+        """
+        self._cache: Dict[Tuple[str, int], Tuple[float, List[str]]] = {}
+        self._lock = threading.Lock()
+        self.ttl = ttl
+        fork.register(self)
+
+    def _after_fork(self):
+        self._lock = threading.Lock()
+
+    def forget(self, host: str, port: int):
+        """Drop the cached addresses of ``host``, e.g. after a failed connection."""
+        with self._lock:
+            self._cache.pop((host, port), None)
+
+    def resolve(self, host: str, port: int) -> List[str]:
+        """Return the addresses of ``host``, resolving it when not cached.
+
+        :param host: The host name.
+        :param port: The port that will be connected to.
+        """
+        key = (host, port)
+        with self._lock:
+            entry = self._cache.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+        addresses = []
+        for *_, address in socket.getaddrinfo(host, port, type=socket.SOCK_STREAM):
+            if address[0] not in addresses:
+                addresses.append(address[0])
+        with self._lock:
+            self._cache[key] = (time.monotonic() + self.ttl, addresses)
+        log.debug(f"Resolved {host} to {addresses}")
+        return addresses
+
+
+class _SessionSavingSocket(ssl.SSLSocket):
+    def _real_close(self):
+        # With TLS 1.3 the session ticket arrives after the handshake, so the session
+        # is saved when the socket closes rather than when it is created.
+        if isinstance(self.context, TLSSessionContext):
+            self.context._save(self)
+        super()._real_close()
+
+
+class TLSSessionContext(ssl.SSLContext):
+    """An SSL context that resumes the last TLS session of each server.
+
+    Resuming a session skips the certificate exchange and key agreement of a full
+    handshake when a pooled connection is replaced. Sessions are saved when sockets
+    close and collected from open sockets when another socket to the same server is
+    wrapped.
+    """
+
+    sslsocket_class = _SessionSavingSocket
+
+    def __new__(cls, protocol=ssl.PROTOCOL_TLS_CLIENT, *args, **kwargs):
+        """Create the context, defaulting to a client context."""
+        return super().__new__(cls, protocol, *args, **kwargs)
+
+    def __init__(self, *_args, **_kwargs):
+        """Create an instance of the TLSSessionContext class.
+
+        Certificates are verified against the CA bundle used by requests.
+        """
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self._sockets = {}
+        self.minimum_version = ssl.TLSVersion.TLSv1_2
+        self.load_verify_locations(where())
+        fork.register(self)
+
+    def _after_fork(self):
+        # Sessions are kept: resuming one from several processes is safe.
+        self._lock = threading.Lock()
+        self._sockets = {}
+
+    def _save(self, ssl_socket):
+        if ssl_socket.server_hostname is None:
+            return
+        try:
+            session = ssl_socket.session
+        except (OSError, ValueError):
+            return
+        if session is None:
+            return
+        with self._lock:
+            if session.has_ticket or ssl_socket.server_hostname not in self._sessions:
+                self._sessions[ssl_socket.server_hostname] = session
+
+    def _session(self, server_hostname: str) -> Optional[ssl.SSLSession]:
+        with self._lock:
+            sockets = list(self._sockets.get(server_hostname, ()))
+        for ssl_socket in sockets:
+            self._save(ssl_socket)
+        with self._lock:
+            session = self._sessions.get(server_hostname)
+        if session is not None and time.time() >= session.time + session.timeout:
+            return None
+        return session
+
+    def wrap_socket(self, sock, *args, server_hostname=None, session=None, **kwargs):
+        """Wrap ``sock``, resuming the last session with ``server_hostname``."""
+        if session is None and server_hostname is not None:
+            session = self._session(server_hostname)
+        ssl_socket = super().wrap_socket(
+            sock, *args, server_hostname=server_hostname, session=session, **kwargs
+        )
+        if server_hostname is not None:
+            if ssl_socket.session_reused:
+                log.debug(f"Resumed TLS session with {server_hostname}")
+            with self._lock:
+                self._sockets.setdefault(server_hostname, weakref.WeakSet()).add(
+                    ssl_socket
+                )
+        return ssl_socket
+
+
+class _CachedDNSMixin:
+    dns_cache: DNSCache
+
+    def _new_conn(self):
+        # Like socket.create_connection, try each address until one connects.
+        host = self._dns_host
+        error = None
+        try:
+            for address in self.dns_cache.resolve(host, self.port):
+                self._dns_host = address
+                try:
+                    return super()._new_conn()
+                except Exception as exception:
+                    error = exception
+        finally:
+            self._dns_host = host
+        self.dns_cache.forget(host, self.port)
+        if error is None:
+            raise OSError(f"No addresses found for {host}")
+        raise error
+
+
+def cached_pool_classes(dns_cache: DNSCache) -> Dict[str, type]:
+    """Return urllib3 pool classes, by scheme, whose connections use ``dns_cache``."""
+    attributes = {"dns_cache": dns_cache}
+    http_connection = type(
+        "CachedHTTPConnection", (_CachedDNSMixin, HTTPConnection), attributes
+    )
+    https_connection = type(
+        "CachedHTTPSConnection", (_CachedDNSMixin, HTTPSConnection), attributes
+    )
+    return {
+        "http": type(
+            "CachedHTTPConnectionPool",
+            (HTTPConnectionPool,),
+            {"ConnectionCls": http_connection},
+        ),
+        "https": type(
+            "CachedHTTPSConnectionPool",
+            (HTTPSConnectionPool,),
+            {"ConnectionCls": https_connection},
+        ),
+    }
+
+
+class ReusingAdapter(HTTPAdapter):
+    """An HTTPAdapter that caches DNS results and resumes TLS sessions."""
+
+    def __init__(
+        self,
+        dns_cache: Optional[DNSCache] = None,
+        ssl_context: Optional[ssl.SSLContext] = None,
+        **kwargs,
+    ):
+        """Create an instance of the ReusingAdapter class.
+
+        :param dns_cache: (Optional) The :class:`.DNSCache` used by connections.
+        :param ssl_context: (Optional) The SSL context used by connections (default:
+            a :class:`.TLSSessionContext`).
+        :param kwargs: Additional keyword arguments passed to ``HTTPAdapter``.
+        """
+        self.dns_cache = dns_cache or DNSCache()
+        self.ssl_context = ssl_context or TLSSessionContext()
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        """Create the pool manager with caching connection classes."""
+        pool_kwargs.setdefault("ssl_context", self.ssl_context)
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+        self.poolmanager.pool_classes_by_scheme = cached_pool_classes(self.dns_cache)
+
+    def __setstate__(self, state):
+        """Recreate the DNS cache and SSL context after unpickling."""
+        self.dns_cache = DNSCache()
+        self.ssl_context = TLSSessionContext()
+        super().__setstate__(state)
+
@@ -3,5 +3,10 @@ import os
 
 ACCESS_TOKEN_PATH = "v2/accessToken"
 AUTHORIZATION_PATH = "v2/authorization"
+INTROSPECT_TOKEN_PATH = "v2/introspectToken"
 
 TIMEOUT = float(os.environ.get("pawl_timeout", 16))
+
+# Keep full ``requests.Response`` objects and request payloads on exceptions
+# instead of compact snapshots.
+KEEP_RESPONSE = os.environ.get("pawl_keep_response", "").lower() in ("1", "true")
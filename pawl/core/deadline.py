@@ -0,0 +1,55 @@
+"""Provide the Deadline class."""
+import time
+
+from .exceptions import DeadlineExceeded
+
+
+class Deadline:
+    """Track the time remaining in a caller's total budget for a request.
+
+    A deadline covers every attempt, retry sleep and rate limit delay made on behalf
+    of a single call to :meth:`.Session.request`.
+    """
+
+    def __init__(self, seconds: float):
+        """Create an instance of the Deadline class.
+
+        :param seconds: The total number of seconds the call may take.
+        """
+        self.seconds = seconds
+        self._expires_at = time.monotonic() + seconds
+
+    def ensure(self, seconds: float = 0, action: str = "request"):
+        """Return the remaining budget if ``seconds`` fit within it.
+
+        :param seconds: The number of seconds about to be spent (default: 0).
+        :param action: A description of what the time will be spent on, used in the
+            exception message.
+
+        :raises: :class:`.DeadlineExceeded` if the remaining budget is not greater than
+            ``seconds``.
+        """
+        remaining = self.remaining()
+        if remaining <= seconds:
+            raise DeadlineExceeded(self.seconds, action)
+        return remaining
+
+    def remaining(self) -> float:
+        """Return the number of seconds left before the deadline."""
+        return self._expires_at - time.monotonic()
+
+    def timeout(self, timeout):
+        """Return ``timeout`` capped to the remaining budget.
+
+        :param timeout: Either a single number of seconds, a ``(connect, read)`` tuple
+            as accepted by requests, or ``None``.
+        """
+        remaining = self.ensure()
+        if timeout is None:
+            return remaining
+        if isinstance(timeout, tuple):
+            return tuple(
+                remaining if value is None else min(value, remaining)
+                for value in timeout
+            )
+        return min(timeout, remaining)
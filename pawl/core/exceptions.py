@@ -1,9 +1,183 @@
 """Provide exception classes for the Core package."""
+import json
+
+from .constants import KEEP_RESPONSE
+
+
+def _rebuild(exception_class, args, state):
+    exception = exception_class.__new__(exception_class, *args)
+    exception.args = args
+    exception.__dict__.update(state)
+    return exception
+
+
+class ResponseSnapshot:
+    """A compact, picklable summary of an HTTP response.
+
+    Snapshots stand in for the response on exceptions. They provide the parts of the
+    :class:`requests.Response` interface used to inspect errors (``status_code``,
+    ``headers``, ``text`` and ``json()``) without holding the full body or the
+    connection it was read from.
+    """
+
+    HEADERS = (
+        "content-type",
+        "location",
+        "retry-after",
+        "x-li-fabric",
+        "x-li-request-id",
+        "x-li-uuid",
+        "x-restli-id",
+    )
+    MAX_BODY = 2048
+
+    __slots__ = (
+        "headers",
+        "message",
+        "reason",
+        "service_error_code",
+        "status_code",
+        "text",
+        "truncated",
+        "url",
+    )
+
+    def __init__(
+        self,
+        status_code,
+        headers=None,
+        text="",
+        truncated=False,
+        reason=None,
+        url=None,
+        service_error_code=None,
+        message=None,
+    ):
+        """Initialize a ResponseSnapshot instance.
+
+        :param status_code: The HTTP status code.
+        :param headers: (Optional) A dictionary of the headers that were kept.
+        :param text: The (possibly truncated) body.
+        :param truncated: Whether ``text`` is shorter than the body.
+        :param reason: (Optional) The HTTP reason phrase.
+        :param url: (Optional) The URL of the response.
+        :param service_error_code: (Optional) Linkedin's ``serviceErrorCode``.
+        :param message: (Optional) Linkedin's error ``message``.
+
+        """
+        self.headers = headers or {}
+        self.message = message
+        self.reason = reason
+        self.service_error_code = service_error_code
+        self.status_code = status_code
+        self.text = text
+        self.truncated = truncated
+        self.url = url
+
+    def __reduce__(self):
+        """Pickle the snapshot as its constructor arguments."""
+        return (
+            ResponseSnapshot,
+            (
+                self.status_code,
+                self.headers,
+                self.text,
+                self.truncated,
+                self.reason,
+                self.url,
+                self.service_error_code,
+                self.message,
+            ),
+        )
+
+    def __repr__(self):
+        """Return a string representation of the snapshot."""
+        return f"<ResponseSnapshot [{self.status_code}]>"
+
+    @classmethod
+    def from_response(cls, response, max_body=MAX_BODY):
+        """Return a snapshot of ``response``.
+
+        :param response: A requests.response instance.
+        :param max_body: The number of characters of the body to keep
+            (default: 2048).
+
+        """
+        if isinstance(response, ResponseSnapshot):
+            return response
+        text = response.text
+        payload = None
+        try:
+            payload = response.json()
+        except ValueError:
+            pass
+        if not isinstance(payload, dict):
+            payload = {}
+        return cls(
+            response.status_code,
+            headers={
+                name: response.headers[name]
+                for name in cls.HEADERS
+                if name in response.headers
+            },
+            text=text[:max_body],
+            truncated=len(text) > max_body,
+            reason=getattr(response, "reason", None),
+            url=getattr(response, "url", None),
+            service_error_code=payload.get("serviceErrorCode"),
+            message=payload.get("message"),
+        )
+
+    def json(self):
+        """Return the parsed body.
+
+        :raises: ``ValueError`` when the body is not valid JSON or was truncated.
+
+        """
+        return json.loads(self.text)
 
 
 class CoreException(Exception):
     """Base exception class for exceptions that occur within this package."""
 
+    def __reduce__(self):
+        """Pickle the exception without calling ``__init__`` when unpickling.
+
+        Subclasses take different arguments than the message stored in ``args``, so
+        the default pickling would fail to recreate them. Full responses kept by
+        :attr:`.ResponseException.keep_response` are replaced by their snapshots.
+
+        """
+        state = dict(self.__dict__)
+        if "snapshot" in state:
+            state["response"] = state["snapshot"]
+        return _rebuild, (type(self), self.args, state)
+
+    def _set_response(self, response):
+        self.snapshot = ResponseSnapshot.from_response(response)
+        self.response = response if ResponseException.keep_response else self.snapshot
+
+
+class DeadlineExceeded(CoreException):
+    """Indicate that a request could not complete within the caller's deadline."""
+
+    def __init__(self, deadline, action):
+        """Initialize a DeadlineExceeded instance.
+
+        :param deadline: The total number of seconds that was allowed.
+        :param action: What could not be completed before the deadline.
+
+        """
+        self.deadline = deadline
+        self.action = action
+        super(DeadlineExceeded, self).__init__(
+            f"deadline of {deadline:0.2f} seconds exceeded before {action}"
+        )
+
+
+class InactiveToken(CoreException):
+    """Indicate that token introspection found the access token is not active."""
+
 
 class InvalidInvocation(CoreException):
     """Indicate that the code to execute cannot be completed."""
@@ -12,14 +186,30 @@ class InvalidInvocation(CoreException):
 class RequestException(CoreException):
     """Indicate that there was an error with the incomplete HTTP request."""
 
+    SUMMARY_KWARGS = ("allow_redirects", "params", "timeout")
+
     def __init__(self, original_exception, request_args, request_kwargs):
         """Initialize a RequestException instance.
 
+        Unless :attr:`.ResponseException.keep_response` is set, only a summary of the
+        request is kept: ``request_kwargs`` is reduced to ``SUMMARY_KWARGS``, so
+        payloads and headers are dropped, and the request and response references
+        on ``original_exception`` are cleared.
+
         :param original_exception: The original exception that occurred.
         :param request_args: The arguments to the request function.
         :param request_kwargs: The keyword arguments to the request function.
 
         """
+        if not ResponseException.keep_response:
+            request_kwargs = {
+                key: value
+                for key, value in request_kwargs.items()
+                if key in self.SUMMARY_KWARGS
+            }
+            for attribute in ("request", "response"):
+                if getattr(original_exception, attribute, None) is not None:
+                    setattr(original_exception, attribute, None)
         self.original_exception = original_exception
         self.request_args = request_args
         self.request_kwargs = request_kwargs
@@ -29,7 +219,16 @@ class RequestException(CoreException):
 
 
 class ResponseException(CoreException):
-    """Indicate that there was an error with the completed HTTP request."""
+    """Indicate that there was an error with the completed HTTP request.
+
+    ``response`` is a :class:`.ResponseSnapshot` of the response. Set
+    ``ResponseException.keep_response`` to ``True``, or the ``pawl_keep_response``
+    environment variable to ``1``, to keep the full ``requests.Response`` instead.
+    ``snapshot`` is always available and is what is sent when the exception is
+    pickled.
+    """
+
+    keep_response = KEEP_RESPONSE
 
     def __init__(self, response):
         """Initialize a ResponseException instance.
@@ -37,7 +236,7 @@ class ResponseException(CoreException):
         :param response: A requests.response instance.
 
         """
-        self.response = response
+        self._set_response(response)
         super(ResponseException, self).__init__(
             f"received {response.status_code} HTTP response"
         )
@@ -56,7 +255,7 @@ class OAuthException(CoreException):
         """
         self.error = error
         self.description = description
-        self.response = response
+        self._set_response(response)
         message = f"{error} error processing request"
         if description:
             message += f" ({description})"
@@ -117,9 +316,9 @@ class SpecialError(ResponseException):
             special errors.
 
         """
-        self.response = response
+        self._set_response(response)
 
-        resp_dict = self.response.json()  # assumes valid JSON
+        resp_dict = response.json()  # assumes valid JSON
         self.message = resp_dict.get("message", "")
         self.reason = resp_dict.get("reason", "")
         self.special_errors = resp_dict.get("special_errors", [])
@@ -140,16 +339,18 @@ class TooManyRequests(ResponseException):
         header and a message.
 
         """
-        self.response = response
+        self._set_response(response)
         self.retry_after = response.headers.get("retry-after")
-        self.message = response.text  # Not all response bodies are valid JSON
+        # Not all response bodies are valid JSON
+        self.message = self.snapshot.text
 
         msg = f"received {response.status_code} HTTP response"
         if self.retry_after:
-            msg += (
-                f". Please wait at least {float(self.retry_after)} seconds "
-                "before re-trying this request."
-            )
+            try:
+                wait = f"at least {float(self.retry_after)} seconds"
+            except ValueError:  # An HTTP date.
+                wait = f"until {self.retry_after}"
+            msg += f". Please wait {wait} before re-trying this request."
         CoreException.__init__(self, msg)
 
 
@@ -0,0 +1,57 @@
+"""Provide fork safety for objects that hold connections, locks or threads.
+
+A process created with ``os.fork`` (as done by prefork servers such as gunicorn and
+uwsgi, and by ``multiprocessing`` on Linux) inherits the parent's pooled sockets,
+SQLite connections and locks, which must not be shared. Objects that hold them call
+:func:`register` and implement ``_after_fork``, which replaces those resources in the
+child while keeping warm state such as tokens and caches.
+
+Rate limit state is warm state too: each child starts with a copy of the parent's
+:class:`.RateLimiter`, including its ``remaining`` budget, and then counts its own
+calls only. Processes do not divide the budget between them. To keep several of
+them under one limit, give them a shared :class:`.QuotaLedger`, which counts the
+calls of every process using its database, and check its ``remaining`` budget.
+"""
+import logging
+import os
+import weakref
+
+log = logging.getLogger(__package__)
+
+_inherited = []
+_registry = weakref.WeakSet()
+
+
+def _after_fork_in_child():
+    # Anything inherited from the parent belongs to it, including these references.
+    _inherited.clear()
+    for instance in list(_registry):
+        try:
+            instance._after_fork()
+        except Exception:
+            log.exception(f"Failed to reset {instance!r} after fork")
+
+
+def abandon(resource):
+    """Keep an inherited ``resource`` alive without using or closing it.
+
+    Closing an inherited SQLite connection in the child can disturb the parent's use
+    of the database, so connections are replaced and the old ones are never closed.
+
+    :param resource: The inherited resource.
+    """
+    _inherited.append(resource)
+
+
+def register(instance):
+    """Call ``instance._after_fork()`` in child processes after each fork.
+
+    Only a weak reference to ``instance`` is kept.
+
+    :param instance: An object with an ``_after_fork`` method.
+    """
+    _registry.add(instance)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
@@ -0,0 +1,176 @@
+"""Provide the HedgePolicy class."""
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Optional
+
+from . import fork
+
+log = logging.getLogger(__package__)
+
+
+class _Attempt:
+    __slots__ = ("started", "started_at")
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.started_at = None
+
+
+class HedgePolicy:
+    """Send a second attempt of slow idempotent requests and use the first response.
+
+    Latencies of the transport calls of attempts are tracked over a sliding window.
+    Time spent waiting for a scheduler slot or a rate limit delay is not counted, and
+    the hedge timer only starts once an attempt's transport call does. Once enough
+    samples exist, an attempt that has not responded within the ``percentile``
+    latency is hedged with a second, identical attempt. Whichever attempt succeeds
+    first is used and the other response is closed when it arrives.
+
+    Attempts report their transport calls by calling :meth:`.start_transport` and
+    :meth:`.record` from the thread running the attempt.
+
+    Hedges are limited to ``max_ratio`` of all requests so that they cannot spend
+    more than that share of the rate budget.
+    """
+
+    IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        max_ratio: float = 0.05,
+        min_delay: float = 0.05,
+        min_samples: int = 20,
+        window: int = 1000,
+        max_workers: int = 8,
+    ):
+        """Create an instance of the HedgePolicy class.
+
+        :param percentile: The latency percentile after which a hedge is sent
+            (default: 0.95).
+        :param max_ratio: The largest fraction of requests that may be hedged
+            (default: 0.05).
+        :param min_delay: The shortest time in seconds to wait before hedging
+            (default: 0.05).
+        :param min_samples: The number of latency samples needed before hedging
+            starts (default: 20).
+        :param window: The number of recent latency samples to track (default: 1000).
+        :param max_workers: The number of threads used to run attempts (default: 8).
+        """
+        self._executor = None
+        self._hedges = 0
+        self._latencies = deque(maxlen=window)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._requests = 0
+        self.max_ratio = max_ratio
+        self.max_workers = max_workers
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.percentile = percentile
+        fork.register(self)
+
+    def _after_fork(self):
+        # The executor's threads do not exist in the child; a new one is created on
+        # the next hedged request.
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _discard(future):
+        if future.exception() is None:
+            response = future.result()
+            if hasattr(response, "close"):
+                response.close()
+
+    def _allow_hedge(self) -> bool:
+        with self._lock:
+            if self._hedges + 1 > self.max_ratio * self._requests:
+                return False
+            self._hedges += 1
+            return True
+
+    def _run(self, function, attempt: _Attempt):
+        self._local.attempt = attempt
+        try:
+            return function()
+        finally:
+            self._local.attempt = None
+            attempt.started.set()  # Wake a waiting caller if no transport call began.
+
+    def call(self, function, may_hedge: Optional[Callable[[], bool]] = None):
+        """Call ``function``, hedging it with a second call if it is slow.
+
+        :param function: A function taking no arguments that performs one attempt.
+        :param may_hedge: (Optional) A function returning whether a hedge may be sent
+            now, e.g. ``False`` while the rate limiter is delaying requests.
+        """
+        with self._lock:
+            self._requests += 1
+        delay = self.delay()
+        if delay is None:
+            return self._run(function, _Attempt())
+
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.max_workers, thread_name_prefix="pawl-hedge"
+                    )
+        attempt = _Attempt()
+        primary = self._executor.submit(self._run, function, attempt)
+        attempt.started.wait()
+        timeout = delay
+        if attempt.started_at is not None:
+            timeout -= time.monotonic() - attempt.started_at
+        done, _ = wait([primary], timeout=max(timeout, 0))
+        if done or (may_hedge is not None and not may_hedge()):
+            return primary.result()
+        if not self._allow_hedge():
+            return primary.result()
+
+        log.debug(f"Hedging request after {delay:0.3f} seconds")
+        attempts = [primary, self._executor.submit(self._run, function, _Attempt())]
+        pending = set(attempts)
+        exception = None
+        while pending:
+            done, pending = wait(pending, return_when="FIRST_COMPLETED")
+            for future in done:
+                if future.exception() is None:
+                    for other in attempts:
+                        if other is not future:
+                            other.add_done_callback(self._discard)
+                    return future.result()
+                exception = future.exception()
+        raise exception
+
+    def delay(self) -> Optional[float]:
+        """Return the seconds to wait before hedging, or ``None`` while warming up."""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            latencies = sorted(self._latencies)
+        index = min(int(len(latencies) * self.percentile), len(latencies) - 1)
+        return max(self.min_delay, latencies[index])
+
+    def record(self, latency: float):
+        """Record the latency of the transport call of the current attempt.
+
+        Calls made outside of :meth:`.call` are ignored.
+
+        :param latency: The number of seconds the transport call took.
+        """
+        if getattr(self._local, "attempt", None) is None:
+            return
+        with self._lock:
+            self._latencies.append(latency)
+
+    def start_transport(self):
+        """Mark the start of the transport call of the current attempt."""
+        attempt = getattr(self._local, "attempt", None)
+        if attempt is not None and not attempt.started.is_set():
+            attempt.started_at = time.monotonic()
+            attempt.started.set()
@@ -0,0 +1,170 @@
+"""Provide the TokenIntrospector class."""
+import hashlib
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Optional, Union
+
+from . import constants, fork
+from .exceptions import ResponseException
+
+log = logging.getLogger(__package__)
+
+
+class TokenIntrospector:
+    """Check access tokens against Linkedin's token introspection endpoint.
+
+    Results are kept in a TTL cache keyed by a hash of the token. Authorizers created
+    with an ``introspector`` consult the cache so that tokens known to be revoked or
+    expired are rejected before any API call is made, and so that the expiry of
+    tokens loaded from a token manager or passed as ``access_token`` is known.
+
+    .. code-block:: python
+
+        introspector = TokenIntrospector(client_id, client_secret)
+        results = introspector.introspect_many(stored_tokens)
+        live = [token for token in stored_tokens if introspector.is_active(token)]
+    """
+
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        requestor=None,
+        ttl: float = 300,
+        max_workers: int = 8,
+    ):
+        """Create an instance of the TokenIntrospector class.
+
+        :param client_id: The client ID of the application that owns the tokens.
+        :param client_secret: The client secret of the application.
+        :param requestor: (Optional) The :class:`.Requestor` used to make requests.
+        :param ttl: The number of seconds a result is cached (default: 300). Results
+            for active tokens are never cached past the token's expiry.
+        :param max_workers: The number of tokens checked concurrently by
+            :meth:`.introspect_many` (default: 8).
+        """
+        if requestor is None:
+            from .requestor import Requestor
+
+            requestor = Requestor()
+        self._cache = {}
+        self._lock = threading.Lock()
+        self._requestor = requestor
+        self.client_id = client_id
+        self.client_secret = client_secret
+        self.max_workers = max_workers
+        self.ttl = ttl
+        fork.register(self)
+
+    def _after_fork(self):
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _fingerprint(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def _store(self, token: str, payload: Dict[str, Any]):
+        now = time.time()
+        cached_until = now + self.ttl
+        if payload.get("active") and payload.get("expires_at"):
+            cached_until = min(cached_until, payload["expires_at"])
+        with self._lock:
+            self._cache[self._fingerprint(token)] = (cached_until, payload)
+
+    def cached(self, token: str) -> Optional[Dict[str, Any]]:
+        """Return the cached introspection result for ``token``, if still fresh.
+
+        :param token: The access token.
+        """
+        fingerprint = self._fingerprint(token)
+        with self._lock:
+            entry = self._cache.get(fingerprint)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._cache[fingerprint]
+                return None
+        return entry[1]
+
+    def introspect(self, token: str, use_cache: bool = True) -> Dict[str, Any]:
+        """Return Linkedin's introspection result for ``token``.
+
+        The result contains at least ``active``. Active tokens also report ``status``,
+        ``scope`` and ``expires_at`` (seconds since the epoch).
+
+        :param token: The access token.
+        :param use_cache: Whether a fresh cached result may be returned
+            (default: True).
+        """
+        if use_cache:
+            payload = self.cached(token)
+            if payload is not None:
+                return payload
+        url = self._requestor.oauth_url + constants.INTROSPECT_TOKEN_PATH
+        response = self._requestor.request(
+            "POST",
+            url,
+            data={
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
+                "token": token,
+            },
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
+        if response.status_code != 200:
+            raise ResponseException(response)
+        payload = response.json()
+        self._store(token, payload)
+        return payload
+
+    def introspect_many(
+        self, tokens: Iterable[str]
+    ) -> Dict[str, Union[Dict[str, Any], Exception]]:
+        """Return introspection results for ``tokens``, checking them concurrently.
+
+        Tokens with a fresh cached result are not sent to Linkedin. A token whose
+        check fails maps to the exception raised for it instead of a result, so one
+        failure does not discard the results of the other tokens.
+
+        :param tokens: The access tokens to check.
+        """
+        results: Dict[str, Union[Dict[str, Any], Exception]] = {}
+        missing = []
+        for token in tokens:
+            payload = self.cached(token)
+            if payload is None:
+                missing.append(token)
+            else:
+                results[token] = payload
+        if missing:
+            log.debug(f"Introspecting {len(missing)} tokens")
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {
+                    token: executor.submit(self.introspect, token, use_cache=False)
+                    for token in missing
+                }
+            for token, future in futures.items():
+                exception = future.exception()
+                if exception is not None:
+                    log.debug(f"Introspection failed: {exception!r}")
+                    results[token] = exception
+                else:
+                    results[token] = future.result()
+        return results
+
+    def is_active(self, token: str) -> Optional[bool]:
+        """Return whether ``token`` is active according to the cache.
+
+        Returns ``None`` when there is no fresh cached result for ``token``.
+
+        :param token: The access token.
+        """
+        payload = self.cached(token)
+        if payload is None:
+            return None
+        expires_at = payload.get("expires_at")
+        return bool(payload.get("active")) and (
+            expires_at is None or time.time() < expires_at
+        )
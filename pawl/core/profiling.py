@@ -0,0 +1,284 @@
+"""Provide sampled profiling of requests.
+
+Profiling is off unless it is enabled with :func:`enable` or with the
+``pawl_profile`` environment variable, whose value is the sample rate ``N``: one in
+every ``N`` requests is run under :mod:`cProfile` and :mod:`tracemalloc`. Time and
+memory are attributed to the stages of the request pipeline, and an aggregated report
+is logged, or written to ``pawl_profile_path``, every ``pawl_profile_interval``
+seconds (default: 60).
+
+Requests that are not sampled only pay for a counter increment and a thread-local
+lookup per stage.
+"""
+import cProfile
+import io
+import itertools
+import logging
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import nullcontext
+from typing import Optional
+
+from . import fork
+
+log = logging.getLogger(__package__)
+
+_NULL_CONTEXT = nullcontext()
+_profiler = None
+
+
+class _StageStats:
+    __slots__ = ("calls", "peak", "seconds")
+
+    def __init__(self):
+        self.calls = 0
+        self.peak = 0
+        self.seconds = 0.0
+
+
+class _Stage:
+    __slots__ = ("_memory", "_name", "_profiler", "_start")
+
+    def __init__(self, profiler, name):
+        self._name = name
+        self._profiler = profiler
+
+    def __enter__(self):
+        self._memory = None
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+            self._memory = tracemalloc.get_traced_memory()[0]
+        self._start = time.perf_counter()
+
+    def __exit__(self, *_args):
+        seconds = time.perf_counter() - self._start
+        peak = 0
+        if self._memory is not None and tracemalloc.is_tracing():
+            peak = max(tracemalloc.get_traced_memory()[1] - self._memory, 0)
+        self._profiler._add_stage(self._name, seconds, peak)
+
+
+class _Sample:
+    __slots__ = ("_profile", "_profiler", "_sampling", "_started_tracing")
+
+    def __init__(self, profiler):
+        self._profiler = profiler
+
+    def __enter__(self):
+        # Only one sample runs at a time: cProfile may not be enabled twice at once
+        # and tracemalloc's counters are process wide.
+        self._sampling = self._profiler._sampling.acquire(blocking=False)
+        if not self._sampling:
+            return
+        self._profile = cProfile.Profile()
+        try:
+            self._profile.enable()
+        except ValueError:  # Another profiler is active.
+            self._profile = None
+        self._started_tracing = False
+        if self._profiler.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._profiler._local.active = True
+
+    def __exit__(self, *_args):
+        if not self._sampling:
+            return
+        self._profiler._local.active = False
+        if self._profile is not None:
+            self._profile.disable()
+        if self._started_tracing:
+            tracemalloc.stop()
+        self._profiler._sampling.release()
+        self._profiler._add_sample(self._profile)
+
+
+class Profiler:
+    """Profile one in every ``sample_rate`` requests and aggregate the results.
+
+    .. code-block:: python
+
+        from pawl.core import profiling
+
+        profiler = profiling.enable(sample_rate=50, report_path="pawl-profile.txt")
+        ...
+        print(profiler.report())
+
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 100,
+        report_interval: Optional[float] = 60,
+        report_path: Optional[str] = None,
+        trace_memory: bool = True,
+        top: int = 25,
+    ):
+        """Create an instance of the Profiler class.
+
+        :param sample_rate: Profile one in every ``sample_rate`` requests
+            (default: 100).
+        :param report_interval: The number of seconds between reports, or ``None`` to
+            only report on demand (default: 60).
+        :param report_path: (Optional) The file reports are written to. The raw
+            :mod:`cProfile` statistics are written next to it with a ``.prof``
+            suffix. When not given, reports are logged at INFO level.
+        :param trace_memory: Whether to trace allocations with :mod:`tracemalloc`
+            during sampled requests (default: True).
+        :param top: The number of functions listed in each report (default: 25).
+        """
+        self._counter = itertools.count(1)
+        self._last_report = time.monotonic()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._sampling = threading.Lock()
+        self._samples = 0
+        self._stages = {}
+        self._stats = None
+        self.report_interval = report_interval
+        self.report_path = report_path
+        self.sample_rate = sample_rate
+        self.top = top
+        self.trace_memory = trace_memory
+        fork.register(self)
+
+    def _after_fork(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._sampling = threading.Lock()
+
+    def _add_sample(self, profile):
+        with self._lock:
+            self._samples += 1
+            if profile is not None:
+                if self._stats is None:
+                    self._stats = pstats.Stats(profile)
+                else:
+                    self._stats.add(profile)
+            due = (
+                self.report_interval is not None
+                and time.monotonic() - self._last_report >= self.report_interval
+            )
+        if due:
+            self.dump()
+
+    def _add_stage(self, name: str, seconds: float, peak: int):
+        with self._lock:
+            stats = self._stages.get(name)
+            if stats is None:
+                stats = self._stages[name] = _StageStats()
+            stats.calls += 1
+            stats.peak = max(stats.peak, peak)
+            stats.seconds += seconds
+
+    def dump(self, reset: bool = True) -> str:
+        """Write or log a report and return it.
+
+        :param reset: Whether to start a new aggregation period (default: True).
+        """
+        with self._lock:
+            report = self._report()
+            stats = self._stats
+            if reset:
+                self._last_report = time.monotonic()
+                self._samples = 0
+                self._stages = {}
+                self._stats = None
+        if self.report_path is None:
+            log.info(report)
+        else:
+            temporary_path = f"{self.report_path}.tmp"
+            with open(temporary_path, "w") as report_file:
+                report_file.write(report)
+            os.replace(temporary_path, self.report_path)
+            if stats is not None:
+                stats.dump_stats(f"{self.report_path}.prof")
+        return report
+
+    def report(self) -> str:
+        """Return a report of the requests sampled so far in this period."""
+        with self._lock:
+            return self._report()
+
+    def _report(self) -> str:
+        lines = [
+            f"pawl profile: {self._samples} sampled requests (1 in {self.sample_rate})",
+            f"{'stage':<24}{'calls':>8}{'total s':>12}{'mean ms':>12}{'peak KiB':>12}",
+        ]
+        for name, stats in sorted(
+            self._stages.items(), key=lambda item: item[1].seconds, reverse=True
+        ):
+            lines.append(
+                f"{name:<24}{stats.calls:>8}{stats.seconds:>12.4f}"
+                f"{stats.seconds / stats.calls * 1000:>12.3f}"
+                f"{stats.peak / 1024:>12.1f}"
+            )
+        if self._stats is not None:
+            stream = io.StringIO()
+            self._stats.stream = stream
+            self._stats.sort_stats("cumulative").print_stats(self.top)
+            lines.append(stream.getvalue())
+        return "\n".join(lines)
+
+    def request(self):
+        """Return a context manager that profiles the request when it is sampled."""
+        if next(self._counter) % self.sample_rate:
+            return _NULL_CONTEXT
+        return _Sample(self)
+
+    def stage(self, name: str):
+        """Return a context manager attributing time and memory to stage ``name``.
+
+        Stages are only measured inside a sampled request on the same thread.
+
+        :param name: The name of the stage, e.g. ``"transport"``.
+        """
+        if not getattr(self._local, "active", False):
+            return _NULL_CONTEXT
+        return _Stage(self, name)
+
+
+def disable() -> Optional[Profiler]:
+    """Stop profiling, write a final report and return the profiler, if any."""
+    global _profiler
+    profiler, _profiler = _profiler, None
+    if profiler is not None:
+        profiler.dump()
+    return profiler
+
+
+def enable(sample_rate: int = 100, **profiler_kwargs) -> Profiler:
+    """Start profiling one in every ``sample_rate`` requests and return the profiler.
+
+    :param sample_rate: Profile one in every ``sample_rate`` requests (default: 100).
+    :param profiler_kwargs: Additional keyword arguments passed to :class:`.Profiler`.
+    """
+    global _profiler
+    _profiler = Profiler(sample_rate=sample_rate, **profiler_kwargs)
+    return _profiler
+
+
+def request():
+    """Return a context manager that profiles the current request when sampled."""
+    profiler = _profiler
+    return _NULL_CONTEXT if profiler is None else profiler.request()
+
+
+def stage(name: str):
+    """Return a context manager that measures stage ``name`` of a sampled request.
+
+    :param name: The name of the stage.
+    """
+    profiler = _profiler
+    return _NULL_CONTEXT if profiler is None else profiler.stage(name)
+
+
+if os.environ.get("pawl_profile"):
+    enable(
+        int(os.environ["pawl_profile"]),
+        report_interval=float(os.environ.get("pawl_profile_interval", 60)),
+        report_path=os.environ.get("pawl_profile_path"),
+    )
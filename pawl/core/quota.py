@@ -0,0 +1,279 @@
+"""Provide the QuotaLedger class."""
+import atexit
+import calendar
+import logging
+import re
+import sqlite3
+import threading
+import time
+import weakref
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from . import fork
+
+log = logging.getLogger(__package__)
+
+_ID_SEGMENT = re.compile(r"^\d+$|urn:|urn%3A|^\(|^List\(", re.IGNORECASE)
+
+_open_ledgers = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_ledgers():
+    for ledger in list(_open_ledgers):
+        try:
+            ledger.flush()
+        except sqlite3.Error:
+            log.exception(f"Failed to flush {ledger._database}")
+
+
+def endpoint_for(url: str) -> str:
+    """Return the quota endpoint of ``url``, e.g. ``v2/shares/{id}``.
+
+    The query string is dropped and path segments holding ids or URNs are replaced
+    with ``{id}`` so that calls to the same resource share one entry.
+
+    :param url: The URL or path of the request.
+    """
+    path = urlsplit(url).path.strip("/")
+    return "/".join(
+        "{id}" if _ID_SEGMENT.search(segment) else segment
+        for segment in path.split("/")
+    )
+
+
+def _day(timestamp: float) -> str:
+    return time.strftime("%Y-%m-%d", time.gmtime(timestamp))
+
+
+def reset_timestamp(timestamp: Optional[float] = None) -> float:
+    """Return when the daily quotas next reset: the next midnight UTC.
+
+    :param timestamp: (Optional) The time to start from (default: now).
+    """
+    timestamp = time.time() if timestamp is None else timestamp
+    day = time.gmtime(timestamp)
+    midnight = calendar.timegm((day.tm_year, day.tm_mon, day.tm_mday, 0, 0, 0))
+    return midnight + 86400
+
+
+class QuotaLedger:
+    """A persistent record of API calls per UTC day, endpoint, member and status.
+
+    Linkedin limits the number of calls each application, and each member, may make
+    to an endpoint per day, resetting at midnight UTC. The ledger counts every call
+    that reaches Linkedin, including retries, in a SQLite database that any number of
+    processes may share. Responses with status 429 are recorded but not counted
+    against the quota.
+
+    Calls are buffered in memory and written every ``flush_interval`` seconds, so
+    recording a call does not wait on the disk.
+
+    .. code-block:: python
+
+        ledger = QuotaLedger(
+            "quota.db",
+            app_limits={"v2/reactions": 100000},
+            member_limits={"v2/reactions": 500},
+        )
+        linkedin = Linkedin(access_token=token, session_kwargs={"quota_ledger": ledger})
+        ...
+        linkedin.quota.remaining("v2/reactions", "urn:li:person:123")
+        linkedin.quota.forecast("v2/reactions")
+    """
+
+    UNCOUNTED_STATUSES = {429}
+
+    def __init__(
+        self,
+        database: str,
+        app_limits: Optional[Dict[str, int]] = None,
+        member_limits: Optional[Dict[str, int]] = None,
+        flush_interval: float = 5.0,
+    ):
+        """Open (or create) the ledger.
+
+        :param database: The path to the SQLite database.
+        :param app_limits: (Optional) The daily number of calls the application may
+            make to each endpoint.
+        :param member_limits: (Optional) The daily number of calls each member may
+            make to each endpoint.
+        :param flush_interval: The longest time in seconds that recorded calls are
+            buffered before they are written (default: 5).
+        """
+        self._buffer: Dict[Tuple[str, str, str, int], List[float]] = {}
+        self._database = database
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self.app_limits = app_limits or {}
+        self.flush_interval = flush_interval
+        self.member_limits = member_limits or {}
+        self._connect()
+        fork.register(self)
+        _open_ledgers.add(self)
+
+    def _after_fork(self):
+        # Calls buffered in the parent are written by the parent.
+        fork.abandon(self._connection)
+        self._buffer = {}
+        self._lock = threading.Lock()
+        self._connect()
+
+    def _connect(self):
+        self._connection = sqlite3.connect(self._database, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS usage (day TEXT NOT NULL,"
+            " endpoint TEXT NOT NULL, member TEXT NOT NULL, status INTEGER NOT NULL,"
+            " calls INTEGER NOT NULL, first_at REAL, last_at REAL,"
+            " PRIMARY KEY (day, endpoint, member, status))"
+        )
+        self._connection.commit()
+
+    def _flush(self):
+        """Write the buffer. The caller holds ``self._lock``.
+
+        The buffer is kept when writing fails.
+        """
+        if self._buffer:
+            try:
+                self._connection.executemany(
+                    "INSERT INTO usage VALUES (?, ?, ?, ?, ?, ?, ?)"
+                    " ON CONFLICT (day, endpoint, member, status) DO UPDATE SET"
+                    " calls=calls+excluded.calls,"
+                    " first_at=min(first_at, excluded.first_at),"
+                    " last_at=max(last_at, excluded.last_at)",
+                    [(*key, *value) for key, value in self._buffer.items()],
+                )
+                self._connection.commit()
+            except sqlite3.Error:
+                self._connection.rollback()
+                raise
+            self._buffer = {}
+        self._last_flush = time.monotonic()
+
+    def _used(
+        self, day: str, endpoint: Optional[str], member: Optional[str]
+    ) -> Tuple[int, Optional[float]]:
+        """Return the counted calls and the time of the first one.
+
+        The caller holds ``self._lock``.
+        """
+        query = "SELECT status, calls, first_at FROM usage WHERE day=?"
+        parameters: Tuple = (day,)
+        if endpoint is not None:
+            query += " AND endpoint=?"
+            parameters += (endpoint,)
+        if member is not None:
+            query += " AND member=?"
+            parameters += (member,)
+        rows = self._connection.execute(query, parameters).fetchall()
+        for (row_day, row_endpoint, row_member, status), value in self._buffer.items():
+            if (
+                row_day == day
+                and endpoint in (None, row_endpoint)
+                and member in (None, row_member)
+            ):
+                rows.append((status, value[0], value[1]))
+        calls = 0
+        first_at = None
+        for status, count, started_at in rows:
+            if status in self.UNCOUNTED_STATUSES:
+                continue
+            calls += count
+            if first_at is None or started_at < first_at:
+                first_at = started_at
+        return calls, first_at
+
+    def _limit(self, endpoint: str, member: Optional[str]) -> Optional[int]:
+        return (self.app_limits if member is None else self.member_limits).get(endpoint)
+
+    def close(self):
+        """Write buffered calls and close the database connection."""
+        self.flush()
+        _open_ledgers.discard(self)
+        self._connection.close()
+
+    def flush(self):
+        """Write buffered calls to the database."""
+        with self._lock:
+            self._flush()
+
+    def forecast(self, endpoint: str, member: Optional[str] = None) -> Optional[float]:
+        """Return when the quota runs out at today's average rate, or ``None``.
+
+        ``None`` is returned when no limit is configured, no calls were made today,
+        or the quota lasts until it resets.
+
+        :param endpoint: The endpoint, e.g. ``v2/reactions``.
+        :param member: (Optional) A member URN to forecast the member quota instead
+            of the application quota.
+        """
+        limit = self._limit(endpoint, member)
+        if limit is None:
+            return None
+        now = time.time()
+        with self._lock:
+            calls, first_at = self._used(_day(now), endpoint, member)
+        if not calls:
+            return None
+        remaining = limit - calls
+        if remaining <= 0:
+            return now
+        elapsed = max(now - first_at, 1.0)
+        exhausted_at = now + remaining * elapsed / calls
+        return exhausted_at if exhausted_at < reset_timestamp(now) else None
+
+    def record(self, url: str, member: str, status: int):
+        """Record one call.
+
+        :param url: The URL, path or endpoint of the call.
+        :param member: The URN (or other key) of the member whose token was used.
+        :param status: The HTTP status of the response.
+        """
+        now = time.time()
+        key = (_day(now), endpoint_for(url), member or "", status)
+        with self._lock:
+            value = self._buffer.get(key)
+            if value is None:
+                self._buffer[key] = [1, now, now]
+            else:
+                value[0] += 1
+                value[2] = now
+            if time.monotonic() - self._last_flush >= self.flush_interval:
+                # The call succeeded, so a busy database must not fail it. The calls
+                # stay buffered and are written by a later flush.
+                try:
+                    self._flush()
+                except sqlite3.Error as exception:
+                    log.warning(f"Failed to write quota ledger: {exception}")
+                    self._last_flush = time.monotonic()
+
+    def remaining(self, endpoint: str, member: Optional[str] = None) -> Optional[int]:
+        """Return how many calls remain today, or ``None`` if no limit is configured.
+
+        :param endpoint: The endpoint, e.g. ``v2/reactions``.
+        :param member: (Optional) A member URN to return the member's remaining calls
+            instead of the application's.
+        """
+        limit = self._limit(endpoint, member)
+        if limit is None:
+            return None
+        return max(limit - self.used(endpoint, member), 0)
+
+    def used(
+        self,
+        endpoint: Optional[str] = None,
+        member: Optional[str] = None,
+        day: Optional[str] = None,
+    ) -> int:
+        """Return the number of calls counted against quotas.
+
+        :param endpoint: (Optional) Only count calls to this endpoint.
+        :param member: (Optional) Only count calls made for this member.
+        :param day: (Optional) The UTC day as ``YYYY-MM-DD`` (default: today).
+        """
+        with self._lock:
+            return self._used(day or _day(time.time()), endpoint, member)[0]
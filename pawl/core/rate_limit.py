@@ -2,10 +2,20 @@
 import logging
 import time
 
+from . import profiling
+
 log = logging.getLogger(__package__)
 
 
 class RateLimiter:
+    """Space requests to stay within Linkedin's rate limits.
+
+    The state is kept per process. A process forked from one that made requests
+    starts with the same ``remaining`` budget and counts only its own calls, so
+    processes sharing a limit should record their calls in a shared
+    :class:`.QuotaLedger` and check its ``remaining`` budget.
+    """
+
     def __init__(self):
         """Create an instance of the RateLimit class."""
         # TODO - Improve RateLimiter
@@ -14,28 +24,41 @@ class RateLimiter:
         self.reset_timestamp = None
         self.used = 0
 
-    def call(self, request_function, set_header_callback, *args, **kwargs):
+    def call(
+        self, request_function, set_header_callback, *args, deadline=None, **kwargs
+    ):
         """Rate limit the call to request_function.
 
         :param request_function: A function call that returns an HTTP response object.
         :param set_header_callback: A callback function used to set the request headers.
             This callback is called after any necessary sleep time occurs.
         :param args: The positional arguments to ``request_function``.
+        :param deadline: (Optional) A :class:`.Deadline` bounding the sleep time and
+            the ``timeout`` passed to ``request_function``.
         :param kwargs: The keyword arguments to ``request_function``.
         """
-        self.delay()
+        with profiling.stage("rate_limit.delay"):
+            self.delay(deadline)
+        if deadline is not None:
+            kwargs["timeout"] = deadline.timeout(kwargs.get("timeout"))
         kwargs["headers"] = set_header_callback()
         response = request_function(*args, **kwargs)
         self.update(response.headers)
         return response
 
-    def delay(self):
-        """Sleep for an amount of time to remain under the rate limit."""
+    def delay(self, deadline=None):
+        """Sleep for an amount of time to remain under the rate limit.
+
+        :param deadline: (Optional) A :class:`.Deadline`. When the sleep would not leave
+            any time for the request, :class:`.DeadlineExceeded` is raised instead.
+        """
         if self.next_request_timestamp is None:
             return
         sleep_seconds = self.next_request_timestamp - time.time()
         if sleep_seconds <= 0:
             return
+        if deadline is not None:
+            deadline.ensure(sleep_seconds, "rate limit delay")
         message = f"Sleeping: {sleep_seconds:0.2f} seconds prior to call"
         log.debug(message)
         time.sleep(sleep_seconds)
@@ -44,20 +67,23 @@ class RateLimiter:
         """Update the state of the rate limiter based on the response headers.
 
         This method should only be called following a HTTP request to Linkedin.
-        Response headers will be treated as a single request. This behavior is to
-        error on the safe-side as such responses should trigger exceptions
-        that indicate invalid behavior.
+        Responses with ``x-ratelimit-remaining`` and ``x-ratelimit-reset`` headers set
+        the remaining budget and when it resets. Other responses are counted against
+        the budget as a single request, to error on the safe side.
         """
-        if self.remaining is not None:
-            self.remaining -= 1
-            self.used += 1
+        try:
+            seconds_to_reset = int(float(response_headers["x-ratelimit-reset"]))
+            remaining = float(response_headers["x-ratelimit-remaining"])
+            used = int(response_headers.get("x-ratelimit-used", self.used + 1))
+        except (KeyError, TypeError, ValueError):
+            if self.remaining is not None:
+                self.remaining -= 1
+                self.used += 1
             return
 
         now = time.time()
-
-        seconds_to_reset = int(response_headers["x-ratelimit-reset"])
-        self.remaining = float(response_headers["x-ratelimit-remaining"])
-        self.used = int(response_headers["x-ratelimit-used"])
+        self.remaining = remaining
+        self.used = used
         self.reset_timestamp = now + seconds_to_reset
 
         if self.remaining <= 0:
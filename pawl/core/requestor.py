@@ -1,11 +1,25 @@
 """Provides the HTTP request handling interface."""
+import gzip
+import json
+import logging
 import requests
 
-from typing import Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Union
+from requests.adapters import DEFAULT_POOLSIZE, HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool
+from urllib3.response import HTTPResponse
 
+from . import fork
+from .connection import DNSCache, ReusingAdapter
 from .constants import TIMEOUT
 from .exceptions import RequestException
 from .session import Session
+from .transport import Urllib3Transport
+
+log = logging.getLogger(__package__)
+
+COMPRESSION_LEVEL = 6
 
 
 class Requestor:
@@ -21,7 +35,10 @@ class Requestor:
         self,
         oauth_url: str = "https://www.linkedin.com/oauth/",
         linkedin_url: str = "https://api.linkedin.com/",
-        session: Union[Session, requests.Session, None] = None,
+        session: Union[Session, requests.Session, Urllib3Transport, None] = None,
+        compression_threshold: Optional[int] = None,
+        prewarm: Optional[int] = None,
+        dns_ttl: float = 300,
     ):
         """Create an instance of the Requestor class.
 
@@ -29,13 +46,155 @@ class Requestor:
             site. (Default: https://oauth.linkedin.com)
         :param linkedin_url: (Optional) The URL used when obtaining access tokens.
             (Default: https://www.linkedin.com)
-        :param session: (Optional) A session to handle requests, compatible with
-            requests.Session(). (Default: None)
+        :param session: (Optional) The transport that sends requests: a
+            requests.Session(), a :class:`.Urllib3Transport` or another object with
+            the interface described in :mod:`pawl.core.transport`. (Default: None,
+            which uses a new requests.Session())
+        :param compression_threshold: (Optional) The size in bytes at or above which
+            ``json`` request bodies are sent gzip compressed. (Default: None, which
+            disables compression)
+        :param prewarm: (Optional) The number of connections to open to each of the
+            API and OAuth hosts before the first request. See :meth:`.warm_up`.
+            (Default: None, which opens connections on demand)
+        :param dns_ttl: (Optional) The number of seconds DNS results are cached once
+            connections are warmed up. (Default: 300)
+
+        Responses are requested with every content encoding urllib3 can decode, which
+        includes ``br`` and ``zstd`` when the optional ``brotli`` and ``zstandard``
+        packages are installed.
         """
         self._http = session or requests.Session()
+        self._http.headers["Accept-Encoding"] = ", ".join(
+            encoding
+            for encoding in HTTPResponse.CONTENT_DECODERS
+            if not encoding.startswith("x-")
+        )
         self._http.headers["User-Agent"] = "pawl/0.0.2"
+        self.compression_threshold = compression_threshold
+        self.dns_ttl = dns_ttl
         self.oauth_url = oauth_url
         self.linkedin_url = linkedin_url
+        fork.register(self)
+        if prewarm:
+            self.warm_up(prewarm)
+
+    def _compress_json(self, kwargs):
+        """Replace the ``json`` keyword argument with an encoded, compressed body."""
+        body = json.dumps(kwargs.pop("json"), allow_nan=False).encode("utf-8")
+        headers = dict(kwargs.get("headers") or {})
+        headers["Content-Type"] = "application/json"
+        if len(body) >= self.compression_threshold:
+            compressed = gzip.compress(body, compresslevel=COMPRESSION_LEVEL)
+            log.debug(
+                f"Request body: {len(body)} bytes, {len(compressed)} bytes compressed"
+            )
+            body = compressed
+            headers["Content-Encoding"] = "gzip"
+        kwargs["data"] = body
+        kwargs["headers"] = headers
+
+    @staticmethod
+    def _log_response_size(response):
+        raw = getattr(response, "raw", None)
+        if raw is None or not hasattr(raw, "tell"):
+            return
+        log.debug(
+            f"Response body: {raw.tell()} bytes received,"
+            f" {len(response.content)} bytes decoded"
+        )
+
+    def _after_fork(self):
+        """Replace the connection pools inherited from the parent process."""
+        if not isinstance(self._http, requests.Session):
+            return
+        for adapter in self._http.adapters.values():
+            if isinstance(adapter, HTTPAdapter):
+                adapter.proxy_manager = {}
+                adapter.init_poolmanager(
+                    adapter._pool_connections,
+                    adapter._pool_maxsize,
+                    block=adapter._pool_block,
+                )
+
+    def _pools(self, connections: int) -> Optional[List[HTTPConnectionPool]]:
+        """Return the connection pools of the API and OAuth hosts, if available."""
+        urls = dict.fromkeys((self.linkedin_url, self.oauth_url))
+        if isinstance(self._http, Urllib3Transport):
+            pool_manager = self._http.pool_manager
+            return [pool_manager.connection_from_url(url) for url in urls]
+        adapter = self._reusing_adapter(connections)
+        if adapter is None:
+            return None
+        pools = []
+        for url in urls:
+            # Use the settings requests will use for the URL, such as a CA bundle
+            # from the environment, so that the connections land in the same pool.
+            settings = self._http.merge_environment_settings(url, {}, None, None, None)
+            if hasattr(adapter, "get_connection_with_tls_context"):  # requests 2.32+
+                request = requests.Request("GET", url).prepare()
+                pool = adapter.get_connection_with_tls_context(
+                    request, settings["verify"], settings["proxies"], settings["cert"]
+                )
+            else:
+                pool = adapter.get_connection(url, settings["proxies"])
+            adapter.cert_verify(pool, url, settings["verify"], settings["cert"])
+            pools.append(pool)
+        return pools
+
+    def _reusing_adapter(self, connections: int) -> Optional[ReusingAdapter]:
+        """Return the session's :class:`.ReusingAdapter`, mounting one if needed."""
+        if not isinstance(self._http, requests.Session):
+            return None
+        adapter = self._http.get_adapter(self.linkedin_url)
+        if not isinstance(adapter, ReusingAdapter):
+            adapter = ReusingAdapter(
+                dns_cache=DNSCache(self.dns_ttl),
+                pool_maxsize=max(DEFAULT_POOLSIZE, connections),
+            )
+            self._http.mount("http://", adapter)
+            self._http.mount("https://", adapter)
+        return adapter
+
+    def warm_up(self, connections: int = 4, timeout: float = TIMEOUT) -> int:
+        """Open pooled connections to the API and OAuth hosts ahead of requests.
+
+        The DNS lookups, TCP connections and TLS handshakes happen here instead of on
+        the first requests. Warming up a requests.Session() mounts an adapter that
+        caches DNS results for ``dns_ttl`` seconds and resumes TLS sessions when
+        connections are replaced. Failures are logged rather than raised.
+
+        :param connections: The number of connections to open to each host
+            (default: 4).
+        :param timeout: The number of seconds to wait for each connection.
+
+        Returns the number of connections that are open.
+        """
+        pools = self._pools(connections)
+        if pools is None:
+            log.warning("Cannot warm up connections of a custom session")
+            return 0
+
+        def connect(connection):
+            if getattr(connection, "sock", None) is not None:
+                return True
+            connection.timeout = timeout
+            try:
+                connection.connect()
+            except Exception as exception:
+                log.warning(f"Warm-up connection failed: {exception}")
+                return False
+            return True
+
+        opened = 0
+        for pool in pools:
+            count = min(connections, pool.pool.maxsize)
+            pooled = [pool._get_conn() for _ in range(count)]
+            with ThreadPoolExecutor(max_workers=count) as executor:
+                opened += sum(executor.map(connect, pooled))
+            for connection in pooled:
+                pool._put_conn(connection)
+        log.debug(f"Warmed up {opened} connections")
+        return opened
 
     def close(self):
         """Call close on the underlying session."""
@@ -43,7 +202,16 @@ class Requestor:
 
     def request(self, *args, timeout=TIMEOUT, **kwargs):
         """Issue the HTTP request capturing any errors that may occur."""
+        if (
+            self.compression_threshold is not None
+            and kwargs.get("json") is not None
+            and not kwargs.get("data")
+        ):
+            self._compress_json(kwargs)
         try:
-            return self._http.request(*args, timeout=timeout, **kwargs)
+            response = self._http.request(*args, timeout=timeout, **kwargs)
         except Exception as exc:
             raise RequestException(exc, args, kwargs)
+        if log.isEnabledFor(logging.DEBUG):
+            self._log_response_size(response)
+        return response
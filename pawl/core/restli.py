@@ -0,0 +1,103 @@
+"""Provide Rest.li 2.0 URL encoding and precompiled URL templates."""
+from functools import lru_cache
+from string import Formatter
+from typing import Any, Dict, Mapping
+from urllib.parse import quote
+
+
+@lru_cache(maxsize=4096)
+def _encode_string(value: str) -> str:
+    if value == "":
+        return "''"
+    # Rest.li 2.0 reserves ``(``, ``)``, ``,``, ``'`` and ``:`` in addition to the
+    # characters that URLs reserve, so nothing but unreserved characters is left as is.
+    return quote(value, safe="")
+
+
+def encode(value: Any) -> str:
+    """Return ``value`` encoded for use in a Rest.li 2.0 URL.
+
+    Strings (and objects such as URNs whose ``str`` is used) are percent-encoded,
+    lists and tuples become ``List(...)`` and mappings become records of the form
+    ``(key:value,...)``. Encoded strings are cached, which makes repeated URNs cheap.
+
+    :param value: The value to encode.
+    """
+    if isinstance(value, str):
+        return _encode_string(value)
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    if isinstance(value, (list, tuple)):
+        return f"List({','.join(encode(item) for item in value)})"
+    if isinstance(value, Mapping):
+        items = ",".join(
+            f"{_encode_string(str(key))}:{encode(item)}" for key, item in value.items()
+        )
+        return f"({items})"
+    return _encode_string(str(value))
+
+
+def encode_query(params: Mapping[str, Any]) -> str:
+    """Return a query string with every value in ``params`` Rest.li encoded.
+
+    :param params: The query parameters. Keys may contain ``.`` to address nested
+        fields, e.g. ``timeIntervals.timeGranularityType``.
+    """
+    return "&".join(
+        f"{quote(key, safe='.')}={encode(value)}" for key, value in params.items()
+    )
+
+
+def _types(value: Any) -> Any:
+    """Return the type of ``value``, or the types of its items for tuples."""
+    if isinstance(value, tuple):
+        return tuple(_types(item) for item in value)
+    return type(value)
+
+
+class Route:
+    """A URL template compiled once, such as ``v2/reactions?actor={actor}``.
+
+    Placeholders are filled with :func:`encode`. URLs built from hashable values are
+    cached, so each distinct shape of a request is only encoded once.
+    """
+
+    def __init__(self, template: str):
+        """Compile ``template``.
+
+        :param template: A path relative to the API root, with ``{name}`` placeholders
+            for values that will be Rest.li encoded.
+        """
+        self.template = template
+        self.fields = tuple(
+            name for _, name, _, _ in Formatter().parse(template) if name is not None
+        )
+        self._cached_build = lru_cache(maxsize=1024)(self._build_typed)
+
+    def __repr__(self):
+        return f"Route({self.template!r})"
+
+    def _build(self, *values) -> str:
+        encoded: Dict[str, str] = {
+            name: encode(value) for name, value in zip(self.fields, values)
+        }
+        return self.template.format(**encoded)
+
+    def _build_typed(self, values: tuple, _types: tuple) -> str:
+        # ``_types`` only keys the cache: ``True`` and ``1`` are equal, also inside
+        # tuples, but encode differently.
+        return self._build(*values)
+
+    def format(self, **values) -> str:
+        """Return the path for ``values``.
+
+        :param values: A value for every placeholder in the template.
+        """
+        ordered = tuple(values[name] for name in self.fields)
+        try:
+            hash(ordered)
+        except TypeError:  # lists and mappings are encoded without caching
+            return self._build(*ordered)
+        return self._cached_build(ordered, _types(ordered))
@@ -0,0 +1,179 @@
+"""Provide the Scheduler class."""
+import itertools
+import logging
+import threading
+import time
+from enum import Enum
+from typing import Dict, Optional, Union
+
+from . import fork, profiling
+from .concurrency import AIMDLimit, FixedLimit
+from .exceptions import DeadlineExceeded
+
+log = logging.getLogger(__package__)
+
+
+class Priority(Enum):
+    INTERACTIVE = "interactive"
+    NORMAL = "normal"
+    BULK = "bulk"
+
+
+class _Ticket:
+    __slots__ = ("finish", "granted", "priority", "sequence")
+
+    def __init__(self, priority, finish, sequence):
+        self.finish = finish
+        self.granted = False
+        self.priority = priority
+        self.sequence = sequence
+
+
+class Scheduler:
+    """Share one rate budget between priority classes.
+
+    Requests wait for one of ``max_concurrency`` slots, a number that may adapt to
+    observed latency and overload when it is given as an :class:`.AIMDLimit`. Waiting
+    requests are granted slots by weighted fair queueing: each class receives slots in
+    proportion to its weight while it has requests waiting, so bulk traffic cannot
+    starve interactive traffic but still uses any capacity the other classes leave
+    idle.
+
+    A class may also be kept away from the last part of the budget. With the default
+    reserve, bulk requests wait for the budget to reset once 20% or less of the
+    :class:`.RateLimiter` budget remains, leaving it for interactive and normal
+    requests. The reserve only applies while the rate limiter knows when its budget
+    resets, i.e. once Linkedin has reported it in ``x-ratelimit-*`` headers.
+    """
+
+    DEFAULT_RESERVE = {Priority.BULK: 0.2}
+    DEFAULT_WEIGHTS = {Priority.INTERACTIVE: 8, Priority.NORMAL: 4, Priority.BULK: 1}
+
+    def __init__(
+        self,
+        rate_limiter,
+        max_concurrency: Union[int, AIMDLimit, FixedLimit] = 10,
+        weights: Optional[Dict[Priority, float]] = None,
+        reserve: Optional[Dict[Priority, float]] = None,
+    ):
+        """Create an instance of the Scheduler class.
+
+        :param rate_limiter: The :class:`.RateLimiter` whose budget is shared.
+        :param max_concurrency: The number of requests that may be in flight at once,
+            or a limit object such as :class:`.AIMDLimit` (default: 10).
+        :param weights: (Optional) The relative share of slots for each
+            :class:`.Priority` (default: interactive 8, normal 4, bulk 1).
+        :param reserve: (Optional) For each :class:`.Priority`, the fraction of the
+            rate budget that it may not use (default: bulk 0.2).
+        """
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._last_finish = {priority: 0.0 for priority in Priority}
+        self._sequence = itertools.count()
+        self._virtual_time = 0.0
+        self._waiting = []
+        self.limit = (
+            FixedLimit(max_concurrency)
+            if isinstance(max_concurrency, int)
+            else max_concurrency
+        )
+        self.rate_limiter = rate_limiter
+        self.reserve = self.DEFAULT_RESERVE if reserve is None else reserve
+        self.weights = self.DEFAULT_WEIGHTS if weights is None else weights
+        fork.register(self)
+
+    def _after_fork(self):
+        # Requests waiting or in flight belong to threads of the parent process.
+        self._condition = threading.Condition()
+        self._in_flight = 0
+        self._waiting = []
+
+    def _dispatch(self):
+        """Grant free slots to the waiting tickets with the earliest finish times."""
+        while self._in_flight < self.limit.limit and self._waiting:
+            eligible = [
+                ticket for ticket in self._waiting if not self._reserved(ticket.priority)
+            ]
+            if not eligible:
+                return
+            ticket = min(eligible, key=lambda ticket: (ticket.finish, ticket.sequence))
+            self._waiting.remove(ticket)
+            self._virtual_time = max(self._virtual_time, ticket.finish)
+            self._in_flight += 1
+            ticket.granted = True
+            self._condition.notify_all()
+
+    def _reserved(self, priority: Priority) -> bool:
+        """Return whether the remaining budget is reserved for other classes."""
+        fraction = self.reserve.get(priority)
+        remaining = self.rate_limiter.remaining
+        reset_timestamp = self.rate_limiter.reset_timestamp
+        if not fraction or remaining is None or reset_timestamp is None:
+            return False
+        if reset_timestamp <= time.time():
+            return False
+        budget = remaining + self.rate_limiter.used
+        return remaining <= fraction * budget
+
+    def acquire(self, priority: Priority = Priority.NORMAL, deadline=None):
+        """Block until a slot is granted to a request of ``priority``.
+
+        :param priority: The :class:`.Priority` of the request.
+        :param deadline: (Optional) A :class:`.Deadline` bounding the wait.
+
+        :raises: :class:`.DeadlineExceeded` when ``deadline`` expires before a slot is
+            granted.
+        """
+        with self._condition:
+            finish = max(self._virtual_time, self._last_finish[priority])
+            finish += 1 / self.weights[priority]
+            self._last_finish[priority] = finish
+            ticket = _Ticket(priority, finish, next(self._sequence))
+            self._waiting.append(ticket)
+            self._dispatch()
+            while not ticket.granted:
+                timeout = None
+                if self._reserved(priority):
+                    timeout = max(self.rate_limiter.reset_timestamp - time.time(), 1)
+                    log.debug(f"Waiting {timeout:0.2f} seconds for budget reset")
+                if deadline is not None:
+                    try:
+                        remaining = deadline.ensure(0, "scheduler wait")
+                    except DeadlineExceeded:
+                        self._waiting.remove(ticket)
+                        raise
+                    timeout = remaining if timeout is None else min(timeout, remaining)
+                self._condition.wait(timeout)
+                self._dispatch()
+
+    def call(self, priority: Priority, function, *args, **kwargs):
+        """Call ``function`` once a slot is granted to a request of ``priority``.
+
+        :param priority: The :class:`.Priority` of the request.
+        :param function: The function to call.
+        :param args: The positional arguments to ``function``.
+        :param kwargs: The keyword arguments to ``function``. A ``deadline`` among them
+            also bounds the wait for a slot.
+        """
+        with profiling.stage("scheduler.wait"):
+            self.acquire(priority, kwargs.get("deadline"))
+        try:
+            return function(*args, **kwargs)
+        finally:
+            self.release()
+
+    def record(self, latency: float, dropped: bool):
+        """Report a completed request to the concurrency limit.
+
+        :param latency: The number of seconds the request took on the wire.
+        :param dropped: Whether the request was rejected or failed due to overload.
+        """
+        with self._condition:
+            self.limit.on_sample(latency, self._in_flight, dropped)
+            self._dispatch()
+
+    def release(self):
+        """Free the slot held by a finished request."""
+        with self._condition:
+            self._in_flight -= 1
+            self._dispatch()
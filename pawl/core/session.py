@@ -1,7 +1,8 @@
+import hashlib
 import logging
 import random
 import time
-from copy import deepcopy
+from functools import lru_cache
 from urllib.parse import urljoin
 
 from requests.status_codes import codes
@@ -11,13 +12,18 @@ from requests.exceptions import (
     ReadTimeout,
 )
 
+from . import profiling
 from .auth import BaseAuthorizer
 from .rate_limit import RateLimiter
+from .scheduler import Priority, Scheduler
 from .constants import TIMEOUT
+from .deadline import Deadline
 from .exceptions import (
     BadJSON,
     BadRequest,
     Conflict,
+    DeadlineExceeded,
+    InactiveToken,
     InvalidInvocation,
     NotFound,
     RequestException,
@@ -31,6 +37,8 @@ from .util import authorization_error_class
 
 log = logging.getLogger(__package__)
 
+_join_url = lru_cache(maxsize=1024)(urljoin)
+
 
 class RetryStrategy:
     """An abstract class for scheduling request retries.
@@ -39,9 +47,15 @@ class RetryStrategy:
     Instances of this class are immutable.
     """
 
-    def sleep(self):
-        """Sleep until we are ready to attempt the request."""
+    def sleep(self, deadline=None):
+        """Sleep until we are ready to attempt the request.
+
+        :param deadline: (Optional) A :class:`.Deadline`. When the sleep would not leave
+            any time for the attempt, :class:`.DeadlineExceeded` is raised instead.
+        """
         sleep_seconds = self._sleep_seconds()
+        if deadline is not None:
+            deadline.ensure(sleep_seconds or 0, "retry")
         if sleep_seconds is not None:
             message = f"Sleeping: {sleep_seconds:0.2f} seconds prior to retry"
             log.debug(message)
@@ -110,16 +124,45 @@ class Session:
         log.debug(f"Data: {data}")
         log.debug(f"Params: {params}")
 
-    def __init__(self, authorizer: BaseAuthorizer):
+    def __init__(
+        self,
+        authorizer: BaseAuthorizer,
+        max_concurrency: int = 10,
+        priority_weights=None,
+        priority_reserve=None,
+        hedge_policy=None,
+        quota_ledger=None,
+    ):
         """Prepare the connection to Linkedin's API.
 
         :param authorizer: An instance of :class:`Authorizer`.
+        :param max_concurrency: The number of requests that may be in flight at once,
+            or an :class:`.AIMDLimit` to adapt the number to latency, 429 and 5xx
+            responses (default: 10).
+        :param priority_weights: (Optional) The relative share of request slots for
+            each :class:`.Priority`. See :class:`.Scheduler`.
+        :param priority_reserve: (Optional) For each :class:`.Priority`, the fraction
+            of the rate budget that it may not use. See :class:`.Scheduler`.
+        :param hedge_policy: (Optional) A :class:`.HedgePolicy` used to hedge slow
+            idempotent requests (default: None, which disables hedging).
+        :param quota_ledger: (Optional) A :class:`.QuotaLedger` that records every
+            call sent to Linkedin.
         """
         if not isinstance(authorizer, BaseAuthorizer):
             raise InvalidInvocation(f"Invalid Authorizer: {authorizer}")
         self._authorizer = authorizer
+        self._hedge_policy = hedge_policy
+        self._member_token = self._member_fingerprint = None
         self._rate_limiter = RateLimiter()
+        self._scheduler = Scheduler(
+            self._rate_limiter,
+            max_concurrency=max_concurrency,
+            weights=priority_weights,
+            reserve=priority_reserve,
+        )
         self._retry_strategy_class = FiniteRetryStrategy
+        self.member = None
+        self.quota_ledger = quota_ledger
 
     def __enter__(self):
         """Allow this object to be used as a context manager."""
@@ -132,9 +175,12 @@ class Session:
     def _do_retry(
         self,
         data,
+        deadline,
+        headers,
         json,
         method,
         params,
+        priority,
         response,
         retry_strategy_state,
         saved_exception,
@@ -148,9 +194,12 @@ class Session:
         log.warning(f"Retrying due to {status} status: {method} {url}")
         return self._request_with_retries(
             data=data,
+            deadline=deadline,
+            headers=headers,
             json=json,
             method=method,
             params=params,
+            priority=priority,
             timeout=timeout,
             url=url,
             retry_strategy_state=retry_strategy_state.consume_available_retry(),  # noqa: E501
@@ -159,31 +208,54 @@ class Session:
     def _make_request(
         self,
         data,
+        deadline,
+        headers,
         json,
         method,
         params,
+        priority,
         retry_strategy_state,
         timeout,
         url,
     ):
-        try:
-            response = self._rate_limiter.call(
-                self._requestor.request,
-                self._set_header_callback,
+        set_header_callback = self._set_header_callback
+        if headers:
+
+            def set_header_callback():
+                return {**self._set_header_callback(), **headers}
+
+        def send():
+            return self._scheduler.call(
+                priority,
+                self._rate_limiter.call,
+                self._timed_request,
+                set_header_callback,
                 method,
                 url,
                 allow_redirects=False,
                 data=data,
+                deadline=deadline,
                 json=json,
                 params=params,
                 timeout=timeout,
             )
+
+        try:
+            if (
+                self._hedge_policy is not None
+                and method.upper() in self._hedge_policy.IDEMPOTENT_METHODS
+            ):
+                response = self._hedge_policy.call(send, self._may_hedge)
+            else:
+                response = send()
             log.debug(
                 f"Response: {response.status_code}"
                 f" ({response.headers.get('content-length')} bytes)"
             )
             return response, None
         except RequestException as exception:
+            if deadline is not None and deadline.remaining() <= 0:
+                raise DeadlineExceeded(deadline.seconds, "response") from exception
             if (
                 not retry_strategy_state.should_retry_on_failure()
                 or not isinstance(  # noqa: E501
@@ -201,18 +273,25 @@ class Session:
         params,
         timeout,
         url,
+        deadline=None,
+        headers=None,
+        priority=Priority.NORMAL,
         retry_strategy_state=None,
     ):
         if retry_strategy_state is None:
             retry_strategy_state = self._retry_strategy_class()
 
-        retry_strategy_state.sleep()
+        with profiling.stage("retry.sleep"):
+            retry_strategy_state.sleep(deadline)
         self._log_request(data, method, params, url)
         response, saved_exception = self._make_request(
             data,
+            deadline,
+            headers,
             json,
             method,
             params,
+            priority,
             retry_strategy_state,
             timeout,
             url,
@@ -229,9 +308,12 @@ class Session:
         ):
             return self._do_retry(
                 data,
+                deadline,
+                headers,
                 json,
                 method,
                 params,
+                priority,
                 response,
                 retry_strategy_state,
                 saved_exception,
@@ -240,7 +322,27 @@ class Session:
             )
         elif response.status_code in self.STATUS_EXCEPTIONS:
             raise self.STATUS_EXCEPTIONS[response.status_code](response)
-        elif response.status_code == codes["no_content"]:
+        return response
+
+    def _member_key(self) -> str:
+        """Return the member URN, or a fingerprint of the token if it is unknown."""
+        if self.member is not None:
+            return self.member
+        token = self._authorizer.access_token
+        if token is None:
+            return ""
+        if token != self._member_token:
+            digest = hashlib.sha256(token.encode("utf-8")).hexdigest()[:16]
+            self._member_token, self._member_fingerprint = token, f"token:{digest}"
+        return self._member_fingerprint
+
+    def _may_hedge(self) -> bool:
+        """Return whether a hedge would be sent without a rate limit delay."""
+        next_request_timestamp = self._rate_limiter.next_request_timestamp
+        return next_request_timestamp is None or next_request_timestamp <= time.time()
+
+    def _parse_response(self, response):
+        if response.status_code == codes["no_content"]:
             return
         assert (
             response.status_code in self.SUCCESS_STATUSES
@@ -252,9 +354,39 @@ class Session:
         except ValueError:
             raise BadJSON(response)
 
+    def _timed_request(self, *args, **kwargs):
+        """Issue a request and report its latency and outcome to the scheduler."""
+        if self._hedge_policy is not None:
+            self._hedge_policy.start_transport()
+        start = time.monotonic()
+        try:
+            with profiling.stage("transport"):
+                response = self._requestor.request(*args, **kwargs)
+        except RequestException as exception:
+            dropped = isinstance(exception.original_exception, self.RETRY_EXCEPTIONS)
+            self._scheduler.record(time.monotonic() - start, dropped)
+            raise
+        dropped = (
+            response.status_code == codes["too_many_requests"]
+            or response.status_code in self.RETRY_STATUSES
+        )
+        latency = time.monotonic() - start
+        self._scheduler.record(latency, dropped)
+        if self._hedge_policy is not None:
+            self._hedge_policy.record(latency)
+        if self.quota_ledger is not None:
+            self.quota_ledger.record(args[1], self._member_key(), response.status_code)
+        return response
+
     def _set_header_callback(self):
-        if not self._authorizer.is_valid() and hasattr(self._authorizer, "refresh"):
-            self._authorizer.refresh()
+        with profiling.stage("auth"):
+            if not self._authorizer.is_valid() and hasattr(self._authorizer, "refresh"):
+                self._authorizer.refresh()
+            if self._authorizer.is_inactive() and hasattr(self._authorizer, "refresh"):
+                # E.g. a token manager may hold a newer token.
+                self._authorizer.refresh()
+            if self._authorizer.is_inactive():
+                raise InactiveToken("access token is not active")
         return {
             "Authorization": f"Bearer {self._authorizer.access_token}",
             "X-Restli-Protocol-Version": "2.0.0",
@@ -276,6 +408,8 @@ class Session:
         json=None,
         params=None,
         timeout=TIMEOUT,
+        deadline=None,
+        priority=Priority.NORMAL,
     ):
         """Return the json content from the resource at ``path``.
 
@@ -286,31 +420,83 @@ class Session:
             request.
         :param json: Object to be serialized to JSON in the body of the request.
         :param params: The query parameters to send with the request.
+        :param timeout: The number of seconds to wait for each attempt, or a
+            ``(connect, read)`` tuple to set the two timeouts separately.
+        :param deadline: (Optional) The total number of seconds the request may take,
+            including retries and rate limit delays. Each attempt's ``timeout`` is
+            capped to the remaining budget and :class:`.DeadlineExceeded` is raised
+            once the budget cannot be met.
+        :param priority: The :class:`.Priority`, or its value such as ``"bulk"``, used
+            to schedule the request against others sharing the rate budget (default:
+            ``Priority.NORMAL``).
         Automatically refreshes the access token if it becomes invalid and a refresh
         token is available. Raises InvalidInvocation in such a case if a refresh token
         is not available.
         """
-        # TODO - Fix params
-        params = deepcopy(params) or {}
-        if isinstance(data, dict):
-            data = deepcopy(data)
-            data = sorted(data.items())
-        if isinstance(json, dict):
-            json = deepcopy(json)
-        url = urljoin(self._requestor.linkedin_url, path)
-        return self._request_with_retries(
-            data=data,
-            json=json,
-            method=method,
-            params=params,
-            timeout=timeout,
-            url=url,
-        )
+        with profiling.request():
+            with profiling.stage("prepare"):
+                # Neither requests nor the retry logic modify ``params`` or ``json``,
+                # so they are passed through without copying.
+                params = params or {}
+                if isinstance(data, dict):
+                    data = sorted(data.items())
+                url = _join_url(self._requestor.linkedin_url, path)
+            response = self._request_with_retries(
+                data=data,
+                deadline=None if deadline is None else Deadline(deadline),
+                json=json,
+                method=method,
+                params=params,
+                priority=Priority(priority),
+                timeout=timeout,
+                url=url,
+            )
+            with profiling.stage("parse"):
+                return self._parse_response(response)
+
+    def upload(
+        self,
+        url,
+        data,
+        headers=None,
+        method="PUT",
+        timeout=TIMEOUT,
+        deadline=None,
+    ):
+        """Send ``data`` to an upload ``url`` and return the response headers.
+
+        :param url: The absolute URL to upload to, as returned by Linkedin when
+            registering an upload.
+        :param data: Bytes, or a re-iterable object of byte chunks with a length. The
+            object is iterated once per attempt, so retries resend the whole body.
+        :param headers: (Optional) Additional headers to send with the request.
+        :param method: The request verb (default: PUT).
+        :param timeout: The number of seconds to wait for each attempt, or a
+            ``(connect, read)`` tuple.
+        :param deadline: (Optional) The total number of seconds the upload may take,
+            including retries and rate limit delays.
+        """
+        with profiling.request():
+            response = self._request_with_retries(
+                data=data,
+                deadline=None if deadline is None else Deadline(deadline),
+                headers=headers,
+                json=None,
+                method=method,
+                params=None,
+                timeout=timeout,
+                url=url,
+            )
+        assert (
+            response.status_code in self.SUCCESS_STATUSES
+        ), f"Unexpected status code: {response.status_code}"
+        return response.headers
 
 
-def session(authorizer=None):
+def session(authorizer=None, **session_kwargs):
     """Return a :class:`Session` instance.
 
     :param authorizer: An instance of :class:`Authorizer`.
+    :param session_kwargs: Additional keyword arguments passed to :class:`Session`.
     """
-    return Session(authorizer=authorizer)
+    return Session(authorizer=authorizer, **session_kwargs)
@@ -0,0 +1,290 @@
+"""Provide transports: the objects that send the Requestor's HTTP requests.
+
+A transport is any object with the subset of the ``requests.Session`` interface that
+:class:`.Requestor` uses:
+
+* ``headers``: a case-insensitive mapping of headers sent with every request.
+* ``request(method, url, params=None, data=None, json=None, headers=None,
+  timeout=None, allow_redirects=True)``: send a request and return a response with
+  ``status_code``, ``headers``, ``content``, ``text``, ``json()``, ``reason`` and
+  ``url``. Failures raise ``requests`` exceptions.
+* ``close()``: release the connections.
+
+``requests.Session`` is the default transport. :class:`.Urllib3Transport` sends
+requests straight through a ``urllib3.PoolManager``.
+"""
+import json as jsonlib
+import logging
+import ssl
+from http.client import IncompleteRead
+from typing import Any, Dict, Optional
+from urllib.parse import urlencode, urljoin
+
+import requests
+from requests.adapters import DEFAULT_POOLSIZE
+from requests.structures import CaseInsensitiveDict
+from urllib3 import PoolManager, Timeout, exceptions
+from urllib3.util.retry import Retry
+
+from . import fork
+from .connection import DNSCache, TLSSessionContext, cached_pool_classes
+
+log = logging.getLogger(__package__)
+
+MAX_REDIRECTS = 30
+
+# requests 2.27+ raises its own subclass of json.JSONDecodeError.
+_JSONDecodeError = getattr(requests, "JSONDecodeError", jsonlib.JSONDecodeError)
+
+_NO_RETRIES = Retry(total=False, redirect=False, raise_on_redirect=False)
+_REDIRECTS_ONLY = Retry(
+    total=None, connect=0, read=0, redirect=MAX_REDIRECTS, status=0, other=0
+)
+
+
+class Response:
+    """A response returned by :class:`.Urllib3Transport`.
+
+    It provides the parts of ``requests.Response`` that PAWL uses. The body is read
+    when the response is received.
+    """
+
+    __slots__ = ("_text", "content", "encoding", "headers", "raw", "status_code", "url")
+
+    def __init__(self, raw, url: str):
+        """Create an instance of the Response class.
+
+        :param raw: The ``urllib3.HTTPResponse``.
+        :param url: The URL that was requested.
+        """
+        self._text = None
+        self.content = raw.data
+        self.encoding = None
+        self.headers = raw.headers
+        self.raw = raw
+        self.status_code = raw.status
+        # urllib3 1.x reports only redirect locations, which may be relative.
+        self.url = urljoin(url, raw.geturl() or url)
+        content_type = self.headers.get("Content-Type")
+        if content_type:
+            for parameter in content_type.split(";")[1:]:
+                name, _, value = parameter.partition("=")
+                if name.strip().lower() == "charset":
+                    self.encoding = value.strip().strip("'\"")
+
+    def __repr__(self):
+        """Return a string representation of the response."""
+        return f"<Response [{self.status_code}]>"
+
+    @property
+    def ok(self) -> bool:
+        """Return whether the status is below 400."""
+        return self.status_code < 400
+
+    @property
+    def reason(self) -> Optional[str]:
+        """Return the HTTP reason phrase."""
+        return self.raw.reason
+
+    @property
+    def text(self) -> str:
+        """Return the body decoded with the charset of the response (default: UTF-8)."""
+        if self._text is None:
+            try:
+                self._text = self.content.decode(self.encoding or "utf-8", "replace")
+            except LookupError:  # Unknown charset.
+                self._text = self.content.decode("utf-8", "replace")
+        return self._text
+
+    def close(self):
+        """Release the connection. The body has already been read."""
+        self.raw.release_conn()
+
+    def json(self, **kwargs) -> Any:
+        """Return the decoded JSON body.
+
+        :raises: The ``ValueError`` that ``requests.Response.json`` raises when the
+            body is not valid JSON.
+        """
+        try:
+            return jsonlib.loads(self.content, **kwargs)
+        except ValueError as exception:
+            raise _JSONDecodeError(
+                getattr(exception, "msg", str(exception)),
+                getattr(exception, "doc", ""),
+                getattr(exception, "pos", 0),
+            )
+
+    def raise_for_status(self):
+        """Raise ``requests.HTTPError`` for 4XX and 5XX statuses."""
+        if 400 <= self.status_code < 600:
+            kind = "Client" if self.status_code < 500 else "Server"
+            raise requests.HTTPError(
+                f"{self.status_code} {kind} Error: {self.reason} for url: {self.url}",
+                response=self,
+            )
+
+
+def _exception(exception: Exception) -> requests.RequestException:
+    """Return the ``requests`` exception that ``requests`` raises for ``exception``.
+
+    The mapping lets :class:`.Session` retry the same failures with either transport.
+    """
+    if isinstance(exception, exceptions.MaxRetryError) and exception.reason:
+        exception = exception.reason
+    if isinstance(exception, exceptions.ConnectTimeoutError):
+        return requests.ConnectTimeout(exception)
+    if isinstance(exception, exceptions.ReadTimeoutError):
+        return requests.ReadTimeout(exception)
+    if isinstance(exception, exceptions.SSLError):
+        return requests.exceptions.SSLError(exception)
+    if isinstance(exception, exceptions.ProxyError):
+        return requests.exceptions.ProxyError(exception)
+    if isinstance(exception, exceptions.DecodeError):
+        return requests.exceptions.ContentDecodingError(exception)
+    if isinstance(exception, exceptions.ProtocolError) and any(
+        isinstance(argument, IncompleteRead) for argument in exception.args
+    ):
+        return requests.exceptions.ChunkedEncodingError(exception)
+    if isinstance(exception, exceptions.LocationValueError):
+        return requests.exceptions.InvalidURL(exception)
+    return requests.ConnectionError(exception)
+
+
+class Urllib3Transport:
+    """A transport that sends requests straight through a ``urllib3.PoolManager``.
+
+    ``requests.Session`` prepares every request, dispatches hooks, merges cookies and
+    looks up proxy settings in the environment, none of which PAWL needs. This
+    transport skips those layers:
+
+    * Cookies are neither sent nor stored.
+    * Redirects are only followed when ``allow_redirects`` is true. PAWL passes false.
+    * Proxy environment variables and ``.netrc`` files are ignored. Pass a
+      ``urllib3.ProxyManager`` as ``pool_manager`` to use a proxy.
+    * Bodies are read in full and cannot be streamed.
+
+    Failures raise the same ``requests`` exceptions as ``requests.Session`` would.
+
+    .. code-block:: python
+
+        linkedin = Linkedin(
+            access_token=token,
+            requestor_kwargs={"session": Urllib3Transport()},
+        )
+    """
+
+    def __init__(
+        self,
+        num_pools: int = 10,
+        maxsize: int = DEFAULT_POOLSIZE,
+        dns_cache: Optional[DNSCache] = None,
+        ssl_context: Optional[ssl.SSLContext] = None,
+        pool_manager: Optional[PoolManager] = None,
+    ):
+        """Create an instance of the Urllib3Transport class.
+
+        :param num_pools: The number of hosts connections are kept open to
+            (default: 10).
+        :param maxsize: The number of connections kept open to each host
+            (default: 10).
+        :param dns_cache: (Optional) A :class:`.DNSCache` used to resolve hosts.
+        :param ssl_context: (Optional) The SSL context used by connections (default:
+            a :class:`.TLSSessionContext`, which verifies certificates against the CA
+            bundle used by requests).
+        :param pool_manager: (Optional) The ``urllib3.PoolManager`` used to send
+            requests. The other arguments are ignored when it is given.
+        """
+        self._custom_pool_manager = pool_manager is not None
+        self.dns_cache = dns_cache
+        self.headers = CaseInsensitiveDict()
+        self.maxsize = maxsize
+        self.num_pools = num_pools
+        self.ssl_context = ssl_context
+        self.pool_manager = pool_manager or self._pool_manager()
+        fork.register(self)
+
+    def _after_fork(self):
+        """Replace the connection pools inherited from the parent process."""
+        if not self._custom_pool_manager:
+            self.pool_manager = self._pool_manager()
+
+    def _pool_manager(self) -> PoolManager:
+        if self.ssl_context is None:
+            self.ssl_context = TLSSessionContext()
+        pool_manager = PoolManager(
+            self.num_pools,
+            maxsize=self.maxsize,
+            ssl_context=self.ssl_context,
+        )
+        if self.dns_cache is not None:
+            pool_manager.pool_classes_by_scheme = cached_pool_classes(self.dns_cache)
+        return pool_manager
+
+    @staticmethod
+    def _timeout(timeout) -> Timeout:
+        if isinstance(timeout, Timeout):
+            return timeout
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return Timeout(connect=connect, read=read)
+        return Timeout(connect=timeout, read=timeout)
+
+    def close(self):
+        """Close every pooled connection."""
+        self.pool_manager.clear()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        params: Optional[Any] = None,
+        data: Optional[Any] = None,
+        json: Optional[Any] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[Any] = None,
+        allow_redirects: bool = True,
+    ) -> Response:
+        """Send a request and return its :class:`.Response`.
+
+        The arguments have the same meaning as for ``requests.Session.request``.
+        """
+        if params:
+            query = params if isinstance(params, str) else urlencode(params, True)
+            url = f"{url}{'&' if '?' in url else '?'}{query}"
+        request_headers = self.headers.copy()
+        if headers:
+            request_headers.update(headers)
+        body = None
+        if data is not None and data != {} and data != []:
+            if isinstance(data, str):
+                body = data.encode("utf-8")
+            elif isinstance(data, (bytes, bytearray)) or hasattr(data, "read"):
+                body = data
+            elif isinstance(data, (dict, list, tuple)):
+                body = urlencode(data, True)
+                request_headers.setdefault(
+                    "Content-Type", "application/x-www-form-urlencoded"
+                )
+            else:  # An iterable of chunks, sent chunked unless its length is known.
+                body = data
+                if hasattr(data, "__len__"):
+                    request_headers.setdefault("Content-Length", str(len(data)))
+        elif json is not None:
+            body = jsonlib.dumps(json, allow_nan=False).encode("utf-8")
+            request_headers.setdefault("Content-Type", "application/json")
+        try:
+            raw = self.pool_manager.urlopen(
+                method.upper(),
+                url,
+                body=body,
+                headers=request_headers,
+                redirect=allow_redirects,
+                retries=_REDIRECTS_ONLY if allow_redirects else _NO_RETRIES,
+                timeout=self._timeout(timeout),
+                preload_content=True,
+                decode_content=True,
+            )
+        except exceptions.HTTPError as exception:
+            raise _exception(exception) from exception
+        return Response(raw, url)
@@ -1,8 +1,14 @@
-"""List of API endpoints Linkedin knows about."""
+"""List of API endpoints Linkedin knows about.
+
+Values are URL templates relative to the API root. Placeholders such as ``{actor}``
+are filled in with Rest.li encoded values by :class:`.Route`.
+"""
 
 # flake8: noqa
 # fmt: off
 API_PATH = {
-    "me":            "me",
-    "reactions":     "reactions",
+    "assets_complete_multipart_upload": "v2/assets?action=completeMultiPartUpload",
+    "assets_register_upload":           "v2/assets?action=registerUpload",
+    "me":                               "v2/me",
+    "reactions":                        "v2/reactions?actor={actor}",
 }
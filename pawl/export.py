@@ -0,0 +1,334 @@
+"""Provide streaming export of Linkedin collections to NDJSON and Parquet files.
+
+Pages are fetched in a background thread while earlier pages are transformed and
+written, and at most ``prefetch`` pages are held in memory, so memory use does not
+grow with the size of the collection.
+
+.. code-block:: python
+
+    from pawl.export import export, flatten
+
+    export(
+        linkedin,
+        "v2/shares",
+        "shares.parquet",
+        params={"q": "owners", "owners": "urn:li:organization:123"},
+        transforms=[flatten],
+    )
+
+Parquet files require the optional ``pyarrow`` package.
+"""
+import gzip
+import io
+import json
+import logging
+import queue
+import threading
+from typing import IO, Any, Callable, Dict, Iterable, List, Optional, Union
+
+from .core.restli import encode_query
+
+log = logging.getLogger(__package__)
+
+Transform = Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]
+
+_DONE = object()
+
+
+def flatten(record: Dict[str, Any], separator: str = ".") -> Dict[str, Any]:
+    """Return ``record`` with nested dictionaries flattened into dotted keys.
+
+    ``{"lastModified": {"time": 1}}`` becomes ``{"lastModified.time": 1}``. Lists are
+    kept as they are.
+
+    :param record: The record to flatten.
+    :param separator: The string joining nested keys (default: ``.``).
+    """
+    flat = {}
+    for key, value in record.items():
+        if isinstance(value, dict) and value:
+            for nested_key, nested_value in flatten(value, separator).items():
+                flat[f"{key}{separator}{nested_key}"] = nested_value
+        else:
+            flat[key] = value
+    return flat
+
+
+class NDJSONWriter:
+    """Write records as newline-delimited JSON, one record per line.
+
+    Paths ending with ``.gz`` are gzip compressed.
+    """
+
+    def __init__(self, output: Union[str, IO[str]], buffer_size: int = 1 << 20):
+        """Open the output.
+
+        :param output: The path of the file, or a text file object to write to.
+        :param buffer_size: The number of bytes buffered before they are written to
+            the file (default: 1 MiB).
+        """
+        self._owns_file = isinstance(output, str)
+        if not self._owns_file:
+            self._file = output
+        elif output.endswith(".gz"):
+            self._file = io.TextIOWrapper(
+                io.BufferedWriter(gzip.open(output, "wb"), buffer_size),
+                encoding="utf-8",
+            )
+        else:
+            self._file = open(output, "w", buffering=buffer_size, encoding="utf-8")
+        self.rows = 0
+
+    def __enter__(self):
+        """Return the writer."""
+        return self
+
+    def __exit__(self, *_args):
+        """Close the writer."""
+        self.close()
+
+    def close(self):
+        """Flush the buffer and close the file if the writer opened it."""
+        if self._owns_file:
+            self._file.close()
+        else:
+            self._file.flush()
+
+    def write(self, records: List[Dict[str, Any]]):
+        """Write a batch of records."""
+        if not records:
+            return
+        self._file.write(
+            "".join(
+                json.dumps(record, separators=(",", ":"), ensure_ascii=False) + "\n"
+                for record in records
+            )
+        )
+        self.rows += len(records)
+
+
+class ParquetWriter:
+    """Write records to a Parquet file in row groups of ``row_group_size`` rows.
+
+    The schema is inferred from the first row group unless one is given. Fields that
+    later records add are dropped and fields they lack are written as nulls, so pass a
+    ``schema`` when the first records are not representative.
+    """
+
+    def __init__(
+        self,
+        output: str,
+        row_group_size: int = 10000,
+        schema=None,
+        compression: str = "snappy",
+    ):
+        """Prepare the output. The file is created when the first row group is full.
+
+        :param output: The path of the file.
+        :param row_group_size: The number of rows buffered and written per row group
+            (default: 10000). Larger groups compress and scan better but use more
+            memory.
+        :param schema: (Optional) A ``pyarrow.Schema`` for the records.
+        :param compression: The Parquet compression codec (default: ``snappy``).
+        """
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError(
+                "Parquet export requires the optional pyarrow package:"
+                " pip install pyarrow"
+            )
+        self._buffer: List[Dict[str, Any]] = []
+        self._pyarrow = pyarrow
+        self._writer = None
+        self.compression = compression
+        self.output = output
+        self.row_group_size = row_group_size
+        self.rows = 0
+        self.schema = schema
+
+    def __enter__(self):
+        """Return the writer."""
+        return self
+
+    def __exit__(self, *_args):
+        """Close the writer."""
+        self.close()
+
+    def _write_row_group(self):
+        table = self._pyarrow.Table.from_pylist(self._buffer, schema=self.schema)
+        if self._writer is None:
+            self.schema = table.schema
+            self._writer = self._pyarrow.parquet.ParquetWriter(
+                self.output, self.schema, compression=self.compression
+            )
+        self._writer.write_table(table, row_group_size=self.row_group_size)
+        self.rows += len(self._buffer)
+        self._buffer = []
+
+    def close(self):
+        """Write the remaining records and close the file."""
+        if self._buffer or self._writer is None:
+            self._write_row_group()
+        self._writer.close()
+
+    def write(self, records: List[Dict[str, Any]]):
+        """Buffer a batch of records, writing each row group once it is full."""
+        for record in records:
+            self._buffer.append(record)
+            if len(self._buffer) >= self.row_group_size:
+                self._write_row_group()
+
+
+def _writer_for(output: Union[str, IO[str]], format: Optional[str], **kwargs):
+    if format is None:
+        is_parquet = isinstance(output, str) and output.endswith(".parquet")
+        format = "parquet" if is_parquet else "ndjson"
+    if format == "parquet":
+        return ParquetWriter(output, **kwargs)
+    if format == "ndjson":
+        return NDJSONWriter(output, **kwargs)
+    raise ValueError(f"Unknown export format: {format!r}")
+
+
+class Export:
+    """Stream the elements of a Rest.li collection through transforms into a writer.
+
+    Each transform is called with a record and returns the record to write, or
+    ``None`` to drop it.
+    """
+
+    def __init__(
+        self,
+        linkedin,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        transforms: Iterable[Transform] = (),
+        page_size: int = 100,
+        prefetch: int = 2,
+        **kwargs,
+    ):
+        """Create an instance of the Export class.
+
+        :param linkedin: An instance of :class:`.Linkedin`.
+        :param path: The path of the Rest.li collection.
+        :param params: (Optional) Query parameters, Rest.li encoded so that URNs,
+            lists and records are accepted.
+        :param transforms: Functions applied, in order, to each record.
+        :param page_size: The number of records requested per page (default: 100).
+        :param prefetch: The number of fetched pages that may wait to be written
+            (default: 2).
+        :param kwargs: Additional keyword arguments passed to :meth:`.Linkedin.get`,
+            such as ``fields`` or ``priority``.
+        """
+        if params:
+            separator = "&" if "?" in path else "?"
+            path = f"{path}{separator}{encode_query(params)}"
+        self._linkedin = linkedin
+        self.kwargs = kwargs
+        self.page_size = page_size
+        self.path = path
+        self.prefetch = prefetch
+        self.transforms = list(transforms)
+
+    def _fetch(self, pages: queue.Queue, stop: threading.Event):
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        try:
+            for page in self._linkedin._pages(
+                self.path, page_size=self.page_size, **self.kwargs
+            ):
+                if not put(page.get("elements", [])):
+                    return
+        except Exception as exception:
+            put(exception)
+            return
+        put(_DONE)
+
+    def _transform(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        for transform in self.transforms:
+            records = [
+                result for result in map(transform, records) if result is not None
+            ]
+        return records
+
+    def pages(self) -> Iterable[List[Dict[str, Any]]]:
+        """Yield the transformed records of each page as it is fetched."""
+        pages: queue.Queue = queue.Queue(maxsize=self.prefetch)
+        stop = threading.Event()
+        fetcher = threading.Thread(
+            target=self._fetch, args=(pages, stop), name="pawl-export", daemon=True
+        )
+        fetcher.start()
+        try:
+            while True:
+                page = pages.get()
+                if page is _DONE:
+                    return
+                if isinstance(page, Exception):
+                    raise page
+                yield self._transform(page)
+        finally:
+            stop.set()
+            fetcher.join()
+
+    def to(self, writer) -> int:
+        """Write every record to ``writer`` and return the number written.
+
+        The writer is not closed.
+
+        :param writer: An :class:`.NDJSONWriter`, :class:`.ParquetWriter` or another
+            object with a ``write(records)`` method.
+        """
+        written = 0
+        for records in self.pages():
+            writer.write(records)
+            written += len(records)
+        log.debug(f"Exported {written} records from {self.path}")
+        return written
+
+
+def export(
+    linkedin,
+    path: str,
+    output: Union[str, IO[str]],
+    format: Optional[str] = None,
+    params: Optional[Dict[str, Any]] = None,
+    transforms: Iterable[Transform] = (),
+    page_size: int = 100,
+    writer_kwargs: Optional[Dict[str, Any]] = None,
+    **kwargs,
+) -> int:
+    """Export the collection at ``path`` to ``output`` and return the records written.
+
+    :param linkedin: An instance of :class:`.Linkedin`.
+    :param path: The path of the Rest.li collection.
+    :param output: The path of the file, or a text file object for NDJSON.
+    :param format: ``"ndjson"`` or ``"parquet"`` (default: ``"parquet"`` for paths
+        ending with ``.parquet`` and ``"ndjson"`` otherwise).
+    :param params: (Optional) Query parameters, Rest.li encoded.
+    :param transforms: Functions applied, in order, to each record. A function may
+        return ``None`` to drop the record.
+    :param page_size: The number of records requested per page (default: 100).
+    :param writer_kwargs: (Optional) Keyword arguments passed to the writer, such as
+        ``row_group_size`` for Parquet.
+    :param kwargs: Additional keyword arguments passed to :class:`.Export`.
+    """
+    exporter = Export(
+        linkedin,
+        path,
+        params=params,
+        transforms=transforms,
+        page_size=page_size,
+        **kwargs,
+    )
+    with _writer_for(output, format, **(writer_kwargs or {})) as writer:
+        return exporter.to(writer)
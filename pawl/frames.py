@@ -0,0 +1,189 @@
+"""Provide columnar frames of Linkedin collections for vectorized analytics.
+
+Each page of a collection is converted to columns as soon as it is received, so the
+records of only one page are held as dictionaries at a time. Columns are NumPy arrays
+or Arrow record batches, which use far less memory than lists of dictionaries and can
+be aggregated without Python loops.
+
+.. code-block:: python
+
+    from pawl.frames import frame
+
+    reactions = frame(
+        linkedin,
+        "v2/reactions/(entity:urn%3Ali%3Ashare%3A123)",
+        ["reactionType", "created.time"],
+        params={"q": "entity"},
+    )
+    likes = (reactions["reactionType"] == "LIKE").sum()
+
+NumPy frames require the optional ``numpy`` package and Arrow frames the optional
+``pyarrow`` package.
+"""
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .core.restli import encode_query
+from .sync import _lookup
+
+FORMATS = ("arrow", "columns", "numpy")
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError(
+            "NumPy frames require the optional numpy package: pip install numpy"
+        )
+    return numpy
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError(
+            "Arrow frames require the optional pyarrow package: pip install pyarrow"
+        )
+    return pyarrow
+
+
+def columns(records: Iterable[Dict[str, Any]], fields: List[str]) -> Dict[str, list]:
+    """Return the values of ``fields`` in ``records`` as one list per field.
+
+    :param records: The records, e.g. the ``elements`` of a page.
+    :param fields: The dotted paths of the fields, e.g. ``created.time``. Missing
+        fields are ``None``.
+    """
+    result: Dict[str, list] = {field: [] for field in fields}
+    appends = [(field, result[field].append) for field in fields]
+    for record in records:
+        for field, append in appends:
+            append(_lookup(record, field))
+    return result
+
+
+def _array(numpy, values: list):
+    """Return ``values`` as an array of the narrowest fitting type.
+
+    Numbers with missing values become ``float64`` with ``nan``, and strings or mixed
+    values an ``object`` array.
+    """
+    present = [value for value in values if value is not None]
+    if present and all(isinstance(value, bool) for value in present):
+        if len(present) == len(values):
+            return numpy.array(values, dtype=bool)
+    elif present and all(
+        isinstance(value, (int, float)) and not isinstance(value, bool)
+        for value in present
+    ):
+        if len(present) == len(values) and all(
+            isinstance(value, int) for value in present
+        ):
+            return numpy.array(values, dtype=numpy.int64)
+        return numpy.array(
+            [numpy.nan if value is None else value for value in values],
+            dtype=numpy.float64,
+        )
+    array = numpy.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+def to_numpy(column_values: Dict[str, list]) -> Dict[str, Any]:
+    """Convert the lists returned by :func:`.columns` to NumPy arrays."""
+    numpy = _numpy()
+    return {field: _array(numpy, values) for field, values in column_values.items()}
+
+
+def to_arrow(column_values: Dict[str, list], schema=None):
+    """Convert the lists returned by :func:`.columns` to an Arrow record batch.
+
+    :param column_values: The columns.
+    :param schema: (Optional) A ``pyarrow.Schema`` for the batch.
+    """
+    return _pyarrow().RecordBatch.from_pydict(column_values, schema=schema)
+
+
+def frames(
+    linkedin,
+    path: str,
+    fields: List[str],
+    params: Optional[Dict[str, Any]] = None,
+    format: str = "numpy",
+    page_size: int = 100,
+    schema=None,
+    **kwargs,
+) -> Iterator[Any]:
+    """Yield one columnar frame per page of the collection at ``path``.
+
+    :param linkedin: An instance of :class:`.Linkedin`.
+    :param path: The path of the Rest.li collection.
+    :param fields: The dotted paths of the fields to keep, one column each.
+    :param params: (Optional) Query parameters, Rest.li encoded.
+    :param format: ``"numpy"`` for a dictionary of NumPy arrays, ``"arrow"`` for a
+        ``pyarrow.RecordBatch`` or ``"columns"`` for a dictionary of lists (default:
+        ``"numpy"``).
+    :param page_size: The number of records requested per page (default: 100).
+    :param schema: (Optional) A ``pyarrow.Schema`` for Arrow frames.
+    :param kwargs: Additional keyword arguments passed to :meth:`.Linkedin.get`,
+        such as a ``fields`` projection string.
+    """
+    if format not in FORMATS:
+        raise ValueError(f"Unknown frame format: {format!r}")
+    if format == "numpy":
+        _numpy()
+    elif format == "arrow":
+        _pyarrow()
+    if params:
+        separator = "&" if "?" in path else "?"
+        path = f"{path}{separator}{encode_query(params)}"
+    for page in linkedin._pages(path, page_size=page_size, **kwargs):
+        page_columns = columns(page.get("elements", []), fields)
+        if format == "numpy":
+            yield to_numpy(page_columns)
+        elif format == "arrow":
+            yield to_arrow(page_columns, schema)
+        else:
+            yield page_columns
+
+
+def frame(
+    linkedin,
+    path: str,
+    fields: List[str],
+    params: Optional[Dict[str, Any]] = None,
+    format: str = "numpy",
+    schema=None,
+    **kwargs,
+) -> Any:
+    """Return the whole collection at ``path`` as a single columnar frame.
+
+    NumPy frames are a dictionary of arrays, Arrow frames a ``pyarrow.Table`` and
+    ``"columns"`` frames a dictionary of lists. Accepts the same arguments as
+    :func:`.frames`. Pass a ``schema`` for Arrow frames when pages may infer
+    different types for a column, such as a page where it is always null.
+    """
+    pages = list(
+        frames(linkedin, path, fields, params, format, schema=schema, **kwargs)
+    )
+    if format == "arrow":
+        pyarrow = _pyarrow()
+        if not pages:
+            if schema is not None:
+                return schema.empty_table()
+            return pyarrow.table({field: [] for field in fields})
+        return pyarrow.Table.from_batches(pages)
+    if format == "numpy":
+        numpy = _numpy()
+        if not pages:
+            return {field: numpy.array([], dtype=object) for field in fields}
+        # Pages may infer different types for a column, e.g. int64 and float64;
+        # concatenate promotes them.
+        return {
+            field: numpy.concatenate([page[field] for page in pages])
+            for field in fields
+        }
+    return {
+        field: [value for page in pages for value in page[field]] for field in fields
+    }
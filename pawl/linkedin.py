@@ -1,15 +1,34 @@
 """Provide the Linkedin class."""
-from typing import Optional, Union, IO, Any, Dict, List
+import hashlib
+import json as jsonlib
+import logging
+import os
+import tempfile
+import time
+from typing import Optional, Union, IO, Any, Dict, Iterable, Iterator, List, Tuple
 
 from . import service
 from .core.auth import Authorizer, Authenticator  # noqa
+from .core.concurrency import AIMDLimit
+from .core.constants import TIMEOUT
 from .core.requestor import Requestor
+from .core.scheduler import Priority
 from .core.session import session
 
+log = logging.getLogger(__package__)
+
 
 class Linkedin:
     """The Linkedin class provides convenient access to Linkedin's API."""
 
+    RATE_LIMITER_STATE = (
+        "next_request_timestamp",
+        "remaining",
+        "reset_timestamp",
+        "used",
+    )
+    SNAPSHOT_VERSION = 1
+
     def __init__(
         self,
         access_token=None,
@@ -17,24 +36,32 @@ class Linkedin:
         client_secret=None,
         redirect_uri="http://localhost:8000",
         token_manager=None,
+        requestor_class=None,
+        requestor_kwargs=None,
+        session_kwargs=None,
+        token_introspector=None,
     ):
         assert access_token or (
             client_id and client_secret
         ), "Either client_id and client_secret or an access token is required."
 
         self._core = self._authorized_core = None
+        self._current_user_id = None
 
         # TODO - Abstract these values for security
+        self._access_token = access_token
         self._client_id = client_id
         self._client_secret = client_secret
         self._redirect_uri = redirect_uri
         # TODO END
 
         self._services = None
+        self._session_kwargs = session_kwargs or {}
+        self._token_introspector = token_introspector
         self._token_manager = token_manager
 
         self._map_services()
-        self._prepare_core()
+        self._prepare_core(requestor_class, requestor_kwargs)
 
         self.auth = service.Auth(self, None)
 
@@ -43,11 +70,33 @@ class Linkedin:
 
         self.reactions = service.Reactions(linkedin=self, _data=None)
 
+        self.assets = service.Assets(linkedin=self, _data=None)
+
+    @property
+    def current_user_id(self) -> Optional[str]:
+        """Return the id of the authorized member, if known."""
+        return self._current_user_id
+
+    @current_user_id.setter
+    def current_user_id(self, value: Optional[str]):
+        self._current_user_id = value
+        # Attribute calls to the member in the quota ledger.
+        if self._core is not None:
+            self._core.member = None if value is None else f"urn:li:person:{value}"
+
+    @property
+    def quota(self):
+        """Return the :class:`.QuotaLedger` of the session, if one was given.
+
+        Pass a ledger as ``session_kwargs={"quota_ledger": ledger}``.
+        """
+        return self._core.quota_ledger
+
     def _prepare_core(self, requestor_class=None, requestor_kwargs=None):
         requestor_class = requestor_class or Requestor
         requestor_kwargs = requestor_kwargs or {}
 
-        requestor = requestor_class()
+        requestor = requestor_class(**requestor_kwargs)
         self._prepare_core_authenticator(requestor)
 
     def _prepare_core_authenticator(self, requestor):
@@ -63,19 +112,41 @@ class Linkedin:
                 authenticator,
                 post_access_callback=self._token_manager.post_access_callback,
                 pre_access_callback=self._token_manager.pre_access_callback,
+                introspector=self._token_introspector,
             )
         else:
             # TODO - Add error handling
-            authorizer = Authorizer(authenticator)
-        self._core = self._authorized_core = session(authorizer)
+            authorizer = Authorizer(
+                authenticator,
+                access_token=self._access_token,
+                introspector=self._token_introspector,
+            )
+        self._core = self._authorized_core = session(
+            authorizer, **self._session_kwargs
+        )
 
     def _map_services(self):
         service_mappings = {
+            "Assets": service.Assets,
             "Me": service.Me,
             "Reactions": service.Reactions,
         }
         self._services = service_mappings
 
+    @staticmethod
+    def _add_projection(path: str, fields: Union[str, Iterable[str]]) -> str:
+        """Return ``path`` with a Rest.li ``projection`` query parameter for ``fields``.
+
+        The projection is appended to the path rather than passed in ``params`` so that
+        its parentheses and commas are not percent-encoded.
+        """
+        if not isinstance(fields, str):
+            fields = ",".join(fields)
+        if not fields.startswith("("):
+            fields = f"({fields})"
+        separator = "&" if "?" in path else "?"
+        return f"{path}{separator}projection={fields}"
+
     @staticmethod
     def _parse_service_request(data: Optional[Union[Dict[str, Any], List[Any], bool]]):
         # TODO - Restructure data for ease of use with python/utf-8
@@ -84,29 +155,47 @@ class Linkedin:
     def _service_request(
         self,
         data: Optional[Union[Dict[str, Union[str, Any]], bytes, IO, str]] = None,
+        fields: Optional[Union[str, Iterable[str]]] = None,
         json=None,
         method: str = "",
         params: Optional[Union[str, Dict[str, str]]] = None,
         path: str = "",
+        timeout: Union[float, Tuple[float, float]] = TIMEOUT,
+        deadline: Optional[float] = None,
+        priority: Union[Priority, str] = Priority.NORMAL,
     ) -> Any:
         """Run a request through mapped services.
 
         :param data: Dictionary, bytes, or file-like object to send in the body of the
             request (default: None).
+        :param fields: The fields to request, either as an iterable of field names or
+            a Rest.li projection string such as ``"id,localizedFirstName"``. Only these
+            fields are returned (default: None, which returns every field).
         :param json: JSON-serializable object to send in the body of the request with a
             Content-Type header of application/json (default: None). If ``json`` is
             provided, ``data`` should not be.
         :param method: The HTTP method (e.g., GET, POST, PUT, DELETE).
         :param params: The query parameters to add to the request (default: None).
         :param path: The path to fetch.
+        :param timeout: The number of seconds to wait for each attempt, or a
+            ``(connect, read)`` tuple (default: ``pawl_timeout`` seconds).
+        :param deadline: The total number of seconds the request may take, including
+            retries and rate limit delays (default: None).
+        :param priority: The :class:`.Priority` of the request when sharing the rate
+            budget with other requests (default: ``Priority.NORMAL``).
         """
+        if fields:
+            path = self._add_projection(path, fields)
         return self._parse_service_request(
             data=self._core.request(
                 data=data,
+                deadline=deadline,
                 json=json,
                 method=method,
                 params=params,
                 path=path,
+                priority=priority,
+                timeout=timeout,
             )
         )
 
@@ -114,13 +203,75 @@ class Linkedin:
         self,
         path: str,
         params: Optional[Union[str, Dict[str, Union[str, int]]]] = None,
+        fields: Optional[Union[str, Iterable[str]]] = None,
+        timeout: Union[float, Tuple[float, float]] = TIMEOUT,
+        deadline: Optional[float] = None,
+        priority: Union[Priority, str] = Priority.NORMAL,
     ):
         """Return parsed objects returned from a GET request to ``path``.
 
         :param path: The path to fetch.
         :param params: The query parameters to add to the request (default: None).
+        :param fields: The fields to request, either as an iterable of field names or
+            a Rest.li projection string (default: None, which returns every field).
+        :param timeout: The number of seconds to wait for each attempt, or a
+            ``(connect, read)`` tuple (default: ``pawl_timeout`` seconds).
+        :param deadline: The total number of seconds the request may take, including
+            retries and rate limit delays (default: None).
+        :param priority: The :class:`.Priority` of the request when sharing the rate
+            budget with other requests (default: ``Priority.NORMAL``).
+        """
+        return self._service_request(
+            deadline=deadline,
+            fields=fields,
+            method="GET",
+            params=params,
+            path=path,
+            priority=priority,
+            timeout=timeout,
+        )
+
+    def _pages(
+        self,
+        path: str,
+        params: Optional[Dict[str, Union[str, int]]] = None,
+        page_size: int = 100,
+        **kwargs,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield each page of a Rest.li collection using ``start`` and ``count``."""
+        params = dict(params or {})
+        start = int(params.pop("start", 0))
+        while True:
+            page = self.get(
+                path, params={**params, "count": page_size, "start": start}, **kwargs
+            )
+            yield page
+            elements = page.get("elements", [])
+            total = page.get("paging", {}).get("total")
+            start += len(elements)
+            if len(elements) < page_size or (total is not None and start >= total):
+                return
+
+    def paginate(
+        self,
+        path: str,
+        params: Optional[Dict[str, Union[str, int]]] = None,
+        page_size: int = 100,
+        **kwargs,
+    ) -> Iterator[Any]:
+        """Yield every element of a Rest.li collection, fetching pages as needed.
+
+        Only one page is held in memory at a time.
+
+        :param path: The path to fetch.
+        :param params: The query parameters to add to each request (default: None).
+            A ``start`` parameter sets the offset of the first page.
+        :param page_size: The number of elements requested per page (default: 100).
+        :param kwargs: Additional keyword arguments passed to :meth:`.get`, such as
+            ``fields`` or ``priority``.
         """
-        return self._service_request(method="GET", params=params, path=path)
+        for page in self._pages(path, params=params, page_size=page_size, **kwargs):
+            yield from page.get("elements", [])
 
     def post(
         self,
@@ -128,16 +279,155 @@ class Linkedin:
         data: Optional[Union[Dict[str, Union[str, Any]], bytes, IO, str]] = None,
         params: Optional[Union[str, Dict[str, Union[str, int]]]] = None,
         json=None,
+        fields: Optional[Union[str, Iterable[str]]] = None,
+        timeout: Union[float, Tuple[float, float]] = TIMEOUT,
+        deadline: Optional[float] = None,
+        priority: Union[Priority, str] = Priority.NORMAL,
     ):
         return self._service_request(
             data=data,
+            deadline=deadline,
+            fields=fields,
             json=json,
             method="POST",
             params=params,
             path=path,
+            priority=priority,
+            timeout=timeout,
+        )
+
+    def warm_up(self, connections: int = 4) -> int:
+        """Open pooled connections to Linkedin ahead of the first requests.
+
+        See :meth:`.Requestor.warm_up`. Returns the number of open connections.
+
+        :param connections: The number of connections to open to each of the API and
+            OAuth hosts (default: 4).
+        """
+        return self._core._requestor.warm_up(connections)
+
+    def _token_fingerprint(self) -> Optional[str]:
+        access_token = self._core._authorizer.access_token
+        if access_token is None:
+            return None
+        return hashlib.sha256(access_token.encode("utf-8")).hexdigest()
+
+    def restore(self, path: str, max_age: float = 3600) -> bool:
+        """Restore the state saved by :meth:`.snapshot` and return whether it was.
+
+        The snapshot is ignored, and ``False`` returned, when the file is missing or
+        unreadable, when it is older than ``max_age`` seconds, when it was taken with a
+        different access token, or when the token has expired since. The rate limiter
+        state is restored when Linkedin reported the budget in ``x-ratelimit-*``
+        headers and the budget has not reset since.
+
+        :param path: The path of the snapshot file.
+        :param max_age: The age in seconds above which a snapshot is stale
+            (default: 3600).
+        """
+        try:
+            with open(path, "rb") as snapshot_file:
+                state = jsonlib.load(snapshot_file)
+        except (OSError, ValueError) as exception:
+            log.debug(f"Ignoring snapshot {path}: {exception}")
+            return False
+        if not isinstance(state, dict):
+            log.debug(f"Ignoring snapshot {path}: not a JSON object")
+            return False
+        now = time.time()
+        expiration_timestamp = state.get("expiration_timestamp")
+        reason = None
+        if state.get("version") != self.SNAPSHOT_VERSION:
+            reason = "unsupported version"
+        elif not 0 <= now - state.get("created_at", 0) <= max_age:
+            reason = "stale"
+        elif state.get("token") != self._token_fingerprint():
+            reason = "different access token"
+        elif expiration_timestamp is not None and expiration_timestamp <= now:
+            reason = "access token expired"
+        if reason is not None:
+            log.debug(f"Ignoring snapshot {path}: {reason}")
+            return False
+
+        authorizer = self._core._authorizer
+        if expiration_timestamp is not None:
+            authorizer._expiration_timestamp = expiration_timestamp
+        if state.get("current_user_id") is not None:
+            self.current_user_id = state["current_user_id"]
+        rate_limiter_state = state.get("rate_limiter") or {}
+        reset_timestamp = rate_limiter_state.get("reset_timestamp")
+        # The counts describe a budget that has been replenished once it has reset.
+        if reset_timestamp is not None and reset_timestamp > now:
+            for name, value in rate_limiter_state.items():
+                if name in self.RATE_LIMITER_STATE:
+                    setattr(self._core._rate_limiter, name, value)
+        limit = self._core._scheduler.limit
+        if isinstance(limit, AIMDLimit) and state.get("concurrency"):
+            with limit._lock:
+                limit._baseline, limit._limit, limit._smoothed = state["concurrency"]
+        introspection = state.get("introspection")
+        introspector = authorizer._introspector
+        if introspection and introspector is not None and introspection[0] > now:
+            with introspector._lock:
+                introspector._cache[state["token"]] = tuple(introspection)
+        age = now - state["created_at"]
+        log.debug(f"Restored snapshot {path} taken {age:.0f} seconds ago")
+        return True
+
+    def snapshot(self, path: str) -> Dict[str, Any]:
+        """Save runtime state to ``path`` for another process to :meth:`.restore`.
+
+        The state includes the current user id, the expiry of the access token, the
+        rate limiter and adaptive concurrency state, and the token introspection
+        result. It lets a restarted worker skip the requests and the cautious start
+        that rebuilding this state would cost. The access token itself is not saved:
+        the snapshot only records a hash of it to check that it is restored with the
+        same token.
+
+        The file is replaced atomically. Returns the saved state.
+
+        :param path: The path of the snapshot file.
+        """
+        core = self._core
+        fingerprint = self._token_fingerprint()
+        state = {
+            "version": self.SNAPSHOT_VERSION,
+            "created_at": time.time(),
+            "token": fingerprint,
+            "current_user_id": self.current_user_id,
+            "expiration_timestamp": core._authorizer._expiration_timestamp,
+            "rate_limiter": {
+                name: getattr(core._rate_limiter, name)
+                for name in self.RATE_LIMITER_STATE
+            },
+        }
+        limit = core._scheduler.limit
+        if isinstance(limit, AIMDLimit):
+            with limit._lock:
+                state["concurrency"] = [limit._baseline, limit._limit, limit._smoothed]
+        introspector = core._authorizer._introspector
+        if introspector is not None and fingerprint is not None:
+            with introspector._lock:
+                state["introspection"] = introspector._cache.get(fingerprint)
+        snapshot_file = tempfile.NamedTemporaryFile(
+            "w",
+            dir=os.path.dirname(os.path.abspath(path)),
+            prefix=f"{os.path.basename(path)}.",
+            suffix=".tmp",
+            delete=False,
         )
+        try:
+            with snapshot_file:
+                jsonlib.dump(state, snapshot_file, separators=(",", ":"))
+                snapshot_file.flush()
+                os.fsync(snapshot_file.fileno())
+            os.replace(snapshot_file.name, path)
+        except BaseException:
+            os.unlink(snapshot_file.name)
+            raise
+        return state
 
     def _set_linkedin_user_id(self):
         if self._authorized_core._authorizer.access_token is None:
-            return self.current_user.basic_profile()["id"]
+            return self.current_user.basic_profile(fields=["id"])["id"]
         return None
@@ -0,0 +1,199 @@
+"""Provide the Loader class."""
+import json
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Union
+
+from .core import fork
+from .core.exceptions import NotFound, ResponseException, ResponseSnapshot
+from .core.restli import encode_query
+from .core.session import Session
+
+log = logging.getLogger(__package__)
+
+
+class Loader:
+    """Combine individual entity lookups into Rest.li ``BATCH_GET`` requests.
+
+    Keys passed to :meth:`.load` within ``window`` seconds of each other are fetched
+    together with a single ``GET {path}?ids=List(...)`` request, and each caller's
+    future is resolved with its own entity. Results are memoised: loading a key again
+    returns the same future without a request. Use one loader per unit of work, such
+    as a web request or a job, or call :meth:`.clear` to forget results.
+
+    .. code-block:: python
+
+        people = Loader(linkedin, "v2/people", fields=["id", "localizedLastName"])
+        futures = [people.load(person_id) for person_id in person_ids]
+        names = [future.result()["localizedLastName"] for future in futures]
+
+    Futures can be awaited in asyncio code with ``asyncio.wrap_future``.
+    """
+
+    def __init__(
+        self,
+        linkedin,
+        path: str,
+        fields: Optional[Union[str, Iterable[str]]] = None,
+        max_batch_size: int = 50,
+        window: float = 0.005,
+        max_workers: int = 4,
+    ):
+        """Create an instance of the Loader class.
+
+        :param linkedin: An instance of :class:`.Linkedin`.
+        :param path: The path of the collection, e.g. ``v2/people``.
+        :param fields: (Optional) The fields to request for every entity.
+        :param max_batch_size: The largest number of keys sent in one request
+            (default: 50). A batch is sent as soon as it is full.
+        :param window: The number of seconds to wait for more keys after the first
+            key of a batch (default: 0.005).
+        :param max_workers: The number of batches that may be in flight at once
+            (default: 4).
+        """
+        self._cache: Dict[Hashable, Future] = {}
+        self._executor = None
+        self._linkedin = linkedin
+        self._lock = threading.Lock()
+        self._pending: Dict[Hashable, Future] = {}
+        self._timer = None
+        self.fields = fields
+        self.max_batch_size = max_batch_size
+        self.max_workers = max_workers
+        self.path = path
+        self.window = window
+        fork.register(self)
+
+    def _after_fork(self):
+        # Pending batches belong to threads of the parent process.
+        self._executor = None
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._timer = None
+
+    @staticmethod
+    def _error(key: Hashable, error: Optional[Dict[str, Any]]) -> ResponseException:
+        """Return the exception for a key that is missing from the batch results."""
+        if error is None:
+            return NotFound(ResponseSnapshot(404, message=f"{key} was not returned"))
+        status = error.get("status", 404)
+        snapshot = ResponseSnapshot(
+            status,
+            text=json.dumps(error),
+            service_error_code=error.get("serviceErrorCode"),
+            message=error.get("message"),
+        )
+        exception_class = Session.STATUS_EXCEPTIONS.get(status, ResponseException)
+        try:
+            return exception_class(snapshot)
+        except (KeyError, ValueError):  # Unrecognized authorization errors.
+            return ResponseException(snapshot)
+
+    def _fetch(self, batch: Dict[Hashable, Future]):
+        keys = list(batch)
+        log.debug(f"Loading {len(keys)} entities from {self.path}")
+        failure: Optional[BaseException] = None
+        try:
+            response = self._linkedin.get(
+                f"{self.path}?{encode_query({'ids': keys})}", fields=self.fields
+            )
+            if not isinstance(response, dict):
+                raise TypeError(f"Unexpected BATCH_GET response: {response!r}")
+            results = response.get("results", {})
+            errors = response.get("errors", {})
+            for key, future in batch.items():
+                name = str(key)
+                if name in results:
+                    future.set_result(results[name])
+                    continue
+                # Errors are not memoised, so a later load of the key tries again.
+                with self._lock:
+                    self._cache.pop(key, None)
+                future.set_exception(self._error(key, errors.get(name)))
+        except Exception as exception:
+            failure = exception
+        finally:
+            # Whatever went wrong, no caller may be left waiting on a future.
+            unresolved = [key for key, future in batch.items() if not future.done()]
+            if unresolved:
+                if failure is None:
+                    failure = RuntimeError(f"Loading from {self.path} was interrupted")
+                with self._lock:
+                    for key in unresolved:
+                        self._cache.pop(key, None)
+                for key in unresolved:
+                    batch[key].set_exception(failure)
+
+    def _flush(self):
+        """Send the pending keys. The caller holds ``self._lock``."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, {}
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="pawl-loader"
+            )
+        self._executor.submit(self._fetch, batch)
+
+    def _on_timer(self):
+        with self._lock:
+            self._flush()
+
+    def clear(self, key: Optional[Hashable] = None):
+        """Forget the memoised result of ``key``, or of every key.
+
+        :param key: (Optional) The key to forget.
+        """
+        with self._lock:
+            if key is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(key, None)
+
+    def get(self, key: Hashable) -> Any:
+        """Return the entity with ``key``, waiting for its batch to complete."""
+        return self.load(key).result()
+
+    def get_many(self, keys: Iterable[Hashable]) -> List[Any]:
+        """Return the entities with ``keys``, fetched in as few requests as possible."""
+        futures = self.load_many(keys)
+        return [future.result() for future in futures]
+
+    def load(self, key: Hashable) -> Future:
+        """Return a future for the entity with ``key``.
+
+        :param key: The id or URN of the entity.
+        """
+        with self._lock:
+            future = self._cache.get(key)
+            if future is not None:
+                return future
+            future = self._cache[key] = self._pending[key] = Future()
+            if len(self._pending) >= self.max_batch_size:
+                self._flush()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.window, self._on_timer)
+                self._timer.daemon = True
+                self._timer.start()
+        return future
+
+    def load_many(self, keys: Iterable[Hashable]) -> List[Future]:
+        """Return futures for the entities with ``keys``.
+
+        The keys are sent without waiting for the window to pass.
+        """
+        futures = [self.load(key) for key in keys]
+        with self._lock:
+            self._flush()
+        return futures
+
+    def prime(self, key: Hashable, value: Any):
+        """Memoise ``value`` as the entity with ``key`` if it is not already loaded."""
+        future = Future()
+        future.set_result(value)
+        with self._lock:
+            self._cache.setdefault(key, future)
@@ -0,0 +1,368 @@
+"""Provide the Outbox class."""
+import hashlib
+import json as jsonlib
+import logging
+import random
+import sqlite3
+import threading
+import time
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional, Union
+
+from .core import fork
+from .core.exceptions import (
+    Conflict,
+    RequestException,
+    ResponseException,
+    ServerError,
+    TooManyRequests,
+)
+
+log = logging.getLogger(__package__)
+
+
+class Outbox:
+    """A durable queue of write requests that is drained in the background.
+
+    Requests are journaled to a SQLite database before :meth:`.enqueue` returns, so
+    producers never wait on the network and queued work survives process restarts.
+    A worker thread sends due requests through :meth:`.Session.request`, which applies
+    the session's :class:`.RateLimiter`, and reschedules failures with exponential
+    backoff.
+
+    Each request has an idempotency key. Enqueuing a key that is already journaled is
+    a no-op, and a ``409 Conflict`` response is treated as success because the write
+    has already been applied. Delivery is at-least-once: a request that was sent just
+    before the process stopped is sent again once its lease expires.
+
+    .. code-block:: python
+
+        outbox = Outbox(linkedin, "outbox.db")
+        outbox.start()
+        outbox.post(
+            "v2/reactions?actor=urn%3Ali%3Aperson%3A123",
+            json={"root": "urn:li:share:456", "reactionType": "LIKE"},
+            idempotency_key="like:123:urn:li:share:456",
+        )
+    """
+
+    RETRY_EXCEPTIONS = (RequestException, ServerError, TooManyRequests)
+
+    def __init__(
+        self,
+        linkedin,
+        database: str,
+        max_attempts: int = 8,
+        backoff: float = 2.0,
+        max_backoff: float = 900.0,
+        poll_interval: float = 1.0,
+        lease: float = 300.0,
+    ):
+        """Open (or create) the outbox journal.
+
+        :param linkedin: An instance of :class:`.Linkedin` used to send requests.
+        :param database: The path to the SQLite database.
+        :param max_attempts: The number of times a request is tried before it is
+            marked as failed (default: 8).
+        :param backoff: The delay in seconds before the first retry. It doubles with
+            each attempt (default: 2).
+        :param max_backoff: The longest delay in seconds between attempts
+            (default: 900).
+        :param poll_interval: The longest time in seconds the worker sleeps before
+            checking for due requests (default: 1).
+        :param lease: The number of seconds a request stays claimed by the worker or
+            :meth:`.drain` that is sending it. A request whose sender stopped before
+            updating it is sent again once its lease expires (default: 300).
+        """
+        self._database = database
+        self._linkedin = linkedin
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._worker = None
+        self.backoff = backoff
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self.max_backoff = max_backoff
+        self.poll_interval = poll_interval
+        self._connect()
+        fork.register(self)
+
+    def _after_fork(self):
+        # The worker thread, if any, keeps running in the parent only. Call
+        # :meth:`.start` in the child to also send requests from there.
+        fork.abandon(self._connection)
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._worker = None
+        self._connect()
+
+    def _connect(self):
+        self._connection = sqlite3.connect(self._database, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS outbox (id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " idempotency_key TEXT NOT NULL UNIQUE, method TEXT, path TEXT,"
+            " params TEXT, data TEXT, json TEXT, status TEXT DEFAULT 'pending',"
+            " attempts INTEGER DEFAULT 0, next_attempt_at REAL, last_error TEXT,"
+            " created_at REAL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS ix_outbox_due"
+            " ON outbox(status, next_attempt_at)"
+        )
+        self._connection.commit()
+
+    @staticmethod
+    def _default_key(method, path, params, data, json) -> str:
+        payload = jsonlib.dumps([method, path, params, data, json], sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _claim(self, limit: int = 100):
+        """Return up to ``limit`` due requests, leasing them to the caller.
+
+        Claimed requests are ``in_flight`` until they are updated or their lease
+        expires, so the worker, :meth:`.drain` and other processes sharing the journal
+        never send the same request at once.
+        """
+        now = time.time()
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._connection.execute(
+                    "SELECT id, method, path, params, data, json, attempts FROM outbox"
+                    " WHERE status IN ('pending', 'in_flight') AND next_attempt_at<=?"
+                    " ORDER BY next_attempt_at, id LIMIT ?",
+                    (now, limit),
+                ).fetchall()
+                self._connection.executemany(
+                    "UPDATE outbox SET status='in_flight', next_attempt_at=?"
+                    " WHERE id=?",
+                    [(now + self.lease, row[0]) for row in rows],
+                )
+                self._connection.commit()
+            except BaseException:
+                self._connection.rollback()
+                raise
+        return rows
+
+    def _next_attempt_at(self):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT MIN(next_attempt_at) FROM outbox"
+                " WHERE status IN ('pending', 'in_flight')"
+            ).fetchone()
+        return row[0]
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            if self._process_due():
+                continue
+            next_attempt_at = self._next_attempt_at()
+            timeout = self.poll_interval
+            if next_attempt_at is not None:
+                timeout = min(timeout, max(next_attempt_at - time.time(), 0))
+            self._wake_event.wait(timeout)
+            self._wake_event.clear()
+
+    def _process_due(self) -> int:
+        rows = self._claim()
+        for index, row in enumerate(rows):
+            if self._stop_event.is_set():
+                self._release([row[0] for row in rows[index:]])
+                break
+            self._send(*row)
+        return len(rows)
+
+    def _send(self, row_id, method, path, params, data, json, attempts):
+        attempts += 1
+        try:
+            self._linkedin._core.request(
+                method=method,
+                path=path,
+                params=jsonlib.loads(params),
+                data=jsonlib.loads(data),
+                json=jsonlib.loads(json),
+            )
+        except Conflict:
+            log.debug(f"Outbox request {row_id} was already applied")
+        except self.RETRY_EXCEPTIONS as exception:
+            retry_after = getattr(exception, "retry_after", None)
+            self._reschedule(row_id, attempts, exception, retry_after)
+            return
+        except ResponseException as exception:
+            log.warning(f"Outbox request {row_id} failed: {exception}")
+            self._update(row_id, "failed", attempts, None, repr(exception))
+            return
+        except Exception as exception:
+            # E.g. an expired token or a missed deadline: keep the worker running and
+            # try again later, until the request runs out of attempts.
+            log.warning(f"Outbox request {row_id} raised {exception!r}")
+            self._reschedule(row_id, attempts, exception)
+            return
+        self._update(row_id, "done", attempts, None, None)
+
+    def _release(self, row_ids):
+        """Make claimed requests that were not sent due again at once."""
+        with self._lock:
+            self._connection.executemany(
+                "UPDATE outbox SET status='pending', next_attempt_at=? WHERE id=?",
+                [(time.time(), row_id) for row_id in row_ids],
+            )
+            self._connection.commit()
+
+    def _reschedule(self, row_id, attempts, exception, retry_after=None):
+        if attempts >= self.max_attempts:
+            log.warning(f"Outbox request {row_id} failed after {attempts} attempts")
+            self._update(row_id, "failed", attempts, None, repr(exception))
+            return
+        delay = self._retry_after_delay(retry_after)
+        if delay is None:
+            delay = min(self.backoff * 2 ** (attempts - 1), self.max_backoff)
+            delay *= 0.5 + random.random() / 2
+        log.debug(f"Retrying outbox request {row_id} in {delay:0.2f} seconds")
+        self._update(
+            row_id, "pending", attempts, time.time() + delay, repr(exception)
+        )
+
+    @staticmethod
+    def _retry_after_delay(retry_after) -> Optional[float]:
+        """Return the seconds a ``Retry-After`` value asks to wait, or ``None``.
+
+        The value is either a number of seconds or an HTTP date.
+        """
+        if retry_after is None:
+            return None
+        try:
+            return max(float(retry_after), 0.0)
+        except (TypeError, ValueError):
+            pass
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+        except (TypeError, ValueError, IndexError):
+            return None
+        if retry_at is None:
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(retry_at.timestamp() - time.time(), 0.0)
+
+    def _update(self, row_id, status, attempts, next_attempt_at, last_error):
+        with self._lock:
+            self._connection.execute(
+                "UPDATE outbox SET status=?, attempts=?, next_attempt_at=?,"
+                " last_error=? WHERE id=?",
+                (status, attempts, next_attempt_at, last_error, row_id),
+            )
+            self._connection.commit()
+
+    def counts(self) -> Dict[str, int]:
+        """Return the number of requests in each status.
+
+        The statuses are ``pending``, ``in_flight``, ``done`` and ``failed``.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT status, COUNT(*) FROM outbox GROUP BY status"
+            ).fetchall()
+        return dict(rows)
+
+    def drain(self) -> int:
+        """Send every due request in the calling thread and return how many were tried.
+
+        Requests that are rescheduled into the future are left for a later call.
+        """
+        total = 0
+        while True:
+            processed = self._process_due()
+            if not processed:
+                return total
+            total += processed
+
+    def enqueue(
+        self,
+        path: str,
+        method: str = "POST",
+        data: Optional[Union[Dict[str, Any], str]] = None,
+        json: Any = None,
+        params: Optional[Dict[str, Any]] = None,
+        idempotency_key: Optional[str] = None,
+    ) -> str:
+        """Journal a request and return its idempotency key.
+
+        :param path: The path of the request.
+        :param method: The HTTP method (default: POST).
+        :param data: A JSON-serializable dictionary or string to send as the body.
+        :param json: A JSON-serializable object to send as a JSON body.
+        :param params: The query parameters to add to the request.
+        :param idempotency_key: (Optional) A key identifying the write. Requests with a
+            key that is already journaled are ignored. Defaults to a hash of the
+            request.
+        """
+        if idempotency_key is None:
+            idempotency_key = self._default_key(method, path, params, data, json)
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR IGNORE INTO outbox (idempotency_key, method, path, params,"
+                " data, json, next_attempt_at, created_at)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    idempotency_key,
+                    method,
+                    path,
+                    jsonlib.dumps(params),
+                    jsonlib.dumps(data),
+                    jsonlib.dumps(json),
+                    now,
+                    now,
+                ),
+            )
+            self._connection.commit()
+        self._wake_event.set()
+        return idempotency_key
+
+    def post(
+        self,
+        path: str,
+        data: Optional[Union[Dict[str, Any], str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        json: Any = None,
+        idempotency_key: Optional[str] = None,
+    ) -> str:
+        """Journal a POST request and return its idempotency key.
+
+        Accepts the same arguments as :meth:`.Linkedin.post`, plus
+        ``idempotency_key``.
+        """
+        return self.enqueue(
+            path,
+            data=data,
+            idempotency_key=idempotency_key,
+            json=json,
+            method="POST",
+            params=params,
+        )
+
+    def start(self):
+        """Start the background worker thread."""
+        if self._worker is not None and self._worker.is_alive():
+            return
+        self._stop_event.clear()
+        self._worker = threading.Thread(
+            target=self._run, name="pawl-outbox", daemon=True
+        )
+        self._worker.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop the background worker after its current request.
+
+        :param timeout: The number of seconds to wait for the worker to finish.
+        """
+        self._stop_event.set()
+        self._wake_event.set()
+        if self._worker is not None:
+            self._worker.join(timeout)
+            self._worker = None
@@ -1,4 +1,14 @@
-"""Provide all services."""
-from .auth import Auth  # NOQA
-from .me import Me  # NOQA
-from .reactions import Reactions  # NOQA
+"""Provide all services.
+
+Service classes are imported on first access (PEP 562).
+"""
+from .._lazy import lazy_module
+
+_LAZY_ATTRIBUTES = {
+    "Assets": ".assets",
+    "Auth": ".auth",
+    "Me": ".me",
+    "Reactions": ".reactions",
+}
+
+lazy_module(globals(), _LAZY_ATTRIBUTES)
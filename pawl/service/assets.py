@@ -0,0 +1,251 @@
+"""Provide `/assets` service class."""
+import mmap
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from typing import Any, Dict, Optional
+
+from .base import ServiceBase
+from ..constants import ROUTES
+
+CHUNK_SIZE = 1024 * 1024  # bytes yielded to the connection at a time
+MULTIPART_THRESHOLD = 200 * 1024 * 1024  # Linkedin requires multipart above 200MB
+
+MULTIPART_UPLOAD = "com.linkedin.digitalmedia.uploading.MultipartUpload"
+SINGLE_UPLOAD = "com.linkedin.digitalmedia.uploading.MediaUploadHttpRequest"
+
+
+class AssetRecipe(Enum):
+    FEEDSHARE_IMAGE = "urn:li:digitalmediaRecipe:feedshare-image"
+    FEEDSHARE_VIDEO = "urn:li:digitalmediaRecipe:feedshare-video"
+
+
+class _Source:
+    """Read byte ranges from a file object, ``mmap`` or bytes-like object.
+
+    Bytes-like objects (including ``mmap.mmap``) are sliced through a memoryview so no
+    copies are made. File objects are read with ``os.pread`` when they expose a file
+    descriptor, which lets parts be read concurrently without sharing a file position.
+    """
+
+    def __init__(self, file):
+        self._lock = threading.Lock()
+        self._file = file
+        self._view = None
+        if isinstance(file, (bytes, bytearray, memoryview, mmap.mmap)):
+            self._view = memoryview(file)
+            self.size = self._view.nbytes
+            return
+        try:
+            self._fileno = file.fileno()
+            self.size = os.fstat(self._fileno).st_size
+        except (AttributeError, OSError):
+            self._fileno = None
+            with self._lock:
+                position = file.tell()
+                self.size = file.seek(0, os.SEEK_END)
+                file.seek(position)
+
+    def read(self, offset: int, size: int):
+        if self._view is not None:
+            return self._view[offset : offset + size]
+        if self._fileno is not None and hasattr(os, "pread"):
+            return os.pread(self._fileno, size, offset)
+        with self._lock:
+            self._file.seek(offset)
+            return self._file.read(size)
+
+
+class _Part:
+    """A re-iterable byte range of a :class:`_Source`.
+
+    Each iteration restarts at the beginning of the range, which lets the retry logic
+    in :class:`.Session` resend the body without holding it in memory.
+    """
+
+    def __init__(self, source: _Source, offset: int, length: int, chunk_size: int):
+        self._chunk_size = chunk_size
+        self._source = source
+        self.length = length
+        self.offset = offset
+
+    def __iter__(self):
+        end = self.offset + self.length
+        for offset in range(self.offset, end, self._chunk_size):
+            yield self._source.read(offset, min(self._chunk_size, end - offset))
+
+    def __len__(self):
+        return self.length
+
+    def __repr__(self):
+        return f"<_Part offset={self.offset} length={self.length}>"
+
+
+class AssetUpload:
+    """Track the state of a registered upload so that it can be resumed.
+
+    Parts that finish uploading are recorded in ``completed``. Passing the same
+    instance to :meth:`.Assets.upload` after a failure only sends the missing parts.
+    """
+
+    def __init__(self, value: Dict[str, Any]):
+        """Initialize an AssetUpload from the ``value`` of a registerUpload response.
+
+        :param value: The ``value`` object returned by ``registerUpload``.
+        """
+        self.asset = value["asset"]
+        self.media_artifact = value.get("mediaArtifact")
+        self.completed = {}
+        mechanism = value["uploadMechanism"]
+        if MULTIPART_UPLOAD in mechanism:
+            self.metadata = mechanism[MULTIPART_UPLOAD]["metadata"]
+            self.parts = mechanism[MULTIPART_UPLOAD]["partUploadRequests"]
+        else:
+            request = mechanism[SINGLE_UPLOAD]
+            self.metadata = None
+            self.parts = [
+                {
+                    "headers": request.get("headers", {}),
+                    "method": "PUT",
+                    "url": request["uploadUrl"],
+                }
+            ]
+
+    @property
+    def is_complete(self) -> bool:
+        """Return whether every part has been uploaded."""
+        return len(self.completed) == len(self.parts)
+
+    @property
+    def is_multipart(self) -> bool:
+        """Return whether the upload must be finished with completeMultiPartUpload."""
+        return self.metadata is not None
+
+
+class Assets(ServiceBase):
+    """Assets is a Service class that represents the `/assets` endpoint."""
+
+    # https://docs.microsoft.com/en-us/linkedin/marketing/integrations/community-management/shares/vector-asset-api # noqa
+    def register_upload(
+        self,
+        recipe: str = AssetRecipe.FEEDSHARE_IMAGE.value,
+        owner: Optional[str] = None,
+        file_size: Optional[int] = None,
+        multipart: bool = False,
+    ) -> AssetUpload:
+        """Register an upload and return an :class:`.AssetUpload`.
+
+        :param recipe: The digital media recipe URN (default: feedshare-image).
+        :param owner: The URN of the owning member or organization (default: the
+            current user).
+        :param file_size: The size of the file in bytes. Required when ``multipart``
+            is ``True``.
+        :param multipart: Whether to request a multipart upload, which Linkedin
+            requires for files larger than 200MB.
+        """
+        if owner is None:
+            owner = f"urn:li:person:{self._current_user_id()}"
+        register_upload_request = {
+            "owner": owner,
+            "recipes": [recipe],
+            "serviceRelationships": [
+                {
+                    "identifier": "urn:li:userGeneratedContent",
+                    "relationshipType": "OWNER",
+                }
+            ],
+        }
+        if multipart:
+            register_upload_request["fileSize"] = file_size
+            register_upload_request["supportedUploadMechanism"] = ["MULTIPART_UPLOAD"]
+        json_response = self._linkedin.post(
+            json={"registerUploadRequest": register_upload_request},
+            path=ROUTES["assets_register_upload"].format(),
+        )
+        return AssetUpload(json_response["value"])
+
+    def upload(
+        self,
+        file,
+        recipe: str = AssetRecipe.FEEDSHARE_IMAGE.value,
+        owner: Optional[str] = None,
+        upload: Optional[AssetUpload] = None,
+        chunk_size: int = CHUNK_SIZE,
+        max_workers: int = 4,
+    ) -> str:
+        """Stream ``file`` to Linkedin and return the asset URN.
+
+        :param file: A binary file object, ``mmap.mmap`` or bytes-like object. The file
+            is read in ``chunk_size`` pieces and is never loaded into memory as a whole.
+        :param recipe: The digital media recipe URN (default: feedshare-image).
+        :param owner: The URN of the owning member or organization (default: the
+            current user).
+        :param upload: (Optional) An :class:`.AssetUpload` from a previous call to
+            :meth:`.register_upload`. Parts recorded as completed are skipped, so
+            passing the same instance again after a failure resumes the upload from
+            the parts that did not finish.
+        :param chunk_size: The number of bytes to read and send at a time.
+        :param max_workers: The number of multipart parts to upload concurrently.
+        """
+        source = _Source(file)
+        if upload is None:
+            multipart = source.size > MULTIPART_THRESHOLD
+            upload = self.register_upload(
+                recipe=recipe, owner=owner, file_size=source.size, multipart=multipart
+            )
+
+        pending = [
+            index for index in range(len(upload.parts)) if index not in upload.completed
+        ]
+        if len(pending) == 1:
+            self._upload_part(upload, pending[0], source, chunk_size)
+        elif pending:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(
+                        self._upload_part, upload, index, source, chunk_size
+                    )
+                    for index in pending
+                ]
+            for future in futures:
+                future.result()
+
+        if upload.is_multipart:
+            self._complete_multipart_upload(upload)
+        return upload.asset
+
+    def _complete_multipart_upload(self, upload: AssetUpload):
+        self._linkedin.post(
+            json={
+                "completeMultipartUploadRequest": {
+                    "mediaArtifact": upload.media_artifact,
+                    "metadata": upload.metadata,
+                    "partUploadResponses": [
+                        upload.completed[index] for index in range(len(upload.parts))
+                    ],
+                }
+            },
+            path=ROUTES["assets_complete_multipart_upload"].format(),
+        )
+
+    def _upload_part(self, upload: AssetUpload, index: int, source, chunk_size):
+        part = upload.parts[index]
+        if "byteRange" in part:
+            offset = part["byteRange"]["firstByte"]
+            length = part["byteRange"]["lastByte"] - offset + 1
+        else:
+            offset, length = 0, source.size
+        headers = self._linkedin._core.upload(
+            part["url"],
+            _Part(source, offset, length, chunk_size),
+            headers=part.get("headers"),
+            method=part.get("method", "PUT"),
+        )
+        upload.completed[index] = {
+            "headers": {
+                "Content-Length": str(length),
+                "ETag": headers.get("etag"),
+            },
+            "httpStatusCode": 200,
+        }
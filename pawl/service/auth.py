@@ -27,9 +27,13 @@ class Auth(ServiceBase):
 
     def authorize(self, code: str):
         authenticator = self._linkedin._authorized_core._authorizer._authenticator
-        authorizer = Authorizer(authenticator)
+        authorizer = Authorizer(
+            authenticator, introspector=self._linkedin._token_introspector
+        )
         authorizer.authorize(code)
-        authorized_session = session.session(authorizer)
+        authorized_session = session.session(
+            authorizer, **self._linkedin._session_kwargs
+        )
         self._linkedin._core = self._linkedin._authorized_core = authorized_session
         # TODO - create class for tokens
         return authorizer.access_token
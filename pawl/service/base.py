@@ -27,6 +27,13 @@ class ServiceBase:
         # )
         return headers
 
+    def _current_user_id(self) -> str:
+        """Return the current member's id, fetching only the ``id`` field if unknown."""
+        if self._linkedin.current_user_id is None:
+            profile = self._linkedin.current_user.basic_profile(fields=["id"])
+            self._linkedin.current_user_id = profile["id"]
+        return self._linkedin.current_user_id
+
     @staticmethod
     def _safely_add_arguments(argument_dict, key, **new_arguments):
         """Replace argument_dict[key] with a deepcopy and update.
@@ -1,6 +1,8 @@
 """Provide `/me` service class."""
+from typing import Iterable, Optional, Union
+
 from .base import ServiceBase
-from ..constants import API_PATH
+from ..constants import ROUTES
 
 # from ..utils.raise_for_error import raise_for_error
 
@@ -8,8 +10,13 @@ from ..constants import API_PATH
 class Me(ServiceBase):
     """Me is a Service class that represents the `/me` endpoint."""
 
-    def basic_profile(self):
-        json_response = self._linkedin.get(path=f"v2/{API_PATH['me']}")
+    def basic_profile(self, fields: Optional[Union[str, Iterable[str]]] = None):
+        """Return the current member's profile.
+
+        :param fields: (Optional) The fields to request, e.g. ``["id"]``. All fields of
+            the lite profile are returned by default.
+        """
+        json_response = self._linkedin.get(path=ROUTES["me"].format(), fields=fields)
 
         """
         TODO - Refactor object structure
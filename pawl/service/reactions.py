@@ -1,27 +1,68 @@
 """Provide `/reactions` service class."""
+import logging
+from typing import Iterable, Optional, Union
+
 from .base import ServiceBase
-from ..constants import API_PATH
+from ..constants import ROUTES
+from ..core.exceptions import Conflict
+from ..urn import Urn, parse
+
+log = logging.getLogger(__package__)
 
 
 class Reactions(ServiceBase):
-    """Reactions is a Service class that represents the `/reactions` endpoint."""
+    """Reactions is a Service class that represents the `/reactions` endpoint.
+
+    Set ``seen_set`` to a seen-set from :mod:`pawl.utils.seen_set` to skip reactions
+    that were already created, e.g. by an earlier run of the same job.
+    """
+
+    seen_set = None
 
     # POST https://api.linkedin.com/v2/reactions?actor={organizationUrn|personUrn}
     # https://docs.microsoft.com/en-us/linkedin/marketing/integrations/community-management/shares/reactions-and-social-metadata?tabs=http#create-a-reaction-on-a-share-or-a-comment # noqa
     def like_post(
         self,
-        post_urn: str,
+        post_urn: Union[str, Urn],
         person_id: str = None,
+        fields: Optional[Union[str, Iterable[str]]] = None,
     ):
+        """Like the post (share, UGC post or comment) with ``post_urn``.
+
+        :param post_urn: The URN of the post. A malformed URN raises ``ValueError``
+            without making a request.
+        :param person_id: (Optional) The id of the member who likes the post
+            (default: the current user).
+        :param fields: (Optional) The fields of the reaction to return.
+
+        When ``seen_set`` is set and already holds the reaction, no request is made
+        and ``None`` is returned. Reactions are added to it when they are created and
+        when Linkedin responds with :class:`.Conflict` because they already exist.
+        """
         # TODO: Refactor OOP design
-        if person_id is None and self._linkedin.current_user_id is None:
-            person_id = self._linkedin.current_user.basic_profile()["id"]
-        elif person_id is None:
-            person_id = self._linkedin.current_user_id
+        post_urn = parse(post_urn)
+        if person_id is None:
+            person_id = self._current_user_id()
+        actor = Urn.of("person", person_id)
+
+        seen_set = self.seen_set
+        if seen_set is not None:
+            key = seen_set.key(actor, post_urn)
+            if key in seen_set:
+                log.debug(f"Skipping reaction {key} that was already sent")
+                return None
 
         json_content = {"root": post_urn, "reactionType": "LIKE"}
-        json_response = self._linkedin.post(
-            json=json_content,
-            path=f"v2/{API_PATH['reactions']}?actor=urn%3Ali%3Aperson%3A{person_id}",
-        )
+        try:
+            json_response = self._linkedin.post(
+                fields=fields,
+                json=json_content,
+                path=ROUTES["reactions"].format(actor=actor),
+            )
+        except Conflict:
+            if seen_set is not None:
+                seen_set.add(key)
+            raise
+        if seen_set is not None:
+            seen_set.add(key)
         return json_response
@@ -0,0 +1,159 @@
+"""Provide the Urn class: parsed, validated and interned Linkedin URNs.
+
+A URN has the form ``urn:{namespace}:{entity type}:{id}``, e.g. ``urn:li:share:123``.
+The id of a compound URN is a tuple of ids and URNs, such as
+``urn:li:comment:(urn:li:activity:123,456)``.
+
+:class:`.Urn` is a ``str`` subclass, so URNs can be used wherever strings are. Parsing
+is cached and :func:`.parse` returns the same object for equal URNs, so millions of
+references to a few thousand distinct URNs share their memory.
+
+.. code-block:: python
+
+    from pawl.urn import Urn, parse
+
+    comment = parse("urn:li:comment:(urn:li:activity:123,456)")
+    comment.entity_type  # "comment"
+    comment.id  # (Urn("urn:li:activity:123"), "456")
+    Urn.of("person", "abc")  # Urn("urn:li:person:abc")
+    parse("urn:li:share")  # raises ValueError
+"""
+import re
+from functools import lru_cache
+from typing import Tuple, Union
+
+from .core.restli import encode
+
+CACHE_SIZE = 1 << 16
+
+_ENTITY_TYPE = re.compile(r"[A-Za-z][A-Za-z0-9_]*\Z")
+_NAMESPACE = re.compile(r"[A-Za-z0-9][A-Za-z0-9-]{0,31}\Z")
+
+UrnId = Union[str, Tuple[Union[str, "Urn", tuple], ...]]
+
+
+def _split_top_level(text: str, urn: str) -> list:
+    """Split the inside of a tuple id on the commas that are not nested."""
+    parts = []
+    depth = 0
+    start = 0
+    for index, char in enumerate(text):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth < 0:
+                raise ValueError(f"Malformed URN {urn!r}: unbalanced parentheses")
+        elif char == "," and depth == 0:
+            parts.append(text[start:index])
+            start = index + 1
+    if depth:
+        raise ValueError(f"Malformed URN {urn!r}: unbalanced parentheses")
+    parts.append(text[start:])
+    return parts
+
+
+def _parse_id(entity_id: str, urn: str) -> UrnId:
+    if entity_id.startswith("urn:"):
+        return Urn(entity_id)
+    if entity_id.startswith("(") and entity_id.endswith(")"):
+        return tuple(
+            _parse_id(part, urn) for part in _split_top_level(entity_id[1:-1], urn)
+        )
+    if not entity_id or any(char in "()," for char in entity_id):
+        raise ValueError(f"Malformed URN {urn!r}: invalid id {entity_id!r}")
+    return entity_id
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _split(value: str) -> Tuple[str, str, UrnId]:
+    """Return the namespace, entity type and id of ``value``."""
+    if not isinstance(value, str):
+        raise ValueError(f"A URN must be a string, not {type(value).__name__}")
+    scheme, _, remainder = value.partition(":")
+    namespace, _, remainder = remainder.partition(":")
+    entity_type, _, entity_id = remainder.partition(":")
+    if scheme != "urn":
+        raise ValueError(f"Malformed URN {value!r}: it must start with 'urn:'")
+    if not _NAMESPACE.match(namespace):
+        raise ValueError(f"Malformed URN {value!r}: invalid namespace {namespace!r}")
+    if not _ENTITY_TYPE.match(entity_type):
+        raise ValueError(
+            f"Malformed URN {value!r}: invalid entity type {entity_type!r}"
+        )
+    return namespace, entity_type, _parse_id(entity_id, value)
+
+
+class Urn(str):
+    """A validated URN. Creating one from a malformed string raises ``ValueError``."""
+
+    __slots__ = ()
+
+    def __new__(cls, value: str):
+        """Validate ``value`` and return it as a URN.
+
+        :param value: The URN, e.g. ``urn:li:share:123``.
+        """
+        if type(value) is cls:
+            return value
+        _split(value)
+        return super().__new__(cls, value)
+
+    def __repr__(self):
+        """Return a string representation of the URN."""
+        return f"Urn({str.__repr__(self)})"
+
+    @classmethod
+    def of(cls, entity_type: str, *ids: Union[str, int], namespace: str = "li"):
+        """Return the URN of an entity from its parts.
+
+        :param entity_type: The entity type, e.g. ``person``.
+        :param ids: The id, or the parts of a compound id.
+        :param namespace: The namespace (default: ``li``).
+        """
+        if len(ids) == 1:
+            entity_id = str(ids[0])
+        else:
+            entity_id = f"({','.join(str(part) for part in ids)})"
+        return parse(f"urn:{namespace}:{entity_type}:{entity_id}")
+
+    @property
+    def encoded(self) -> str:
+        """Return the URN encoded for use in a Rest.li 2.0 URL."""
+        return encode(str(self))
+
+    @property
+    def entity_type(self) -> str:
+        """Return the entity type, e.g. ``share``."""
+        return _split(self)[1]
+
+    @property
+    def id(self) -> UrnId:
+        """Return the id: a string, or a tuple of ids and URNs for compound URNs."""
+        return _split(self)[2]
+
+    @property
+    def namespace(self) -> str:
+        """Return the namespace, e.g. ``li``."""
+        return _split(self)[0]
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse(value: str) -> Urn:
+    """Return the interned :class:`.Urn` for ``value``.
+
+    Equal URNs parsed while they are among the ``CACHE_SIZE`` most recently used
+    share one object.
+
+    :raises: ``ValueError`` when ``value`` is not a well-formed URN.
+    """
+    return Urn(value)
+
+
+def is_urn(value: str) -> bool:
+    """Return whether ``value`` is a well-formed URN."""
+    try:
+        _split(value)
+    except ValueError:
+        return False
+    return True
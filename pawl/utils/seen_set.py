@@ -0,0 +1,264 @@
+"""Seen-sets: persistent records of writes that have already been applied.
+
+:class:`.Reactions` skips a write whose ``(actor, URN)`` pair is in its ``seen_set``,
+which saves a write-quota unit and a round trip that would only return ``409
+Conflict``.
+
+.. code-block:: python
+
+    linkedin.reactions.seen_set = SQLiteSeenSet("seen.db")
+    linkedin.reactions.like_post("urn:li:share:123")  # Sent.
+    linkedin.reactions.like_post("urn:li:share:123")  # Skipped, returns None.
+
+:class:`.SQLiteSeenSet` is exact. :class:`.BloomSeenSet` uses a few bits per pair,
+which suits hundreds of millions of pairs, at the cost of skipping a small fraction
+(``error_rate``) of writes that were never sent.
+"""
+import hashlib
+import math
+import mmap
+import os
+import sqlite3
+import struct
+import threading
+import time
+from abc import ABC, abstractmethod
+
+from ..core import fork
+
+
+class BaseSeenSet(ABC):
+    """An abstract class for all seen-sets."""
+
+    @staticmethod
+    def key(actor: str, urn: str) -> str:
+        """Return the key of the write of ``urn`` by ``actor``."""
+        return f"{actor} {urn}"
+
+    @abstractmethod
+    def __contains__(self, key: str) -> bool:
+        """Return whether ``key`` has been added."""
+        raise NotImplementedError("``__contains__`` must be extended.")
+
+    @abstractmethod
+    def add(self, key: str):
+        """Record ``key``."""
+        raise NotImplementedError("``add`` must be extended.")
+
+    def close(self):
+        """Release the resources of the seen-set."""
+
+
+class SQLiteSeenSet(BaseSeenSet):
+    """An exact seen-set stored in a SQLite database."""
+
+    def __init__(self, database: str):
+        """Open (or create) the seen-set.
+
+        :param database: The path to the SQLite database.
+        """
+        self._database = database
+        self._lock = threading.Lock()
+        self._connect()
+        fork.register(self)
+
+    def __contains__(self, key: str) -> bool:
+        """Return whether ``key`` has been added."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT 1 FROM seen WHERE key=?", (key,)
+            ).fetchone()
+        return row is not None
+
+    def __len__(self) -> int:
+        """Return the number of keys."""
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM seen").fetchone()[0]
+
+    def _after_fork(self):
+        fork.abandon(self._connection)
+        self._lock = threading.Lock()
+        self._connect()
+
+    def _connect(self):
+        self._connection = sqlite3.connect(self._database, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS seen (key TEXT PRIMARY KEY, added_at REAL)"
+            " WITHOUT ROWID"
+        )
+        self._connection.commit()
+
+    def add(self, key: str):
+        """Record ``key``."""
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR IGNORE INTO seen VALUES (?, ?)", (key, time.time())
+            )
+            self._connection.commit()
+
+    def close(self):
+        """Close the database connection."""
+        self._connection.close()
+
+
+class BloomSeenSet(BaseSeenSet):
+    """A scalable Bloom filter stored in a memory-mapped file.
+
+    The filter is a series of slices. When a slice holds its capacity, a slice twice
+    as large with half the false positive rate is appended, so the overall rate stays
+    below ``error_rate`` however many keys are added. Membership checks hash the key
+    once and test a handful of bits per slice.
+
+    Keys are never reported missing once added. A key that was never added is
+    reported present with a probability of at most ``error_rate``. Only one process
+    should add keys at a time.
+    """
+
+    HEADER_SIZE = 4096
+    MAGIC = b"PAWLBLM1"
+    MAX_SLICES = 48
+
+    _HEADER = struct.Struct("<8sQdI")
+
+    def __init__(
+        self, path: str, initial_capacity: int = 1000000, error_rate: float = 0.001
+    ):
+        """Open (or create) the filter.
+
+        :param path: The path of the file.
+        :param initial_capacity: The number of keys the first slice holds
+            (default: 1000000). The capacity and error rate of an existing file are
+            read from it instead.
+        :param error_rate: The highest probability that a key that was never added
+            is reported present (default: 0.001).
+        """
+        self._lock = threading.Lock()
+        self.error_rate = error_rate
+        self.initial_capacity = initial_capacity
+        self.path = path
+        self._open()
+        fork.register(self)
+
+    def __contains__(self, key: str) -> bool:
+        """Return whether ``key`` has (probably) been added."""
+        first, second = self._hashes(key)
+        with self._lock:
+            return any(
+                self._test(index, first, second) for index in range(len(self._counts))
+            )
+
+    def __len__(self) -> int:
+        """Return the number of keys added."""
+        return sum(self._counts)
+
+    def _after_fork(self):
+        self._lock = threading.Lock()
+        self._mmap.close()
+        self._file.close()
+        self._open()
+
+    @staticmethod
+    def _hashes(key: str):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        first, second = struct.unpack("<QQ", digest)
+        return first, second | 1
+
+    def _open(self):
+        exists = os.path.exists(self.path) and os.path.getsize(self.path) > 0
+        self._file = open(self.path, "r+b" if exists else "w+b")
+        if exists:
+            magic, capacity, error_rate, slices = self._HEADER.unpack(
+                self._file.read(self._HEADER.size)
+            )
+            if magic != self.MAGIC:
+                self._file.close()
+                raise ValueError(f"{self.path} is not a Bloom filter file")
+            self.initial_capacity, self.error_rate = capacity, error_rate
+            self._counts = list(
+                struct.unpack(f"<{slices}Q", self._file.read(8 * slices))
+            )
+        else:
+            self._counts = [0]
+        self._layout()
+        self._file.truncate(self._offsets[-1] + self._sizes[-1])
+        self._mmap = mmap.mmap(self._file.fileno(), 0)
+        self._write_header()
+
+    def _layout(self):
+        """Compute the bits, hashes and file offset of each slice."""
+        self._bits, self._hash_counts, self._offsets, self._sizes = [], [], [], []
+        offset = self.HEADER_SIZE
+        for index in range(len(self._counts)):
+            capacity = self._capacity(index)
+            error_rate = self.error_rate * 0.5 ** (index + 1)
+            bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+            size = (bits + 7) // 8
+            self._bits.append(size * 8)
+            self._hash_counts.append(max(1, round(-math.log2(error_rate))))
+            self._offsets.append(offset)
+            self._sizes.append(size)
+            offset += size
+
+    def _capacity(self, index: int) -> int:
+        return self.initial_capacity * 2**index
+
+    def _grow(self):
+        if len(self._counts) >= self.MAX_SLICES:
+            raise RuntimeError(f"{self.path} cannot hold more keys")
+        self._counts.append(0)
+        self._layout()
+        self._mmap.flush()
+        self._mmap.close()
+        self._file.truncate(self._offsets[-1] + self._sizes[-1])
+        self._mmap = mmap.mmap(self._file.fileno(), 0)
+
+    def _test(self, index: int, first: int, second: int) -> bool:
+        bits = self._bits[index]
+        offset = self._offsets[index]
+        data = self._mmap
+        for hash_index in range(self._hash_counts[index]):
+            position = (first + hash_index * second) % bits
+            if not data[offset + (position >> 3)] & (1 << (position & 7)):
+                return False
+        return True
+
+    def _write_header(self):
+        header = self._HEADER.pack(
+            self.MAGIC, self.initial_capacity, self.error_rate, len(self._counts)
+        )
+        counts = struct.pack(f"<{len(self._counts)}Q", *self._counts)
+        self._mmap[: len(header) + len(counts)] = header + counts
+
+    def add(self, key: str):
+        """Record ``key``."""
+        first, second = self._hashes(key)
+        with self._lock:
+            if any(
+                self._test(index, first, second) for index in range(len(self._counts))
+            ):
+                return
+            index = len(self._counts) - 1
+            if self._counts[index] >= self._capacity(index):
+                self._grow()
+                index += 1
+            bits = self._bits[index]
+            offset = self._offsets[index]
+            for hash_index in range(self._hash_counts[index]):
+                position = (first + hash_index * second) % bits
+                self._mmap[offset + (position >> 3)] |= 1 << (position & 7)
+            self._counts[index] += 1
+            self._write_header()
+
+    def close(self):
+        """Write the filter to disk and close the file."""
+        with self._lock:
+            self._mmap.flush()
+            self._mmap.close()
+            self._file.close()
+
+    def flush(self):
+        """Write changes to disk."""
+        with self._lock:
+            self._mmap.flush()
@@ -7,6 +7,8 @@ praw/utils/token_manager.py. PRAW, commit bb0e00025f4cf10be64469d8998cc6ae1d81ca
 import sqlite3
 from abc import ABC, abstractmethod
 
+from ..core import fork
+
 
 class BaseTokenManager(ABC):
     """An abstract class for all token managers."""
@@ -92,6 +94,7 @@ class SQLiteTokenManager(BaseTokenManager):
         """
         super().__init__()
         self._connection = sqlite3.connect(database)
+        self._database = database
         self._connection.execute(
             "CREATE TABLE IF NOT EXISTS tokens (id, access_token, updated_at)"
         )
@@ -100,6 +103,12 @@ class SQLiteTokenManager(BaseTokenManager):
         )
         self._connection.commit()
         self.key = key
+        fork.register(self)
+
+    def _after_fork(self):
+        """Open a new database connection in the child process."""
+        fork.abandon(self._connection)
+        self._connection = sqlite3.connect(self._database)
 
     def _get(self):
         cursor = self._connection.execute(
@@ -1 +1,51 @@
 """Prepare pytest."""
+import pytest
+from requests.structures import CaseInsensitiveDict
+
+from pawl.core.auth import Authenticator, Authorizer
+from pawl.core.session import Session
+
+
+class FakeResponse:
+    """Stand in for a :class:`requests.Response` with a JSON body."""
+
+    def __init__(self, status_code=200, json=None, headers=None):
+        self.status_code = status_code
+        self._json = {} if json is None else json
+        self.headers = CaseInsensitiveDict(headers or {})
+        self.text = str(self._json)
+
+    def json(self):
+        return self._json
+
+
+class FakeRequestor:
+    """Record requests and return queued responses or raise queued exceptions."""
+
+    linkedin_url = "https://api.linkedin.com/"
+    oauth_url = "https://www.linkedin.com/oauth/"
+
+    def __init__(self, *results):
+        self.calls = []
+        self.results = list(results)
+
+    def close(self):
+        pass
+
+    def request(self, *args, **kwargs):
+        self.calls.append((args, kwargs))
+        result = self.results.pop(0) if self.results else FakeResponse()
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+@pytest.fixture
+def requestor():
+    return FakeRequestor()
+
+
+@pytest.fixture
+def session(requestor):
+    authenticator = Authenticator(requestor, "client_id", "client_secret")
+    return Session(Authorizer(authenticator, access_token="token"))
@@ -0,0 +1,47 @@
+"""Guard the cold-start cost of ``import pawl``.
+
+Each check runs in a fresh interpreter so modules imported by other tests do not
+hide regressions.
+"""
+import subprocess
+import sys
+
+import pytest
+
+# Cumulative microseconds reported by ``python -X importtime`` for the ``pawl`` package.
+IMPORT_TIME_BUDGET_US = 50_000
+
+
+def run_python(code, *options):
+    return subprocess.run(
+        [sys.executable, *options, "-c", code],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+
+
+@pytest.mark.parametrize(
+    "module", ["pawl", "pawl.core", "pawl.core.auth", "pawl.utils.token_manager"]
+)
+def test_import_does_not_load_requests(module):
+    result = run_python(f"import sys, {module}; print('requests' in sys.modules)")
+    assert result.stdout.strip() == "False"
+
+
+def test_lazy_attributes_resolve():
+    result = run_python(
+        "import pawl, pawl.core, pawl.service;"
+        "print(pawl.Linkedin.__name__, pawl.core.Authorizer.__name__,"
+        " pawl.service.Reactions.__name__)"
+    )
+    assert result.stdout.split() == ["Linkedin", "Authorizer", "Reactions"]
+
+
+def test_import_time_budget():
+    result = run_python("import pawl", "-X", "importtime")
+    cumulative = {}
+    for line in result.stderr.splitlines()[1:]:  # skip the header line
+        _, cumulative_us, name = line.split("|")
+        cumulative[name.strip()] = int(cumulative_us)
+    assert cumulative["pawl"] < IMPORT_TIME_BUDGET_US
@@ -0,0 +1,74 @@
+import io
+
+import pytest
+
+from pawl.service.assets import MULTIPART_UPLOAD, Assets, AssetUpload
+
+
+class StubSession:
+    def __init__(self, fail_offsets=()):
+        self.fail_offsets = set(fail_offsets)
+        self.uploaded = {}
+
+    def upload(self, url, data, headers=None, method="PUT"):
+        if data.offset in self.fail_offsets:
+            self.fail_offsets.remove(data.offset)
+            raise ConnectionError
+        self.uploaded[data.offset] = b"".join(bytes(chunk) for chunk in data)
+        return {"etag": f"etag-{data.offset}"}
+
+
+class StubLinkedin:
+    current_user_id = "abc"
+
+    def __init__(self, session):
+        self._core = session
+        self.posts = []
+
+    def post(self, path, json=None):
+        self.posts.append((path, json))
+
+
+def multipart_upload(size, part_size):
+    parts = [
+        {
+            "byteRange": {
+                "firstByte": offset,
+                "lastByte": min(offset + part_size, size) - 1,
+            },
+            "method": "PUT",
+            "url": f"https://upload/{offset}",
+        }
+        for offset in range(0, size, part_size)
+    ]
+    return AssetUpload(
+        {
+            "asset": "urn:li:digitalmediaAsset:1",
+            "mediaArtifact": "artifact",
+            "uploadMechanism": {
+                MULTIPART_UPLOAD: {"metadata": "meta", "partUploadRequests": parts}
+            },
+        }
+    )
+
+
+def test_multipart_upload_resumes_missing_parts():
+    content = bytes(range(256)) * 40
+    session = StubSession(fail_offsets={4096})
+    linkedin = StubLinkedin(session)
+    assets = Assets(linkedin)
+    upload = multipart_upload(len(content), 4096)
+
+    with pytest.raises(ConnectionError):
+        assets.upload(io.BytesIO(content), upload=upload, chunk_size=1000)
+    assert not upload.is_complete and not linkedin.posts
+
+    assert assets.upload(content, upload=upload) == upload.asset
+    assert upload.is_complete
+    responses = linkedin.posts[0][1]["completeMultipartUploadRequest"]
+    assert [r["headers"]["ETag"] for r in responses["partUploadResponses"]] == [
+        "etag-0",
+        "etag-4096",
+        "etag-8192",
+    ]
+    assert b"".join(session.uploaded[o] for o in (0, 4096, 8192)) == content
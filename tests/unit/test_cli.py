@@ -0,0 +1,54 @@
+import io
+import json
+
+from pawl import cli
+from tests.conftest import FakeRequestor
+
+
+def run(jobs, checkpoint):
+    results, errors = io.StringIO(), io.StringIO()
+    counts = cli.run(
+        io.StringIO(jobs),
+        results,
+        errors,
+        checkpoint=checkpoint,
+        linkedin_kwargs={"access_token": "token", "requestor_class": FakeRequestor},
+        processes=2,
+        window=2,
+    )
+    return counts, results.getvalue(), errors.getvalue()
+
+
+def test_run_writes_results_errors_and_checkpoint(tmp_path):
+    checkpoint = str(tmp_path / "checkpoint.json")
+    jobs = (
+        '{"op": "get", "path": "v2/me", "id": "a"}\n'
+        "\n"
+        '{"op": "delete", "path": "v2/me"}\n'
+        '{"op": "get", "path": "v2/me"}\n'
+    )
+    counts, results, errors = run(jobs, checkpoint)
+
+    assert counts == (2, 1)
+    lines = sorted(json.loads(line)["line"] for line in results.splitlines())
+    assert lines == [1, 4]
+    assert json.loads(errors) == {
+        "line": 3,
+        "error": "ValueError",
+        "message": "Unknown op: 'delete'",
+    }
+    with open(checkpoint) as checkpoint_file:
+        assert json.load(checkpoint_file) == {"line": 4}
+
+    jobs += '{"op": "get", "path": "v2/me", "id": "b"}\n'
+    counts, results, _ = run(jobs, checkpoint)
+    assert counts == (1, 0)
+    assert json.loads(results) == {"line": 5, "id": "b", "result": {}}
+
+
+def test_checkpoint_only_advances_over_contiguous_lines():
+    progress = cli._Checkpoint(None)
+    progress.complete(2)
+    assert progress.line == 0
+    progress.complete(1)
+    assert progress.line == 2
@@ -0,0 +1,40 @@
+import pytest
+
+from pawl.core.auth import Authenticator, Authorizer
+from pawl.core.concurrency import AIMDLimit
+from pawl.core.exceptions import TooManyRequests
+from pawl.core.session import Session
+from tests.conftest import FakeResponse
+
+
+def test_limit_grows_while_latency_is_stable():
+    limit = AIMDLimit(initial_limit=4)
+    for _ in range(5):
+        limit.on_sample(0.1, in_flight=4, dropped=False)
+    assert limit.limit == 9
+
+
+def test_limit_does_not_grow_when_window_is_underused():
+    limit = AIMDLimit(initial_limit=10)
+    limit.on_sample(0.1, in_flight=1, dropped=False)
+    assert limit.limit == 10
+
+
+def test_limit_shrinks_on_drops_and_latency_growth():
+    limit = AIMDLimit(initial_limit=10, backoff_ratio=0.5)
+    limit.on_sample(0.1, in_flight=1, dropped=True)
+    assert limit.limit == 5
+    for _ in range(10):
+        limit.on_sample(1.0, in_flight=5, dropped=False)
+    assert limit.limit == 1
+
+
+def test_session_reports_overload_to_limit(requestor):
+    limit = AIMDLimit(initial_limit=10, backoff_ratio=0.5)
+    authenticator = Authenticator(requestor, "client_id", "client_secret")
+    authorizer = Authorizer(authenticator, access_token="token")
+    session = Session(authorizer, max_concurrency=limit)
+    requestor.results = [FakeResponse(429)]
+    with pytest.raises(TooManyRequests):
+        session.request("GET", "v2/me")
+    assert limit.limit == 5
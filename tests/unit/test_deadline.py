@@ -0,0 +1,34 @@
+import pytest
+from requests.exceptions import ReadTimeout
+
+from pawl.core.deadline import Deadline
+from pawl.core.exceptions import DeadlineExceeded, RequestException
+
+
+def test_timeout_is_capped_to_remaining_budget():
+    deadline = Deadline(1)
+    assert deadline.timeout(16) <= 1
+    connect, read = deadline.timeout((0.5, 16))
+    assert connect == 0.5 and read <= 1
+
+
+def test_ensure_raises_when_budget_is_spent():
+    with pytest.raises(DeadlineExceeded):
+        Deadline(0.1).ensure(0.5, "retry")
+
+
+def test_session_passes_capped_timeout(session, requestor):
+    session.request("GET", "v2/me", timeout=(3.05, 16), deadline=5)
+    connect, read = requestor.calls[0][1]["timeout"]
+    assert connect == 3.05 and read <= 5
+
+
+def test_session_stops_retrying_once_deadline_cannot_be_met(
+    monkeypatch, session, requestor
+):
+    monkeypatch.setattr("pawl.core.session.random.random", lambda: 0.5)
+    error = RequestException(ReadTimeout(), (), {})
+    requestor.results = [error, error, error]
+    with pytest.raises(DeadlineExceeded):
+        session.request("GET", "v2/me", deadline=0.5)
+    assert len(requestor.calls) == 1
@@ -0,0 +1,63 @@
+import pickle
+
+from requests.exceptions import ConnectionError
+
+from pawl.core.exceptions import (
+    BadRequest,
+    RequestException,
+    ResponseException,
+    ResponseSnapshot,
+    TooManyRequests,
+)
+from tests.conftest import FakeResponse
+
+
+def test_response_exception_keeps_snapshot():
+    response = FakeResponse(
+        400,
+        json={"serviceErrorCode": 100, "message": "Not enough permissions"},
+        headers={"x-li-uuid": "abc", "set-cookie": "secret"},
+    )
+    exception = pickle.loads(pickle.dumps(BadRequest(response)))
+
+    assert isinstance(exception, BadRequest)
+    assert str(exception) == "received 400 HTTP response"
+    assert isinstance(exception.response, ResponseSnapshot)
+    assert exception.response.status_code == 400
+    assert exception.response.headers == {"x-li-uuid": "abc"}
+    assert exception.response.service_error_code == 100
+    assert exception.response.message == "Not enough permissions"
+
+
+def test_snapshot_truncates_body():
+    response = FakeResponse(429, headers={"retry-after": "2"})
+    response.text = "x" * 5000
+    exception = pickle.loads(pickle.dumps(TooManyRequests(response)))
+
+    assert exception.retry_after == "2"
+    assert len(exception.message) == ResponseSnapshot.MAX_BODY
+    assert exception.response.truncated
+
+
+def test_full_response_is_opt_in(monkeypatch):
+    monkeypatch.setattr(ResponseException, "keep_response", True)
+    response = FakeResponse(400)
+    exception = BadRequest(response)
+
+    assert exception.response is response
+    assert isinstance(pickle.loads(pickle.dumps(exception)).response, ResponseSnapshot)
+
+
+def test_request_exception_keeps_summary():
+    original = ConnectionError("refused", request=object())
+    exception = RequestException(
+        original,
+        ("GET", "https://api.linkedin.com/v2/me"),
+        {"headers": {"Authorization": "Bearer token"}, "json": {}, "timeout": 16},
+    )
+
+    assert exception.request_kwargs == {"timeout": 16}
+    assert original.request is None
+    exception = pickle.loads(pickle.dumps(exception))
+    assert exception.request_args == ("GET", "https://api.linkedin.com/v2/me")
+    assert isinstance(exception.original_exception, ConnectionError)
@@ -0,0 +1,85 @@
+import gzip
+import io
+import json
+
+import pytest
+
+from pawl.export import Export, NDJSONWriter, export, flatten
+from pawl.linkedin import Linkedin
+
+
+class StubLinkedin:
+    _pages = Linkedin._pages
+
+    def __init__(self, records):
+        self.calls = []
+        self.records = records
+
+    def get(self, path, params=None, **kwargs):
+        self.calls.append((path, params))
+        start, count = params["start"], params["count"]
+        return {
+            "elements": self.records[start : start + count],
+            "paging": {"start": start, "count": count, "total": len(self.records)},
+        }
+
+
+def records(count):
+    return [{"id": str(i), "lastModified": {"time": i}} for i in range(count)]
+
+
+def test_flatten_joins_nested_keys():
+    assert flatten({"a": {"b": {"c": 1}}, "d": [1], "e": {}}) == {
+        "a.b.c": 1,
+        "d": [1],
+        "e": {},
+    }
+
+
+def test_export_streams_pages_through_transforms(tmp_path):
+    linkedin = StubLinkedin(records(7))
+    output = str(tmp_path / "shares.ndjson.gz")
+
+    def odd_only(record):
+        return record if record["lastModified.time"] % 2 else None
+
+    written = export(
+        linkedin,
+        "v2/shares",
+        output,
+        params={"q": "owners"},
+        transforms=[flatten, odd_only],
+        page_size=3,
+    )
+
+    with gzip.open(output, "rt") as output_file:
+        lines = [json.loads(line) for line in output_file]
+    assert written == 3
+    assert [line["id"] for line in lines] == ["1", "3", "5"]
+    assert linkedin.calls[0][0] == "v2/shares?q=owners"
+    assert len(linkedin.calls) == 3
+
+
+def test_export_raises_fetch_errors():
+    class FailingLinkedin(StubLinkedin):
+        def get(self, path, params=None, **kwargs):
+            raise RuntimeError("boom")
+
+    stream = io.StringIO()
+    with pytest.raises(RuntimeError):
+        Export(FailingLinkedin([]), "v2/shares").to(NDJSONWriter(stream))
+
+
+def test_parquet_export_writes_row_groups(tmp_path):
+    parquet = pytest.importorskip("pyarrow.parquet")
+    output = str(tmp_path / "shares.parquet")
+    written = export(
+        StubLinkedin(records(25)),
+        "v2/shares",
+        output,
+        page_size=10,
+        writer_kwargs={"row_group_size": 10},
+    )
+    parquet_file = parquet.ParquetFile(output)
+    assert written == parquet_file.metadata.num_rows == 25
+    assert parquet_file.metadata.num_row_groups == 3
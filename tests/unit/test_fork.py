@@ -0,0 +1,37 @@
+import os
+
+import pytest
+
+from pawl.core.requestor import Requestor
+from pawl.sync import SyncStore
+from pawl.utils.token_manager import SQLiteTokenManager
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_child_gets_new_connections_and_keeps_state(tmp_path):
+    requestor = Requestor()
+    manager = SQLiteTokenManager(str(tmp_path / "tokens.db"), "key")
+    manager.register("token")
+    store = SyncStore(str(tmp_path / "sync.db"))
+    store.set_watermark("shares", 10)
+    pool_manager = requestor._http.get_adapter(requestor.linkedin_url).poolmanager
+    connections = (manager._connection, store._connection)
+
+    pid = os.fork()
+    if pid == 0:
+        status = 1
+        try:
+            adapter = requestor._http.get_adapter(requestor.linkedin_url)
+            assert adapter.poolmanager is not pool_manager
+            assert (manager._connection, store._connection) != connections
+            assert manager._get() == "token"
+            assert store.watermark("shares") == 10
+            store.set_watermark("shares", 20)
+            status = 0
+        finally:
+            os._exit(status)
+    _, status = os.waitpid(pid, 0)
+
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert store.watermark("shares") == 20
+    assert manager._get() == "token"
@@ -0,0 +1,70 @@
+import pytest
+
+from pawl.frames import columns, frame, frames
+from pawl.linkedin import Linkedin
+
+
+class StubLinkedin:
+    _pages = Linkedin._pages
+
+    def __init__(self, records):
+        self.records = records
+
+    def get(self, path, params=None, **kwargs):
+        start, count = params["start"], params["count"]
+        return {
+            "elements": self.records[start : start + count],
+            "paging": {"start": start, "count": count, "total": len(self.records)},
+        }
+
+
+RECORDS = [
+    {"reactionType": "LIKE", "created": {"time": 1}},
+    {"reactionType": "PRAISE", "created": {"time": 2}},
+    {"reactionType": "LIKE"},
+]
+
+
+def test_columns_follow_dotted_paths():
+    assert columns(RECORDS, ["reactionType", "created.time"]) == {
+        "reactionType": ["LIKE", "PRAISE", "LIKE"],
+        "created.time": [1, 2, None],
+    }
+
+
+def test_frames_are_built_per_page():
+    pages = list(
+        frames(
+            StubLinkedin(RECORDS),
+            "v2/reactions",
+            ["created.time"],
+            format="columns",
+            page_size=2,
+        )
+    )
+    assert pages == [{"created.time": [1, 2]}, {"created.time": [None]}]
+
+
+def test_numpy_frame_types_columns():
+    numpy = pytest.importorskip("numpy")
+    result = frame(
+        StubLinkedin(RECORDS), "v2/reactions", ["reactionType", "created.time"]
+    )
+    assert (result["reactionType"] == "LIKE").sum() == 2
+    assert result["created.time"].dtype == numpy.float64
+    assert numpy.nansum(result["created.time"]) == 3
+
+
+def test_arrow_frame_is_a_table():
+    pyarrow = pytest.importorskip("pyarrow")
+    schema = pyarrow.schema([("created.time", "int64")])
+    table = frame(
+        StubLinkedin(RECORDS),
+        "v2/reactions",
+        ["created.time"],
+        format="arrow",
+        page_size=2,
+        schema=schema,
+    )
+    assert table.num_rows == 3
+    assert table.column("created.time").null_count == 1
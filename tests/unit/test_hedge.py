@@ -0,0 +1,87 @@
+import threading
+
+from pawl.core.hedge import HedgePolicy
+
+
+def warm(policy, latency=0.01):
+    policy._latencies.extend([latency] * policy.min_samples)
+    policy._requests = 1000
+
+
+def test_no_hedging_until_warm():
+    policy = HedgePolicy()
+    assert policy.delay() is None
+    assert policy.call(lambda: "response") == "response"
+    assert policy._hedges == 0
+
+
+def test_slow_request_is_hedged_and_first_response_wins():
+    policy = HedgePolicy(min_delay=0.01)
+    warm(policy)
+    release = threading.Event()
+    calls = []
+
+    def attempt():
+        calls.append(None)
+        policy.start_transport()
+        if len(calls) == 1:
+            release.wait(5)
+            return "slow"
+        return "fast"
+
+    assert policy.call(attempt) == "fast"
+    release.set()
+    assert len(calls) == 2 and policy._hedges == 1
+
+
+def test_hedges_are_capped_by_ratio():
+    policy = HedgePolicy(min_delay=0.01, max_ratio=0.0)
+    warm(policy)
+    calls = []
+
+    def attempt():
+        calls.append(None)
+        policy.start_transport()
+        threading.Event().wait(0.05)
+        return "response"
+
+    assert policy.call(attempt) == "response"
+    assert len(calls) == 1
+
+
+def test_waits_before_the_transport_call_are_not_hedged():
+    policy = HedgePolicy(min_delay=0.01)
+    warm(policy)
+    calls = []
+
+    def attempt():
+        calls.append(None)
+        threading.Event().wait(0.05)  # E.g. a rate limit delay.
+        policy.start_transport()
+        return "response"
+
+    assert policy.call(attempt) == "response"
+    assert len(calls) == 1 and policy._hedges == 0
+
+
+def test_no_hedge_while_rate_limited():
+    policy = HedgePolicy(min_delay=0.01)
+    warm(policy)
+    calls = []
+
+    def attempt():
+        calls.append(None)
+        policy.start_transport()
+        threading.Event().wait(0.05)
+        return "response"
+
+    assert policy.call(attempt, may_hedge=lambda: False) == "response"
+    assert len(calls) == 1 and policy._hedges == 0
+
+
+def test_session_records_transport_latency(session):
+    policy = session._hedge_policy = HedgePolicy()
+    session.request("GET", "v2/me")
+    session.request("POST", "v2/me")
+
+    assert len(policy._latencies) == 1
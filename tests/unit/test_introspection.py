@@ -0,0 +1,95 @@
+import time
+
+import pytest
+
+from pawl.core.auth import Authenticator, Authorizer
+from pawl.core.exceptions import InactiveToken, ResponseException
+from pawl.core.introspection import TokenIntrospector
+from pawl.core.session import Session
+from tests.conftest import FakeRequestor, FakeResponse
+
+
+def introspector_for(requestor):
+    return TokenIntrospector("client_id", "client_secret", requestor=requestor)
+
+
+def test_introspect_many_caches_results():
+    expires_at = time.time() + 3600
+    requestor = FakeRequestor(
+        FakeResponse(json={"active": True, "expires_at": expires_at}),
+        FakeResponse(json={"active": False}),
+    )
+    introspector = introspector_for(requestor)
+
+    results = introspector.introspect_many(["live", "dead"])
+    assert set(results) == {"live", "dead"}
+    assert introspector.is_active("live") is True
+    assert introspector.is_active("dead") is False
+    assert introspector.is_active("unknown") is None
+
+    introspector.introspect_many(["live", "dead"])
+    assert len(requestor.calls) == 2
+
+
+def test_session_rejects_inactive_token_without_request():
+    requestor = FakeRequestor(FakeResponse(json={"active": False}))
+    introspector = introspector_for(requestor)
+    introspector.introspect("dead")
+    authenticator = Authenticator(requestor, "client_id", "client_secret")
+    session = Session(
+        Authorizer(authenticator, access_token="dead", introspector=introspector)
+    )
+
+    with pytest.raises(InactiveToken):
+        session.request("GET", "v2/me")
+    assert len(requestor.calls) == 1
+
+
+def test_authorizer_learns_expiry_from_introspection():
+    expires_at = time.time() + 3600
+    requestor = FakeRequestor(
+        FakeResponse(json={"active": True, "expires_at": expires_at})
+    )
+    introspector = introspector_for(requestor)
+    introspector.introspect("live")
+    authenticator = Authenticator(requestor, "client_id", "client_secret")
+    authorizer = Authorizer(
+        authenticator, access_token="live", introspector=introspector
+    )
+
+    assert authorizer.is_valid()
+    assert authorizer._expiration_timestamp == expires_at
+
+
+def test_introspect_many_keeps_results_of_other_tokens():
+    requestor = FakeRequestor(FakeResponse(json={"active": False}))
+    introspector = introspector_for(requestor)
+    introspector.max_workers = 1
+    requestor.results.append(FakeResponse(status_code=500))
+
+    results = introspector.introspect_many(["dead", "broken"])
+    assert results["dead"] == {"active": False}
+    assert isinstance(results["broken"], ResponseException)
+
+
+def test_session_refreshes_inactive_token():
+    requestor = FakeRequestor(
+        FakeResponse(json={"active": False}), FakeResponse(json={"active": True})
+    )
+    introspector = introspector_for(requestor)
+    introspector.introspect_many(["dead", "live"])
+    authenticator = Authenticator(requestor, "client_id", "client_secret")
+
+    def load_token(authorizer):
+        authorizer.access_token = "live"
+
+    session = Session(
+        Authorizer(
+            authenticator,
+            access_token="dead",
+            introspector=introspector,
+            pre_access_callback=load_token,
+        )
+    )
+    session.request("GET", "v2/me")
+    assert requestor.calls[-1][1]["headers"]["Authorization"] == "Bearer live"
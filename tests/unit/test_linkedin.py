@@ -0,0 +1,70 @@
+import os
+import time
+
+import pytest
+
+from pawl.linkedin import Linkedin
+
+
+@pytest.mark.parametrize(
+    "path, fields, expected",
+    [
+        ("v2/me", ["id"], "v2/me?projection=(id)"),
+        ("v2/me", "id,localizedFirstName", "v2/me?projection=(id,localizedFirstName)"),
+        ("v2/me", "(id,vanityName)", "v2/me?projection=(id,vanityName)"),
+        (
+            "v2/shares?q=owners",
+            ("id", "owner"),
+            "v2/shares?q=owners&projection=(id,owner)",
+        ),
+    ],
+)
+def test_add_projection(path, fields, expected):
+    assert Linkedin._add_projection(path, fields) == expected
+
+
+def test_snapshot_restores_runtime_state(tmp_path):
+    path = str(tmp_path / "state.json")
+    linkedin = Linkedin(access_token="token")
+    linkedin.current_user_id = "abc"
+    linkedin._core._authorizer._expiration_timestamp = time.time() + 600
+    linkedin._core._rate_limiter.update(
+        {"x-ratelimit-remaining": "42", "x-ratelimit-reset": "60"}
+    )
+    linkedin.snapshot(path)
+
+    restored = Linkedin(access_token="token")
+    assert restored.restore(path)
+    assert restored.current_user_id == "abc"
+    assert restored._core.member == "urn:li:person:abc"
+    assert restored._core._authorizer.is_valid()
+    rate_limiter = restored._core._rate_limiter
+    assert rate_limiter.remaining == 42
+    assert rate_limiter.reset_timestamp == linkedin._core._rate_limiter.reset_timestamp
+
+
+def test_restore_ignores_other_tokens_and_stale_snapshots(tmp_path):
+    path = str(tmp_path / "state.json")
+    linkedin = Linkedin(access_token="token")
+    linkedin.current_user_id = "abc"
+    linkedin.snapshot(path)
+
+    assert not Linkedin(access_token="other").restore(path)
+    assert not Linkedin(access_token="token").restore(path, max_age=-1)
+    assert not Linkedin(access_token="token").restore(str(tmp_path / "missing"))
+    with open(path, "w") as snapshot_file:
+        snapshot_file.write("[]")
+    assert not Linkedin(access_token="token").restore(path)
+    assert os.listdir(tmp_path) == ["state.json"]
+
+
+def test_restore_drops_rate_limiter_state_after_reset(tmp_path):
+    path = str(tmp_path / "state.json")
+    linkedin = Linkedin(access_token="token")
+    linkedin._core._rate_limiter.remaining = 42
+    linkedin._core._rate_limiter.reset_timestamp = time.time() - 1
+    linkedin.snapshot(path)
+
+    restored = Linkedin(access_token="token")
+    assert restored.restore(path)
+    assert restored._core._rate_limiter.remaining == 5000
@@ -0,0 +1,55 @@
+import pytest
+
+from pawl.core.exceptions import NotFound, ResponseException
+from pawl.loader import Loader
+
+
+class StubLinkedin:
+    def __init__(self):
+        self.paths = []
+
+    def get(self, path, fields=None):
+        self.paths.append(path)
+        return {
+            "results": {"1": {"id": "1"}, "urn:li:person:2": {"id": "2"}},
+            "errors": {"3": {"status": 403, "message": "Not enough permissions"}},
+        }
+
+
+def test_lookups_are_batched_and_memoised():
+    linkedin = StubLinkedin()
+    loader = Loader(linkedin, "v2/people", window=0.01)
+    first = loader.load("1")
+    second = loader.load("urn:li:person:2")
+
+    assert first.result(timeout=5) == {"id": "1"}
+    assert second.result(timeout=5) == {"id": "2"}
+    assert linkedin.paths == ["v2/people?ids=List(1,urn%3Ali%3Aperson%3A2)"]
+    assert loader.get("1") == {"id": "1"}
+    assert len(linkedin.paths) == 1
+
+
+def test_missing_keys_raise_per_key_errors():
+    linkedin = StubLinkedin()
+    loader = Loader(linkedin, "v2/people", max_batch_size=2)
+    futures = loader.load_many(["3", "4"])
+
+    with pytest.raises(ResponseException) as excinfo:
+        futures[0].result(timeout=5)
+    assert excinfo.value.response.status_code == 403
+    assert excinfo.value.response.message == "Not enough permissions"
+    with pytest.raises(NotFound):
+        futures[1].result(timeout=5)
+    assert loader.load("3").exception(timeout=5) is not None
+    assert len(linkedin.paths) == 2
+
+
+@pytest.mark.parametrize("response", [None, ""])
+def test_unexpected_responses_fail_every_future(response):
+    linkedin = StubLinkedin()
+    linkedin.get = lambda path, fields=None: response
+    loader = Loader(linkedin, "v2/people")
+
+    with pytest.raises(TypeError):
+        loader.get_many(["1", "2"])
+    assert not loader._cache
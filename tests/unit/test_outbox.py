@@ -0,0 +1,109 @@
+import time
+from email.utils import formatdate
+
+from pawl.core.exceptions import BadRequest, Conflict, ServerError, TooManyRequests
+from pawl.outbox import Outbox
+from tests.conftest import FakeResponse
+
+
+class StubSession:
+    def __init__(self, *results):
+        self.calls = []
+        self.results = list(results)
+
+    def request(self, **kwargs):
+        self.calls.append(kwargs)
+        result = self.results.pop(0) if self.results else None
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+class StubLinkedin:
+    def __init__(self, *results):
+        self._core = StubSession(*results)
+
+
+def test_requests_are_deduplicated_and_sent(tmp_path):
+    linkedin = StubLinkedin()
+    outbox = Outbox(linkedin, str(tmp_path / "outbox.db"))
+    outbox.post("v2/reactions", json={"root": "a"}, idempotency_key="like:a")
+    outbox.post("v2/reactions", json={"root": "a"}, idempotency_key="like:a")
+
+    assert outbox.counts() == {"pending": 1}
+    assert outbox.drain() == 1
+    assert linkedin._core.calls[0]["json"] == {"root": "a"}
+    assert outbox.counts() == {"done": 1}
+
+
+def test_journal_survives_restart(tmp_path):
+    database = str(tmp_path / "outbox.db")
+    Outbox(StubLinkedin(), database).post("v2/reactions", json={"root": "a"})
+
+    linkedin = StubLinkedin()
+    Outbox(linkedin, database).drain()
+    assert len(linkedin._core.calls) == 1
+
+
+def test_failures_are_retried_or_failed(tmp_path):
+    linkedin = StubLinkedin(
+        ServerError(FakeResponse(500)),
+        Conflict(FakeResponse(409)),
+        BadRequest(FakeResponse(400)),
+    )
+    outbox = Outbox(linkedin, str(tmp_path / "outbox.db"), backoff=0)
+    outbox.post("v2/a", json={})
+    outbox.post("v2/b", json={})
+
+    outbox.drain()
+    assert outbox.counts() == {"done": 1, "failed": 1}
+    assert [call["path"] for call in linkedin._core.calls] == ["v2/a", "v2/b", "v2/a"]
+
+
+def test_unexpected_exceptions_are_retried(tmp_path):
+    linkedin = StubLinkedin(AssertionError("boom"))
+    outbox = Outbox(linkedin, str(tmp_path / "outbox.db"), backoff=0)
+    outbox.post("v2/a", json={})
+
+    assert outbox.drain() == 2
+    assert outbox.counts() == {"done": 1}
+
+
+def test_retry_after_accepts_seconds_and_http_dates():
+    assert Outbox._retry_after_delay("3") == 3
+    assert Outbox._retry_after_delay("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    assert 50 < Outbox._retry_after_delay(formatdate(time.time() + 60)) <= 60
+    assert Outbox._retry_after_delay("soon") is None
+
+
+def test_retry_after_http_date_reschedules(tmp_path):
+    retry_at = formatdate(time.time() + 60, usegmt=True)
+    response = FakeResponse(429, headers={"retry-after": retry_at})
+    outbox = Outbox(StubLinkedin(TooManyRequests(response)), str(tmp_path / "o.db"))
+    outbox.post("v2/a", json={})
+
+    assert outbox.drain() == 1
+    assert outbox.counts() == {"pending": 1}
+    assert 50 < outbox._next_attempt_at() - time.time() <= 60
+
+
+def test_claimed_requests_are_sent_once(tmp_path):
+    linkedin = StubLinkedin()
+    outbox = Outbox(linkedin, str(tmp_path / "outbox.db"))
+    outbox.post("v2/a", json={})
+    claimed = outbox._claim()
+
+    assert outbox.counts() == {"in_flight": 1}
+    assert outbox.drain() == 0
+    outbox._send(*claimed[0])
+    assert outbox.counts() == {"done": 1}
+    assert len(linkedin._core.calls) == 1
+
+
+def test_expired_leases_are_sent_again(tmp_path):
+    outbox = Outbox(StubLinkedin(), str(tmp_path / "outbox.db"), lease=0)
+    outbox.post("v2/a", json={})
+    outbox._claim()
+
+    assert outbox.drain() == 1
+    assert outbox.counts() == {"done": 1}
@@ -0,0 +1,34 @@
+from pawl.core import profiling
+from tests.conftest import FakeResponse
+
+
+def test_stages_are_only_measured_in_sampled_requests():
+    profiler = profiling.Profiler(sample_rate=2, report_interval=None)
+    for _ in range(4):
+        with profiler.request():
+            with profiler.stage("transport"):
+                sum(range(100))
+
+    report = profiler.report()
+    assert report.startswith("pawl profile: 2 sampled requests (1 in 2)")
+    assert "transport" in report
+    assert profiler.dump().startswith("pawl profile: 2")
+    assert profiler.report().startswith("pawl profile: 0")
+
+
+def test_session_reports_pipeline_stages(requestor, session, tmp_path):
+    requestor.results.append(FakeResponse(json={"id": "abc"}))
+    path = str(tmp_path / "profile.txt")
+    profiling.enable(sample_rate=1, report_interval=None, report_path=path)
+    try:
+        assert session.request("GET", "v2/me") == {"id": "abc"}
+    finally:
+        profiler = profiling.disable()
+
+    assert profiling.stage("parse") is profiling._NULL_CONTEXT
+    with open(path) as report_file:
+        report = report_file.read()
+    for stage in ("prepare", "scheduler.wait", "auth", "transport", "parse"):
+        assert stage in report
+    assert profiler.report().startswith("pawl profile: 0")
+    assert (tmp_path / "profile.txt.prof").exists()
@@ -0,0 +1,79 @@
+import gc
+import sqlite3
+import weakref
+
+from pawl.core.auth import Authenticator, Authorizer
+from pawl.core.quota import QuotaLedger, endpoint_for
+from pawl.core.session import Session
+from tests.conftest import FakeRequestor, FakeResponse
+
+
+def test_endpoint_replaces_ids():
+    assert endpoint_for("https://api.linkedin.com/v2/me?projection=(id)") == "v2/me"
+    assert endpoint_for("v2/shares/urn%3Ali%3Ashare%3A1") == "v2/shares/{id}"
+    assert endpoint_for("/v2/organizations/123") == "v2/organizations/{id}"
+
+
+def test_ledger_counts_per_endpoint_and_member(tmp_path):
+    database = str(tmp_path / "quota.db")
+    ledger = QuotaLedger(
+        database, app_limits={"v2/reactions": 10}, member_limits={"v2/reactions": 3}
+    )
+    ledger.record("v2/reactions?actor=a", "urn:li:person:a", 201)
+    ledger.record("v2/reactions?actor=a", "urn:li:person:a", 201)
+    ledger.record("v2/reactions?actor=b", "urn:li:person:b", 429)
+    ledger.record("v2/me", "urn:li:person:b", 200)
+
+    assert ledger.remaining("v2/reactions") == 8
+    assert ledger.remaining("v2/reactions", "urn:li:person:a") == 1
+    assert ledger.remaining("v2/me") is None
+    assert ledger.forecast("v2/reactions", "urn:li:person:b") is None
+    ledger.close()
+
+    ledger = QuotaLedger(database, member_limits={"v2/reactions": 2})
+    assert ledger.used() == 3
+    assert ledger.forecast("v2/reactions", "urn:li:person:a") is not None
+    ledger.close()
+
+
+def test_session_records_calls(tmp_path):
+    ledger = QuotaLedger(str(tmp_path / "quota.db"))
+    requestor = FakeRequestor(FakeResponse(json={"id": "abc"}))
+    authorizer = Authorizer(
+        Authenticator(requestor, "id", "secret"), access_token="token"
+    )
+    session = Session(authorizer, quota_ledger=ledger)
+    session.request("GET", "v2/me")
+    session.member = "urn:li:person:abc"
+    session.request("GET", "v2/me")
+
+    assert ledger.used("v2/me") == 2
+    assert ledger.used("v2/me", "urn:li:person:abc") == 1
+    ledger.close()
+
+
+class LockedConnection:
+    def executemany(self, *_args):
+        raise sqlite3.OperationalError("database is locked")
+
+    def rollback(self):
+        pass
+
+
+def test_record_keeps_calls_when_database_is_locked(tmp_path):
+    ledger = QuotaLedger(str(tmp_path / "quota.db"), flush_interval=0)
+    connection, ledger._connection = ledger._connection, LockedConnection()
+    ledger.record("v2/me", "urn:li:person:a", 200)
+
+    ledger._connection = connection
+    ledger.flush()
+    assert ledger.used("v2/me") == 1
+    ledger.close()
+
+
+def test_open_ledgers_are_not_kept_alive(tmp_path):
+    ledger = QuotaLedger(str(tmp_path / "quota.db"))
+    reference = weakref.ref(ledger)
+    del ledger
+    gc.collect()
+    assert reference() is None
@@ -0,0 +1,105 @@
+import gzip
+import json
+import socket
+import time
+
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from pawl.core.connection import DNSCache, ReusingAdapter, _CachedDNSMixin
+from pawl.core.requestor import Requestor
+
+
+class StubHTTP:
+    def __init__(self):
+        self.headers = CaseInsensitiveDict()
+        self.calls = []
+
+    def request(self, *args, **kwargs):
+        self.calls.append(kwargs)
+
+
+def test_accept_encoding_lists_available_decoders():
+    http = StubHTTP()
+    Requestor(session=http)
+    encodings = http.headers["Accept-Encoding"].split(", ")
+    assert encodings[:2] == ["gzip", "deflate"]
+
+
+def test_json_body_is_compressed_above_threshold():
+    http = StubHTTP()
+    requestor = Requestor(session=http, compression_threshold=100)
+    payload = {"elements": ["x" * 10] * 50}
+    requestor.request("POST", "url", json=payload, headers={"A": "b"})
+
+    kwargs = http.calls[0]
+    assert "json" not in kwargs
+    assert kwargs["headers"]["Content-Encoding"] == "gzip"
+    assert kwargs["headers"]["A"] == "b"
+    assert json.loads(gzip.decompress(kwargs["data"])) == payload
+
+
+def test_small_json_body_is_not_compressed():
+    http = StubHTTP()
+    requestor = Requestor(session=http, compression_threshold=100)
+    requestor.request("POST", "url", json={"a": 1})
+    assert "Content-Encoding" not in http.calls[0]["headers"]
+    assert json.loads(http.calls[0]["data"]) == {"a": 1}
+
+
+def test_compression_is_disabled_by_default():
+    http = StubHTTP()
+    Requestor(session=http).request("POST", "url", json={"a": 1})
+    assert http.calls[0]["json"] == {"a": 1}
+
+
+def test_warm_up_opens_pooled_connections():
+    listener = socket.create_server(("127.0.0.1", 0))
+    url = f"http://127.0.0.1:{listener.getsockname()[1]}/"
+    try:
+        requestor = Requestor(oauth_url=url, linkedin_url=url, prewarm=3)
+        adapter = requestor._http.get_adapter(url)
+        assert isinstance(adapter, ReusingAdapter)
+        assert adapter.dns_cache.resolve("127.0.0.1", 80) == ["127.0.0.1"]
+        assert requestor.warm_up(3) == 3
+        requestor.close()
+    finally:
+        listener.close()
+
+
+def test_cached_dns_connections_try_each_address():
+    class Connection:
+        def __init__(self):
+            self._dns_host, self.port = "example.com", 443
+
+        def _new_conn(self):
+            if self._dns_host == "192.0.2.1":
+                raise OSError("unreachable")
+            return self._dns_host
+
+    dns_cache = DNSCache()
+    dns_cache._cache[("example.com", 443)] = (
+        time.monotonic() + 60,
+        ["192.0.2.1", "192.0.2.2"],
+    )
+    connection = type("C", (_CachedDNSMixin, Connection), {"dns_cache": dns_cache})()
+    assert connection._new_conn() == "192.0.2.2"
+    assert connection._dns_host == "example.com"
+
+
+def test_warm_up_without_tls_context_connections(monkeypatch):
+    monkeypatch.delattr(HTTPAdapter, "get_connection_with_tls_context", raising=False)
+    monkeypatch.setattr(
+        HTTPAdapter,
+        "get_connection",
+        lambda self, url, proxies=None: self.poolmanager.connection_from_url(url),
+        raising=False,
+    )
+    listener = socket.create_server(("127.0.0.1", 0))
+    url = f"http://127.0.0.1:{listener.getsockname()[1]}/"
+    try:
+        requestor = Requestor(oauth_url=url, linkedin_url=url)
+        assert requestor.warm_up(2) == 2
+        requestor.close()
+    finally:
+        listener.close()
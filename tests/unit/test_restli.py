@@ -0,0 +1,53 @@
+from pawl.constants import ROUTES
+from pawl.core.restli import Route, encode, encode_query
+
+
+def test_encode_scalars():
+    assert encode("urn:li:person:abc") == "urn%3Ali%3Aperson%3Aabc"
+    assert encode("a (b), 'c'") == "a%20%28b%29%2C%20%27c%27"
+    assert encode("") == "''"
+    assert encode(True) == "true"
+    assert encode(10) == "10"
+
+
+def test_encode_collections():
+    assert encode(["urn:li:share:1", "urn:li:share:2"]) == (
+        "List(urn%3Ali%3Ashare%3A1,urn%3Ali%3Ashare%3A2)"
+    )
+    assert encode({"timeRange": {"start": 1, "end": 2}}) == (
+        "(timeRange:(start:1,end:2))"
+    )
+    assert encode([]) == "List()"
+
+
+def test_encode_query():
+    assert encode_query({"q": "actor", "ids": ["a", "b"]}) == "q=actor&ids=List(a,b)"
+
+
+def test_route_format():
+    route = Route("v2/shares/{id}?projection=(id)")
+    assert route.fields == ("id",)
+    assert (
+        route.format(id="urn:li:share:1")
+        == "v2/shares/urn%3Ali%3Ashare%3A1?projection=(id)"
+    )
+    assert route.format(id=["a"]) == "v2/shares/List(a)?projection=(id)"
+
+
+def test_reactions_route_matches_previous_encoding():
+    assert ROUTES["reactions"].format(actor="urn:li:person:123") == (
+        "v2/reactions?actor=urn%3Ali%3Aperson%3A123"
+    )
+
+
+def test_route_cache_distinguishes_bool_from_int():
+    route = Route("v2/shares?sharesPerOwner={count}")
+    assert route.format(count=True) == "v2/shares?sharesPerOwner=true"
+    assert route.format(count=1) == "v2/shares?sharesPerOwner=1"
+    assert route.format(count=1.0) == "v2/shares?sharesPerOwner=1.0"
+
+    route = Route("v2/y?ids={ids}")
+    assert route.format(ids=(True, 2)) == "v2/y?ids=List(true,2)"
+    assert route.format(ids=(1, 2)) == "v2/y?ids=List(1,2)"
+    assert route.format(ids=((1,), 2)) == "v2/y?ids=List(List(1),2)"
+    assert route.format(ids=((True,), 2)) == "v2/y?ids=List(List(true),2)"
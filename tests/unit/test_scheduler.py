@@ -0,0 +1,69 @@
+import threading
+import time
+
+import pytest
+
+from pawl.core.deadline import Deadline
+from pawl.core.exceptions import DeadlineExceeded
+from pawl.core.rate_limit import RateLimiter
+from pawl.core.scheduler import Priority, Scheduler
+from tests.conftest import FakeResponse
+
+
+def test_interactive_requests_jump_queued_bulk_requests():
+    scheduler = Scheduler(RateLimiter(), max_concurrency=1)
+    order = []
+
+    def request(priority):
+        scheduler.call(priority, order.append, priority)
+
+    scheduler.acquire()
+    threads = [
+        threading.Thread(target=request, args=(priority,))
+        for priority in [Priority.BULK] * 3 + [Priority.INTERACTIVE]
+    ]
+    for thread in threads:
+        thread.start()
+        while len(scheduler._waiting) < threads.index(thread) + 1:
+            time.sleep(0.001)
+    scheduler.release()
+    for thread in threads:
+        thread.join()
+
+    assert order == [Priority.INTERACTIVE] + [Priority.BULK] * 3
+
+
+def test_bulk_requests_cannot_use_reserved_budget(requestor, session):
+    headers = {
+        "x-ratelimit-remaining": "100",
+        "x-ratelimit-reset": "60",
+        "x-ratelimit-used": "900",
+    }
+    requestor.results = [FakeResponse(headers=headers)]
+    session.request("GET", "v2/me", priority="bulk")
+
+    assert session._rate_limiter.remaining == 100
+    with pytest.raises(DeadlineExceeded):
+        session.request("GET", "v2/me", deadline=0.05, priority="bulk")
+    assert not session._scheduler._waiting
+    assert session.request("GET", "v2/me", priority="interactive") == {}
+    assert len(requestor.calls) == 2
+
+
+def test_reserve_requires_a_reported_budget():
+    rate_limiter = RateLimiter()
+    for _ in range(4500):
+        rate_limiter.update({})
+    scheduler = Scheduler(rate_limiter)
+
+    assert scheduler.call(Priority.BULK, lambda: "sent") == "sent"
+
+
+def test_wait_for_slot_is_bounded_by_deadline():
+    scheduler = Scheduler(RateLimiter(), max_concurrency=1)
+    scheduler.acquire()
+
+    with pytest.raises(DeadlineExceeded):
+        scheduler.call(Priority.NORMAL, dict, deadline=Deadline(0.05))
+    assert not scheduler._waiting
+    scheduler.release()
@@ -0,0 +1,63 @@
+import pytest
+
+from pawl.core.exceptions import Conflict, ResponseSnapshot
+from pawl.linkedin import Linkedin
+from pawl.utils.seen_set import BloomSeenSet, SQLiteSeenSet
+
+
+@pytest.fixture(params=["sqlite", "bloom"])
+def seen_set(request, tmp_path):
+    if request.param == "sqlite":
+        instance = SQLiteSeenSet(str(tmp_path / "seen.db"))
+    else:
+        instance = BloomSeenSet(str(tmp_path / "seen.bloom"), initial_capacity=100)
+    yield instance
+    instance.close()
+
+
+def test_seen_set_records_keys(seen_set):
+    key = seen_set.key("urn:li:person:a", "urn:li:share:1")
+    assert key not in seen_set
+    seen_set.add(key)
+    seen_set.add(key)
+    assert key in seen_set
+    assert len(seen_set) == 1
+
+
+def test_bloom_seen_set_grows_and_persists(tmp_path):
+    path = str(tmp_path / "seen.bloom")
+    seen_set = BloomSeenSet(path, initial_capacity=50, error_rate=0.01)
+    keys = [f"urn:li:share:{index}" for index in range(500)]
+    for key in keys:
+        seen_set.add(key)
+    assert len(seen_set._counts) > 1
+    seen_set.close()
+
+    reopened = BloomSeenSet(path)
+    assert all(key in reopened for key in keys)
+    assert reopened.initial_capacity == 50
+    false_positives = sum(f"urn:li:post:{index}" in reopened for index in range(2000))
+    assert false_positives < 2000 * 0.05
+    reopened.close()
+
+
+def test_like_post_skips_seen_reactions(monkeypatch, tmp_path):
+    linkedin = Linkedin(access_token="token")
+    linkedin.current_user_id = "abc"
+    linkedin.reactions.seen_set = SQLiteSeenSet(str(tmp_path / "seen.db"))
+    calls = []
+
+    def post(**kwargs):
+        calls.append(kwargs)
+        if kwargs["json"]["root"] == "urn:li:share:2":
+            raise Conflict(ResponseSnapshot(409))
+        return {"id": "reaction"}
+
+    monkeypatch.setattr(linkedin, "post", post)
+
+    assert linkedin.reactions.like_post("urn:li:share:1") == {"id": "reaction"}
+    assert linkedin.reactions.like_post("urn:li:share:1") is None
+    with pytest.raises(Conflict):
+        linkedin.reactions.like_post("urn:li:share:2")
+    assert linkedin.reactions.like_post("urn:li:share:2") is None
+    assert len(calls) == 2
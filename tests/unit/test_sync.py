@@ -0,0 +1,68 @@
+from pawl.linkedin import Linkedin
+from pawl.sync import Sync, SyncStore
+
+
+class StubLinkedin:
+    _pages = Linkedin._pages
+    paginate = Linkedin.paginate
+
+    def __init__(self, records):
+        self.calls = []
+        self.records = records
+
+    def get(self, path, params=None, **kwargs):
+        self.calls.append((path, params))
+        start, count = params["start"], params["count"]
+        return {
+            "elements": self.records[start : start + count],
+            "paging": {"start": start, "count": count, "total": len(self.records)},
+        }
+
+
+def record(urn, time):
+    return {"id": urn, "lastModified": {"time": time}}
+
+
+def test_paginate_follows_start_and_count():
+    linkedin = StubLinkedin([record(str(i), i) for i in range(5)])
+    assert [item["id"] for item in linkedin.paginate("v2/shares", page_size=2)] == [
+        "0",
+        "1",
+        "2",
+        "3",
+        "4",
+    ]
+    assert [params["start"] for _, params in linkedin.calls] == [0, 2, 4]
+
+
+def test_sync_only_stores_changes_since_watermark(tmp_path):
+    store = SyncStore(str(tmp_path / "sync.db"))
+    linkedin = StubLinkedin([record("a", 10), record("b", 20)])
+    sync = Sync(linkedin, store)
+
+    assert sync.run("shares", "v2/shares", params={"q": "owners"}) == 2
+    assert store.watermark("shares") == 20
+    assert linkedin.calls[0][0] == "v2/shares?q=owners"
+
+    linkedin.records = [record("b", 20), record("a", 30), record("c", 5)]
+    linkedin.calls = []
+    assert (
+        sync.run(
+            "shares",
+            "v2/shares",
+            since_params=lambda start: {"timeRange": {"start": start}},
+        )
+        == 2
+    )
+    assert linkedin.calls[0][0] == "v2/shares?timeRange=(start:20)"
+    assert store.watermark("shares") == 30
+    assert store.count("shares") == 2
+    assert store.get("a")["lastModified"]["time"] == 30
+    assert [item["id"] for item in store.query("shares", since=15)] == ["b", "a"]
+
+
+def test_upsert_keeps_newer_record(tmp_path):
+    store = SyncStore(str(tmp_path / "sync.db"))
+    store.upsert("shares", [("a", 20, {"v": "new"})])
+    store.upsert("shares", [("a", 10, {"v": "old"})])
+    assert store.get("a", dataset="shares") == {"v": "new"}
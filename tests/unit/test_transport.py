@@ -0,0 +1,116 @@
+import json
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from pawl.core.exceptions import RequestException
+from pawl.core.requestor import Requestor
+from pawl.core.session import Session
+from pawl.core.transport import Urllib3Transport
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self._echo()
+
+    def do_POST(self):
+        self._echo()
+
+    def _echo(self):
+        if self.path == "/redirect":
+            self.send_response(302)
+            self.send_header("Location", "/v2/me")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        payload = {
+            "body": self.rfile.read(length).decode(),
+            "content_type": self.headers.get("Content-Type"),
+            "cookie": self.headers.get("Cookie"),
+            "path": self.path,
+            "user_agent": self.headers.get("User-Agent"),
+        }
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Set-Cookie", "a=b")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), EchoHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+    server.server_close()
+
+
+def test_requests_are_sent_without_cookies(server_url):
+    requestor = Requestor(session=Urllib3Transport())
+    url = f"{server_url}v2/me?a=1"
+    requestor.request("GET", url)
+    response = requestor.request("GET", url, params={"q": "x y"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/json")
+    payload = response.json()
+    assert payload["path"] == "/v2/me?a=1&q=x+y"
+    assert payload["cookie"] is None
+    assert payload["user_agent"].startswith("pawl/")
+    requestor.close()
+
+
+def test_redirected_response_reports_final_url(server_url):
+    transport = Urllib3Transport()
+    response = transport.request("GET", f"{server_url}redirect")
+
+    assert response.url == f"{server_url}v2/me"
+    assert response.json()["path"] == "/v2/me"
+    assert transport.request("GET", server_url).url == server_url
+    response.content = b"<html>"
+    with pytest.raises(ValueError):
+        response.json()
+    transport.close()
+
+
+def test_bodies_are_encoded_like_requests(server_url):
+    requestor = Requestor(session=Urllib3Transport())
+    form = requestor.request("POST", server_url, data=[("a", "1"), ("b", "2")]).json()
+    body = requestor.request("POST", server_url, json={"a": 1}).json()
+
+    assert form["body"] == "a=1&b=2"
+    assert form["content_type"] == "application/x-www-form-urlencoded"
+    assert json.loads(body["body"]) == {"a": 1}
+    assert body["content_type"] == "application/json"
+
+
+def test_connection_errors_are_requests_exceptions():
+    listener = socket.create_server(("127.0.0.1", 0))
+    port = listener.getsockname()[1]
+    listener.close()
+    requestor = Requestor(session=Urllib3Transport())
+    with pytest.raises(RequestException) as excinfo:
+        requestor.request("GET", f"http://127.0.0.1:{port}/", timeout=1)
+    assert isinstance(excinfo.value.original_exception, requests.ConnectionError)
+    assert isinstance(excinfo.value.original_exception, Session.RETRY_EXCEPTIONS)
+
+
+def test_warm_up_opens_transport_connections(server_url):
+    requestor = Requestor(
+        oauth_url=server_url, linkedin_url=server_url, session=Urllib3Transport()
+    )
+    assert requestor.warm_up(2) == 2
+    assert requestor.request("GET", server_url).status_code == 200
@@ -0,0 +1,57 @@
+import pytest
+
+from pawl.linkedin import Linkedin
+from pawl.urn import Urn, is_urn, parse
+
+
+def test_parse_nested_urn():
+    urn = parse("urn:li:comment:(urn:li:activity:123,456)")
+    assert (urn.namespace, urn.entity_type) == ("li", "comment")
+    assert urn.id == (Urn("urn:li:activity:123"), "456")
+    assert urn.id[0].entity_type == "activity"
+    assert urn == "urn:li:comment:(urn:li:activity:123,456)"
+
+
+def test_parse_interns_equal_urns():
+    assert parse("urn:li:share:1") is parse("urn:li:share:1")
+    assert Urn.of("person", "abc") == "urn:li:person:abc"
+    assert Urn.of("sponsoredCreative", "urn:li:sponsoredCampaign:1", 2).id == (
+        "urn:li:sponsoredCampaign:1",
+        "2",
+    )
+    assert parse("urn:li:share:1").encoded == "urn%3Ali%3Ashare%3A1"
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "",
+        "share:1",
+        "urn:li:share",
+        "urn:li:share:",
+        "urn::share:1",
+        "urn:li:share:(1,2",
+        "urn:li:share:(1)(2)",
+        "urn:li:share:(1,,2)",
+        "urn:li:comment:(urn:li:activity,1)",
+    ],
+)
+def test_malformed_urns_are_rejected(value):
+    assert not is_urn(value)
+    with pytest.raises(ValueError):
+        parse(value)
+
+
+def test_like_post_rejects_malformed_urn_before_request(monkeypatch):
+    linkedin = Linkedin(access_token="token")
+    linkedin.current_user_id = "abc"
+    calls = []
+    monkeypatch.setattr(linkedin, "post", lambda **kwargs: calls.append(kwargs))
+
+    with pytest.raises(ValueError):
+        linkedin.reactions.like_post("urn:li:share")
+    linkedin.reactions.like_post("urn:li:share:1")
+
+    assert len(calls) == 1
+    assert calls[0]["json"]["root"] == "urn:li:share:1"
+    assert calls[0]["path"].endswith("actor=urn%3Ali%3Aperson%3Aabc")